@@ -0,0 +1,71 @@
+"""Rogue AP analysis per scan at growing site sizes, indexed versus pairwise.
+
+Replays a synthetic site where an evil twin, a foreign AP, a signal jump
+or a cloned BSSID is staged every 10 scans, times ScanAnalyzer.update()
+per scan and checks the alerts against the staged incidents. For
+comparison, times one scan of a pairwise pass (every BSSID against
+every other for shared SSIDs and neighbouring addresses), which is what
+grouping without indexes amounts to; it is skipped above 3000 APs.
+
+    python benchmarks/bench_analysis.py [aps ...]   (default 1000 3000 10000)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.analysis import RADIO_BITS, ScanAnalyzer, security_class  # noqa: E402
+from wifi_analyzer.oui import LOCAL_BIT  # noqa: E402
+from wifi_analyzer.simulate import RogueScenario  # noqa: E402
+
+SCANS = 200
+PAIRWISE_MAX = 3000
+
+
+def pairwise(nets):
+    """Group and compare by testing every pair of BSSIDs."""
+    mismatched = 0
+    neighbours = 0
+    macs = [net.mac & ~LOCAL_BIT for net in nets]
+    kinds = [security_class(net.security) for net in nets]
+    for i, a in enumerate(nets):
+        for j in range(i + 1, len(nets)):
+            if abs(macs[i] - macs[j]) >> RADIO_BITS == 0:
+                neighbours += 1
+            if a.ssid == nets[j].ssid and kinds[i] != kinds[j]:
+                mismatched += 1
+    return mismatched, neighbours
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 3000, 10000]
+    print(f"{'APs':>6} {'BSSIDs':>7} {'p50 ms':>7} {'max ms':>7} {'us/BSSID':>9} "
+          f"{'alerts':>7} {'missed':>7} {'false':>6} {'pairwise ms':>12}")
+    for aps in sizes:
+        env = RogueScenario(aps, seed=7)
+        analyzer = ScanAnalyzer()
+        times = []
+        raised = set()
+        for i in range(SCANS):
+            nets = env()
+            start = time.perf_counter()
+            alerts = analyzer.update(i * env.interval, nets)
+            times.append(time.perf_counter() - start)
+            raised.update((a.kind, a.mac) for a in alerts)
+        expected = env.expected_alerts()
+        # The first scan indexes everything from scratch
+        steady = sorted(times[1:])
+        p50 = steady[len(steady) // 2]
+        pair = ""
+        if aps <= PAIRWISE_MAX:
+            start = time.perf_counter()
+            pairwise(nets)
+            pair = f"{(time.perf_counter() - start) * 1e3:>12.0f}"
+        print(f"{aps:>6} {len(nets):>7} {p50 * 1e3:>7.2f} {steady[-1] * 1e3:>7.2f} "
+              f"{p50 / len(nets) * 1e6:>9.2f} {len(raised):>7} {len(expected - raised):>7} "
+              f"{len(raised - expected):>6} {pair}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Microbenchmark: frequency -> channel conversion.
+
+Compares the old freq_to_channel (rebuilds a merged dict and scans it on
+every call) with the table lookup in wifi_analyzer.channels, per call and
+in bulk over a 300-BSSID scan.
+
+    python benchmarks/bench_channels.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.channels import (  # noqa: E402
+    CHANNEL_FREQ_24, CHANNEL_FREQ_5, CHANNEL_FREQ_6, channels_for, freq_to_channel,
+)
+
+_OLD_24 = {ch: f for ch, f in CHANNEL_FREQ_24.items() if ch <= 13}
+_OLD_5 = {ch: f for ch, f in CHANNEL_FREQ_5.items() if ch <= 165}
+
+
+def legacy_freq_to_channel(freq):
+    for ch, f in {**_OLD_24, **_OLD_5}.items():
+        if f == freq:
+            return ch
+    if 2412 <= freq <= 2484:
+        return (freq - 2407) // 5
+    if freq >= 5000:
+        return (freq - 5000) // 5
+    return 0
+
+
+def main():
+    rng = random.Random(1)
+    pool = list(CHANNEL_FREQ_24.values()) + list(CHANNEL_FREQ_5.values()) \
+        + list(CHANNEL_FREQ_6.values())
+    freqs = [rng.choice(pool) for _ in range(300)]
+    number = 200
+
+    for name, fn in (("legacy", legacy_freq_to_channel), ("table", freq_to_channel)):
+        t = timeit.timeit(lambda: [fn(f) for f in freqs], number=number)
+        print(f"{name:<8} {t / (number * len(freqs)) * 1e9:8.0f} ns/call")
+    t = timeit.timeit(lambda: channels_for(freqs), number=number)
+    print(f"{'bulk':<8} {t / (number * len(freqs)) * 1e9:8.0f} ns/freq (channels_for)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Headless render benchmark for the channel overlap chart.
+
+Renders ChannelChartRenderer onto a cairo ImageSurface the size of the
+window's chart and reports frames/sec for 10/100/1000 networks. Needs
+pycairo and PyGObject (Pango); no display is required.
+
+    python benchmarks/bench_chart.py
+"""
+import os
+import sys
+import time
+
+import cairo
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_parse import load_fixture  # noqa: E402
+from wifi_analyzer.chart import ChannelChartRenderer  # noqa: E402
+from wifi_analyzer.scanner import iter_nmcli  # noqa: E402
+
+SIZES = (10, 100, 1000)
+WIDTH, HEIGHT = 926, 220
+FRAMES = 50
+
+
+def main():
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+    print(f"{'nets':>6} {'band':<8} {'frames/s':>10}")
+    for size in SIZES:
+        # Tile the fixture so every band gets roughly *size* networks
+        nets = list(iter_nmcli(load_fixture(size * 2).splitlines()))
+        for band in ("2.4 GHz", "5 GHz"):
+            renderer = ChannelChartRenderer()
+            renderer.set_networks(nets, band)
+            cr = cairo.Context(surface)
+            renderer.render(cr, WIDTH, HEIGHT)  # warm the static layer and labels
+            start = time.perf_counter()
+            for _ in range(FRAMES):
+                cr = cairo.Context(surface)
+                renderer.render(cr, WIDTH, HEIGHT)
+            surface.flush()
+            fps = FRAMES / (time.perf_counter() - start)
+            print(f"{size:>6} {band:<8} {fps:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Memory benchmark for the streaming exporters.
+
+Exports a generator of synthetic scan rows (10^5 and 10^6 rows by
+default) with every exporter and reports wall time and peak traced
+memory. Peak memory should stay flat as the row count grows.
+
+    python benchmarks/bench_export.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer import export_helper  # noqa: E402
+
+HEADERS = ["ts", "bssid", "ssid", "channel", "freq", "dbm", "security"]
+
+
+def rows(count):
+    for i in range(count):
+        yield (1790000000.0 + i // 300, f"3C:37:86:5A:{i >> 8 & 255:02X}:{i & 255:02X}",
+               f"Net <{i % 300}> & co", 1 + i % 11, 2412 + 5 * (i % 11), -40 - i % 50, "WPA2")
+
+
+EXPORTS = (
+    ("csv", lambda n, p: export_helper.export_csv(rows(n), HEADERS, p)),
+    ("csv.gz", lambda n, p: export_helper.export_csv(rows(n), HEADERS, p, compression="gzip")),
+    ("json", lambda n, p: export_helper.export_json(rows(n), HEADERS, p)),
+    ("ndjson", lambda n, p: export_helper.export_json(rows(n), HEADERS, p, ndjson=True)),
+    ("ods", lambda n, p: export_helper.export_ods(rows(n), HEADERS, p)),
+)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    print(f"{'format':<8} {'rows':>9} {'seconds':>8} {'peak KiB':>9} {'file MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, export in EXPORTS:
+            for n in sizes:
+                path = os.path.join(tmp, f"out.{name}")
+                tracemalloc.start()
+                start = time.perf_counter()
+                export(n, path)
+                elapsed = time.perf_counter() - start
+                _cur, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                size = os.path.getsize(path) / 2 ** 20
+                print(f"{name:<8} {n:>9} {elapsed:>8.1f} {peak / 1024:>9.0f} {size:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
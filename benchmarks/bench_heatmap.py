@@ -0,0 +1,92 @@
+"""Site-survey heatmap interpolation on a large floor plan.
+
+Builds a survey of a 2000 x 2000 px floor plan with 500 sample points
+and 200 APs (log-distance path loss plus shadowing), saves and reloads
+it, then times the heatmap: per tile (the unit of work done per idle
+callback in the GUI), the whole best-server map and one per-BSSID map.
+Reports whether NumPy was used.
+
+    python benchmarks/bench_heatmap.py [points] [aps]   (default 500 200)
+"""
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer import heatmap  # noqa: E402
+from wifi_analyzer.heatmap import HeatmapGrid, colorize  # noqa: E402
+from wifi_analyzer.records import Network, int_to_bssid  # noqa: E402
+from wifi_analyzer.survey import BEST_SERVER, Survey  # noqa: E402
+
+SIZE = 2000
+PX_PER_M = 20
+
+
+def make_survey(points, aps, rng):
+    where = [(rng.uniform(0, SIZE), rng.uniform(0, SIZE), rng.uniform(-25, -15))
+             for _ in range(aps)]
+    survey = Survey("floor.png", SIZE, SIZE)
+    for i in range(points):
+        x, y = rng.uniform(0, SIZE), rng.uniform(0, SIZE)
+        nets = []
+        for k, (ax, ay, tx) in enumerate(where):
+            d = max(math.hypot(x - ax, y - ay) / PX_PER_M, 1.0)
+            dbm = round(tx - 40 - 30 * math.log10(d) + rng.gauss(0, 4))
+            if dbm >= -92:
+                nets.append(Network(f"ap-{k}", int_to_bssid(0x020000000000 + k), 5180, 36,
+                                    0, dbm, "WPA2", "5 GHz"))
+        survey.add(x, y, float(i), nets)
+    return survey
+
+
+def time_map(grid, interp):
+    tiles = []
+    start = time.perf_counter()
+    for tile in grid.tiles(focus=(SIZE / 2, SIZE / 2)):
+        t0 = time.perf_counter()
+        colorize(grid.compute(interp, *tile), tile[2])
+        tiles.append(time.perf_counter() - t0)
+    return time.perf_counter() - start, sorted(tiles)
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    aps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    survey = make_survey(points, aps, random.Random(3))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "survey.json")
+        start = time.perf_counter()
+        survey.save(path)
+        survey = Survey.load(path)
+        io = time.perf_counter() - start
+        size = os.path.getsize(path)
+    print(f"{points} points x {aps} APs on {SIZE}x{SIZE} px, "
+          f"numpy {'yes' if heatmap.np is not None else 'no'}")
+    print(f"save+load {io * 1e3:.1f} ms ({size / 1024:.0f} KiB)")
+
+    grid = HeatmapGrid(SIZE, SIZE)
+    print(f"grid {grid.cols}x{grid.rows} cells of {grid.cell} px, "
+          f"{len(grid.tiles())} tiles of {grid.tile}x{grid.tile}")
+    targets = [("best server", BEST_SERVER), ("one BSSID", survey.bssids()[0])]
+    for label, bssid in targets:
+        start = time.perf_counter()
+        interp = survey.interpolator(bssid)
+        setup = time.perf_counter() - start
+        total, tiles = time_map(grid, interp)
+        print(f"{label:<12} setup {setup * 1e3:.1f} ms, map {total * 1e3:.0f} ms, "
+              f"tile p50 {tiles[len(tiles) // 2] * 1e3:.1f} ms max {tiles[-1] * 1e3:.1f} ms")
+
+    # Exact at the samples
+    interp = survey.interpolator(BEST_SERVER)
+    xs, ys, values = survey.samples(BEST_SERVER)
+    err = max(abs(interp.grid(x - 0.5, y - 0.5, 1, 1, 1.0)[0] - v)
+              for x, y, v in zip(xs, ys, values))
+    print(f"max error at samples {err:.3f} dB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Ingest and query benchmark for the scan history store.
+
+Feeds *samples* synthetic samples (1000 BSSIDs, one scan per second) into
+a ScanHistory ring sized to hold them all, then times full-range and
+one-hour window queries for random BSSIDs. Reports ingest rate, query
+latency and the process's peak RSS. Then checks that the number of
+BSSIDs held stays bounded when 100,000 of them are each heard briefly.
+
+    python benchmarks/bench_history.py [samples]   (default 10**7)
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.history import BLOCK_SAMPLES, ScanHistory  # noqa: E402
+
+BSSIDS = 1000
+CHURN = 100000
+
+
+def check_churn(tmp):
+    """Assert BSSIDs heard a few times each do not accumulate in memory."""
+    max_blocks, max_live = 512, 128
+    hist = ScanHistory(os.path.join(tmp, "churn.bin"), max_blocks=max_blocks,
+                       max_live=max_live)
+    held = 0
+    for i in range(CHURN):
+        for t in range(3):
+            hist.append(0x020000000000 + i, float(i + t), -70)
+        held = max(held, len(hist.bssids()))
+    assert held <= max_blocks + max_live, held
+    assert hist.query(0x020000000000 + CHURN - 1)
+    hist.close()
+    print(f"churn: {CHURN:,} BSSIDs heard 3 times each, at most {held} held")
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7
+    scans = samples // BSSIDS
+    bssids = [0x3C3786000000 + i for i in range(BSSIDS)]
+    blocks = samples // BLOCK_SAMPLES + 2 * BSSIDS
+    rng = random.Random(7)
+    levels = [rng.randint(-90, -40) for _ in bssids]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hist = ScanHistory(os.path.join(tmp, "history.bin"), max_blocks=blocks)
+        start = time.perf_counter()
+        for t in range(scans):
+            for bssid, level in zip(bssids, levels):
+                hist.append(bssid, float(t), level)
+        hist.flush()
+        elapsed = time.perf_counter() - start
+        print(f"ingest: {scans * BSSIDS:,} samples in {elapsed:.1f} s "
+              f"({scans * BSSIDS / elapsed:,.0f} samples/s)")
+
+        for label, window in (("full range", None), ("1 h window", 3600)):
+            times = []
+            for _ in range(200):
+                bssid = rng.choice(bssids)
+                if window is None:
+                    t0, t1 = float("-inf"), float("inf")
+                else:
+                    t0 = rng.uniform(0, max(scans - window, 0))
+                    t1 = t0 + window
+                start = time.perf_counter()
+                segments = hist.query(bssid, t0, t1)
+                times.append(time.perf_counter() - start)
+                del segments
+            times.sort()
+            print(f"query {label}: median {times[len(times) // 2] * 1e6:.0f} us, "
+                  f"p95 {times[int(len(times) * 0.95)] * 1e6:.0f} us")
+        hist.close()
+        check_churn(tmp)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS: {rss:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
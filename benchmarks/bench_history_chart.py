@@ -0,0 +1,172 @@
+"""Level-of-detail signal-history chart at 10^6 points per series.
+
+Builds a series of a million 1 Hz samples (with occasional gaps, like a
+laptop that sleeps), then times: building the min/max pyramid, appending
+live samples, and reducing the series to pixel columns at several zoom
+levels, cold and after panning by 10 px (cached columns). Compares with
+a naive pass over every visible sample, after first checking the columns
+against it on small series and on samples that sit exactly on column
+boundaries, and the min/max of pyramids grown only by append() or by
+small extend() calls against brute force. When pycairo is installed the
+full chart is also rendered offscreen with several such series.
+
+    python benchmarks/bench_history_chart.py [points] [series]   (default 1000000 12)
+"""
+import math
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.pyramid import ColumnDecimator, MinMaxPyramid  # noqa: E402
+
+WIDTH, HEIGHT = 1200, 400
+PLOT_W = 1130  # WIDTH minus the chart margins
+
+
+def make_series(n, rng):
+    # Arrays rather than lists: a million floats in lists makes the
+    # cyclic GC stall whatever is timed next
+    ts, values = array("d"), array("f")
+    t = 1.7e9
+    level = -60.0
+    for _ in range(n):
+        t += 1.0 if rng.random() > 1e-4 else rng.uniform(600, 36000)
+        level = min(-30.0, max(-95.0, level + rng.gauss(0, 1)))
+        ts.append(t)
+        values.append(round(level + rng.gauss(0, 3)))
+    return ts, values
+
+
+def naive_columns(ts, values, c0, c1, width):
+    cols = [None] * (c1 - c0)
+    for t, v in zip(ts, values):
+        c = int(t // width) - c0
+        if 0 <= c < len(cols):
+            col = cols[c]
+            cols[c] = [v, v, v, v] if col is None else [col[0], min(col[1], v), max(col[2], v), v]
+    return cols
+
+
+def check_columns(rng):
+    """Assert the decimated columns equal naive_columns(), whatever the series size."""
+    cases = []
+    for n in (10000, 20000):
+        ts, values = make_series(n, rng)
+        for span in (ts[-1] - ts[0], 86400, 3600):
+            cases.append((ts, values, span))
+    # Timestamps at c * width, where float rounding decides the column
+    width = 86400 / PLOT_W
+    first = int(1.7e9 // width)
+    ts = array("d", (c * width for c in range(first, first + 3 * PLOT_W)))
+    values = array("f", (rng.randint(-90, -30) for _ in ts))
+    cases.append((ts, values, 86400))
+    for ts, values, span in cases:
+        pyramid = MinMaxPyramid()
+        pyramid.extend(ts, values)
+        width = span / PLOT_W
+        c0 = math.floor((ts[-1] - span) / width)
+        cols = ColumnDecimator(pyramid).columns(c0, c0 + PLOT_W, width)
+        ref = naive_columns(ts, values, c0, c0 + PLOT_W, width)
+        assert [c and list(c[:4]) for c in cols] == ref, (len(ts), span)
+    print(f"columns match the naive pass in {len(cases)} checks")
+
+
+def check_pyramid(rng):
+    """Assert minmax() is exact however the pyramid was grown."""
+    ts, values = make_series(5000, rng)
+    # A low first value shows up in every range that includes it
+    values[0] = -1000
+    appended = MinMaxPyramid()
+    for t, v in zip(ts, values):
+        appended.append(t, v)
+    chunked = MinMaxPyramid()
+    i = 0
+    while i < len(ts):
+        n = rng.randint(1, 40)
+        chunked.extend(ts[i:i + n], values[i:i + n])
+        i += n
+    checks = 0
+    for pyramid in (appended, chunked):
+        for _ in range(500):
+            lo = rng.randrange(len(ts) - 1)
+            hi = rng.randrange(lo + 1, len(ts) + 1)
+            assert pyramid.minmax(lo, hi) == (min(values[lo:hi]), max(values[lo:hi])), (lo, hi)
+            checks += 1
+        assert pyramid.minmax(0, len(ts)) == (-1000, max(values))
+    print(f"pyramid min/max match brute force in {checks} checks")
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    rng = random.Random(5)
+    check_columns(rng)
+    check_pyramid(rng)
+    ts, values = make_series(points, rng)
+
+    start = time.perf_counter()
+    pyramid = MinMaxPyramid()
+    pyramid.extend(ts, values)
+    build = time.perf_counter() - start
+    print(f"{points:,} points spanning {(ts[-1] - ts[0]) / 86400:.1f} days, "
+          f"{len(pyramid.levels)} levels, build {build * 1e3:.0f} ms")
+
+    live = MinMaxPyramid()
+    live.extend(ts[:-10000], values[:-10000])
+    start = time.perf_counter()
+    for t, v in zip(ts[-10000:], values[-10000:]):
+        live.append(t, v)
+    print(f"append {(time.perf_counter() - start) / 10000 * 1e6:.1f} us/sample")
+
+    print(f"{'view':<10} {'per col':>8} {'cold ms':>8} {'pan ms':>8} {'naive ms':>9}")
+    end = ts[-1]
+    for label, span in (("all", ts[-1] - ts[0]), ("1 day", 86400), ("1 hour", 3600),
+                        ("1 minute", 60)):
+        width = span / PLOT_W
+        c0 = math.floor((end - span) / width)
+        dec = ColumnDecimator(pyramid)
+        start = time.perf_counter()
+        cols = dec.columns(c0, c0 + PLOT_W, width)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        dec.columns(c0 - 10, c0 + PLOT_W - 10, width)
+        pan = time.perf_counter() - start
+        naive = ""
+        if span > 3600:
+            start = time.perf_counter()
+            ref = naive_columns(ts, values, c0, c0 + PLOT_W, width)
+            naive = f"{(time.perf_counter() - start) * 1e3:>9.0f}"
+            assert [c and list(c[:4]) for c in cols] == ref
+        print(f"{label:<10} {span / PLOT_W:>7.1f}s {cold * 1e3:>8.2f} {pan * 1e3:>8.2f} {naive}")
+
+    try:
+        import cairo
+        from wifi_analyzer.history_chart import SignalHistoryRenderer
+    except (ImportError, ValueError) as e:
+        print(f"offscreen render skipped: {e}")
+        return
+    series = [(k, pyramid if k == 0 else MinMaxPyramid(), f"ap-{k}") for k in range(count)]
+    for _k, p, _label in series[1:]:
+        p.extend(ts, array("f", (v + rng.randint(-20, 10) for v in values)))
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, WIDTH, HEIGHT)
+    renderer = SignalHistoryRenderer()
+    renderer.set_series(series)
+    for label, span in (("all", ts[-1] - ts[0]), ("1 hour", 3600)):
+        renderer.span = span
+        frames = []
+        for i in range(20):
+            renderer.end = None if i == 0 else end - i * span / 100
+            start = time.perf_counter()
+            renderer.render(cairo.Context(surface), WIDTH, HEIGHT)
+            surface.flush()
+            frames.append(time.perf_counter() - start)
+        print(f"render {count} series, {label}: first {frames[0] * 1e3:.0f} ms, "
+              f"panning p50 {sorted(frames[1:])[9] * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Overhead of the stage-timing instrumentation.
+
+Times an empty ``with span(...)`` block with recording off and on
+against a bare loop, and the cost of summarizing a full ring.
+
+    python benchmarks/bench_instrument.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.instrument import RING_SIZE, Recorder  # noqa: E402
+
+N = 1_000_000
+
+
+def per_call(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / N * 1e9
+
+
+def main():
+    rec = Recorder()
+    span = rec.span
+
+    def bare():
+        for _ in range(N):
+            pass
+
+    def spans():
+        for _ in range(N):
+            with span("stage"):
+                pass
+
+    base = per_call(bare)
+    off = per_call(spans)
+    rec.enabled = True
+    on = per_call(spans)
+    print(f"bare loop:     {base:6.0f} ns/iter")
+    print(f"span disabled: {off - base:6.0f} ns/span")
+    print(f"span enabled:  {on - base:6.0f} ns/span")
+
+    start = time.perf_counter()
+    rec.stats()
+    print(f"stats over a full ring ({RING_SIZE} spans): "
+          f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: channel interference scoring vs a naive per-pair loop.
+
+Scores synthetic scans of 100/1000/5000 APs spread over 2.4 and 5 GHz.
+The naive version integrates the spectral mask for every AP x candidate
+channel pair, which is what the kernel-based engine avoids.
+
+    python benchmarks/bench_interference.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.channels import channel_to_freq  # noqa: E402
+from wifi_analyzer.interference import (  # noqa: E402
+    CANDIDATES, DSSS_WIDTH, interference_mw, overlap,
+)
+from wifi_analyzer.records import BAND_24, BAND_5, Network  # noqa: E402
+
+SIZES = (100, 1000, 5000)
+
+
+def synthetic(count, seed=3):
+    rng = random.Random(seed)
+    nets = []
+    for i in range(count):
+        band = BAND_24 if i % 2 else BAND_5
+        ch = rng.choice((1, 6, 11, 1, 6, 11, 3, 9)) if band == BAND_24 else rng.choice(CANDIDATES[BAND_5])
+        dbm = rng.randint(-92, -35)
+        nets.append(Network(f"ap{i}", f"02:00:00:00:{i >> 8 & 255:02X}:{i & 255:02X}",
+                            channel_to_freq(band, ch), ch, 2 * (dbm + 100), dbm, "WPA2", band))
+    return nets
+
+
+def naive(networks, band):
+    power = {}
+    for ch in CANDIDATES[band]:
+        f = channel_to_freq(band, ch)
+        total = 0.0
+        for net in networks:
+            if net.band == band:
+                width = DSSS_WIDTH if band == BAND_24 else 20
+                total += 10 ** (net.dbm / 10) * overlap(f - net.freq, width)
+        power[ch] = total
+    return power
+
+
+def timed(fn, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    print(f"{'APs':>6} {'engine ms':>10} {'naive ms':>10} {'max rel err':>12}")
+    for size in SIZES:
+        nets = synthetic(size)
+        fast_ms = 0.0
+        fast = {}
+        for band in (BAND_24, BAND_5):
+            ms, fast[band] = timed(interference_mw, nets, band, repeat=20)
+            fast_ms += ms
+        if size <= 1000:
+            slow_ms = 0.0
+            err = 0.0
+            for band in (BAND_24, BAND_5):
+                ms, slow = timed(naive, nets, band)
+                slow_ms += ms
+                for ch, mw in slow.items():
+                    if mw:
+                        err = max(err, abs(fast[band][ch] - mw) / mw)
+            print(f"{size:>6} {fast_ms:>10.2f} {slow_ms:>10.1f} {err:>12.2e}")
+        else:
+            print(f"{size:>6} {fast_ms:>10.2f} {'-':>10} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Throughput benchmark for the ``iw scan dump`` parser.
+
+Tiles the captured dump in fixtures/iw_scan_dump.txt to 100/1000/10000
+BSS blocks, each with a unique BSSID, and reports blocks/sec for the
+iw parser next to the nmcli parser on the same number of networks.
+
+    python benchmarks/bench_iw.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_parse import load_fixture  # noqa: E402
+from wifi_analyzer.iw import iter_iw  # noqa: E402
+from wifi_analyzer.scanner import iter_nmcli  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "iw_scan_dump.txt")
+SIZES = (100, 1000, 10000)
+
+
+def load_iw(blocks):
+    """Tile the captured dump to *blocks* BSS blocks with unique BSSIDs."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        recorded = ["BSS " + b for b in f.read().split("BSS ") if b]
+    lines = []
+    for i in range(blocks):
+        block = recorded[i % len(recorded)]
+        lines.extend(f"BSS 02:00:00:00:{i >> 8 & 0xFF:02x}:{i & 0xFF:02x}{block[21:]}"
+                     .splitlines())
+    return lines
+
+
+def measure(parse, lines, blocks):
+    repeat = max(1, 20000 // blocks)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        n = sum(1 for _net in parse(lines))
+    elapsed = time.perf_counter() - start
+    assert n == blocks, n
+    return blocks * repeat / elapsed
+
+
+def main():
+    print(f"{'networks':>8} {'parser':<6} {'networks/s':>12}")
+    for blocks in SIZES:
+        iw_lines = load_iw(blocks)
+        nmcli_lines = load_fixture(blocks).splitlines()
+        for name, parse, lines in (("iw", iter_iw, iw_lines), ("nmcli", iter_nmcli, nmcli_lines)):
+            print(f"{blocks:>8} {name:<6} {measure(parse, lines, blocks):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
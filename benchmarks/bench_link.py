@@ -0,0 +1,80 @@
+"""Per-sample cost of reading the connected link's signal.
+
+Writes a fake ``/proc/net/wireless`` with a few interfaces and times one
+sample taken four ways: LinkSampler (kept-open file, preadv into a
+preallocated buffer, targeted parse), reopening and fully parsing the
+file each time, and forking a process per sample (``cat`` of the same
+file, a lower bound for forking nmcli). Then samples at 50 Hz for a few
+seconds and reports the achieved rate and CPU used.
+
+    python benchmarks/bench_link.py [samples] [seconds]   (default 100000 3)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.link import LinkSampler, parse_wireless  # noqa: E402
+
+PROC = (
+    "Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE\n"
+    " face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22\n"
+    "wlp0s20f3: 0000   58.  -52.  -256        0      0      0      0     12        0\n"
+    " wlan1: 0000   40.  -70.  -95        0      0      0      0      3        0\n"
+    "  mon0: 0000    0.    0.  -256        0      0      0      0      0        0\n"
+)
+
+
+def per_call(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wireless")
+        with open(path, "w") as f:
+            f.write(PROC)
+        sampler = LinkSampler("wlan1", path=path)
+
+        def reopen():
+            with open(path, "rb") as f:
+                return parse_wireless(f.read())["wlan1"]
+
+        def fork():
+            return parse_wireless(subprocess.run(["cat", path], capture_output=True).stdout)
+
+        assert sampler.read() == reopen()
+        rows = [
+            ("read", per_call(sampler.read, n)),
+            ("sample", per_call(sampler.sample, n)),
+            ("reopen+parse", per_call(reopen, n)),
+            ("fork", per_call(fork, max(1, n // 500))),
+        ]
+        print(f"{'method':<13} {'us/sample':>10} {'max Hz':>10}")
+        for label, t in rows:
+            print(f"{label:<13} {t * 1e6:>10.1f} {1 / t:>10.0f}")
+
+        rate = 50
+        sampler = LinkSampler("wlan1", path=path)
+        cpu = time.process_time()
+        start = deadline = time.monotonic()
+        while time.monotonic() - start < seconds:
+            sampler.sample()
+            deadline += 1 / rate
+            time.sleep(max(0.0, deadline - time.monotonic()))
+        cpu = time.process_time() - cpu
+        print(f"{rate} Hz for {seconds:g} s: {len(sampler)} samples, measured "
+              f"{sampler.rate(seconds):.1f} Hz, CPU {cpu / seconds * 100:.2f}%")
+        sampler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Refresh benchmark for the network list model.
+
+Times a first fill, a steady-state refresh where ~3% of BSSIDs change
+(one appears, one vanishes, the rest move signal) and a band switch, for
+50/500/5000 synthetic networks. The "rebuild" column is the old approach
+of throwing the whole list away and re-adding every item. Needs PyGObject
+with GTK 4; rows are only materialized by Gtk.ListView for what is
+visible, so widget cost is not part of these numbers.
+
+    python benchmarks/bench_listview.py
+"""
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_parse import load_fixture  # noqa: E402
+from wifi_analyzer.app import NetworkItem, NetworkListModel  # noqa: E402
+from wifi_analyzer.scanner import iter_nmcli  # noqa: E402
+from wifi_analyzer.service import diff_scans  # noqa: E402
+
+SIZES = (50, 500, 5000)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'nets':>6} {'fill ms':>9} {'refresh ms':>11} {'band ms':>9} {'rebuild ms':>11}")
+    for size in SIZES:
+        scan = {n.mac: n for n in iter_nmcli(load_fixture(size + 1).splitlines())}
+        bssids = list(scan)
+        first = {b: scan[b] for b in bssids[:-1]}
+        second = dict(first)
+        del second[bssids[0]]
+        second[bssids[-1]] = scan[bssids[-1]]
+        for b in bssids[1:max(2, size * 3 // 100)]:
+            moved = copy.copy(second[b])
+            moved.dbm -= 10
+            moved.signal_pct = max(0, moved.signal_pct - 20)
+            second[b] = moved
+
+        model = NetworkListModel()
+        events, snap = diff_scans({}, first)
+        fill = timed(lambda: model.apply(events))
+        events, snap = diff_scans(snap, second)
+        refresh = timed(lambda: model.apply(events))
+        band = timed(lambda: model.set_band("5 GHz"))
+
+        def rebuild():
+            model.store.remove_all()
+            model.store.splice(0, 0, [NetworkItem(n) for n in second.values()])
+        full = timed(rebuild)
+        print(f"{size:>6} {fill:>9.2f} {refresh:>11.2f} {band:>9.2f} {full:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
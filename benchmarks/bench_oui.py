@@ -0,0 +1,123 @@
+"""OUI vendor lookups: memory-mapped table versus parsing the CSVs.
+
+Uses the IEEE registry CSVs given on the command line, or writes
+synthetic ones the size of the real registries (about 38k MA-L, 6k
+MA-M and 6k MA-S assignments, the smaller ones under a few hundred
+MA-L blocks as in the real data). Compiles the table, then compares
+opening it with parsing the CSVs into a dict at startup (time, and
+traced private memory in a separate run), and times lookups of
+assigned and unassigned BSSIDs.
+
+    python benchmarks/bench_oui.py [oui.csv mam.csv oui36.csv]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.oui import OuiTable, _read_registry, build_table  # noqa: E402
+
+SIZES = (("oui.csv", "MA-L", 6, 38000), ("mam.csv", "MA-M", 7, 6000),
+         ("oui36.csv", "MA-S", 9, 6500))
+LOOKUPS = 200000
+
+
+def write_registries(tmp, rng):
+    names = [f"Vendor {i} {rng.choice(('Inc.', 'Ltd', 'GmbH', 'Co., Ltd.'))}"
+             for i in range(30000)]
+    # Globally administered unicast prefixes: local and multicast bits clear
+    ouis = [v & ~0x030000 for v in rng.sample(range(1 << 24), 40000)]
+    parents = ouis[:300]
+    paths = []
+    for fname, registry, digits, count in SIZES:
+        path = os.path.join(tmp, fname)
+        extra = 4 * (digits - 6)
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["Registry", "Assignment", "Organization Name", "Organization Address"])
+            for i in range(count):
+                if extra:
+                    value = (rng.choice(parents) << extra) | rng.getrandbits(extra)
+                else:
+                    value = ouis[i]
+                w.writerow([registry, f"{value:0{digits}X}", rng.choice(names), "Somewhere 1"])
+        paths.append(path)
+    return paths
+
+
+def parse_dict(paths):
+    table = {}
+    for path in paths:
+        for bits, prefix, name in _read_registry(path):
+            table[bits, prefix] = name
+    return table
+
+
+def dict_lookup(table, mac):
+    for bits in (36, 28, 24):
+        name = table.get((bits, mac >> (48 - bits)))
+        if name is not None:
+            return name
+    return None
+
+
+def main():
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = sys.argv[1:] or write_registries(tmp, rng)
+        out = os.path.join(tmp, "oui.bin")
+        start = time.perf_counter()
+        count = build_table(paths, out)
+        build = time.perf_counter() - start
+        print(f"{count} prefixes, table {os.path.getsize(out) / 1024:.0f} KiB, "
+              f"built in {build * 1e3:.0f} ms")
+
+        # Time first, then memory: tracemalloc slows allocation down
+        start = time.perf_counter()
+        table = OuiTable(out)
+        opened = time.perf_counter() - start
+        table.close()
+        tracemalloc.start()
+        table = OuiTable(out)
+        mapped_mem = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        parsed = parse_dict(paths)
+        parse = time.perf_counter() - start
+        del parsed
+        tracemalloc.start()
+        parsed = parse_dict(paths)
+        dict_mem = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{'startup':<12} {'ms':>8} {'KiB':>8}")
+        print(f"{'mmap table':<12} {opened * 1e3:>8.2f} {mapped_mem / 1024:>8.0f}")
+        print(f"{'parse CSVs':<12} {parse * 1e3:>8.1f} {dict_mem / 1024:>8.0f}")
+
+        keys = list(parsed)
+        known = []
+        for _ in range(LOOKUPS):
+            bits, prefix = rng.choice(keys)
+            known.append((prefix << (48 - bits)) | rng.getrandbits(48 - bits))
+        unknown = [rng.getrandbits(48) & ~(0x03 << 40) for _ in range(LOOKUPS)]
+        assert all(table.lookup(m) == dict_lookup(parsed, m) for m in known[:20000] + unknown[:20000])
+        print(f"{'lookups':<12} {'assigned':>10} {'unassigned':>11}  (per second)")
+        for label, fn in (("mmap table", table.lookup),
+                          ("dict", lambda m: dict_lookup(parsed, m))):
+            rates = []
+            for macs in (known, unknown):
+                start = time.perf_counter()
+                for mac in macs:
+                    fn(mac)
+                rates.append(len(macs) / (time.perf_counter() - start))
+            print(f"{label:<12} {rates[0]:>10,.0f} {rates[1]:>11,.0f}")
+        table.close()
+
+
+if __name__ == "__main__":
+    main()
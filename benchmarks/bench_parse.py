@@ -0,0 +1,99 @@
+"""Throughput benchmark for the nmcli parser.
+
+Replays the recorded ``nmcli -t`` output in fixtures/nmcli_dense.txt,
+tiled with unique BSSIDs, at 10/100/1000/10000 rows and reports rows/sec
+and peak traced memory for the streaming parser and the old
+read-everything parser.
+
+    python benchmarks/bench_parse.py
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.scanner import freq_to_channel, iter_nmcli  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "nmcli_dense.txt")
+SIZES = (10, 100, 1000, 10000)
+
+
+def load_fixture(rows):
+    """Tile the recorded scan to *rows* lines, giving each a unique BSSID."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        recorded = [line.rstrip("\n") for line in f if line.strip()]
+    out = []
+    for i in range(rows):
+        line = recorded[i % len(recorded)]
+        head, sep, tail = line.partition("\\:")
+        # Rewrite the first BSSID octet pair so every row is distinct
+        out.append(f"{head[:-2]}{(i >> 8) & 0xFF:02X}{sep}{i & 0xFF:02X}{tail[2:]}"
+                   if sep else line)
+    return "\n".join(out) + "\n"
+
+
+def legacy_parse(stdout):
+    """The pre-streaming parser, kept here as the baseline."""
+    networks = []
+    for line in stdout.strip().split("\n"):
+        if not line.strip():
+            continue
+        parts = line.replace("\\:", "§").split(":")
+        parts = [p.replace("§", ":") for p in parts]
+        if len(parts) >= 6:
+            try:
+                freq = int(parts[0].strip().split()[0])
+            except (ValueError, IndexError):
+                freq = 0
+            try:
+                signal_pct = int(parts[1])
+            except ValueError:
+                signal_pct = 0
+            try:
+                channel = int(parts[2])
+            except (ValueError, IndexError):
+                channel = freq_to_channel(freq)
+            dbm = int(signal_pct / 2 - 100) if signal_pct else -100
+            networks.append({
+                "ssid": parts[5] or "<Hidden>", "bssid": parts[4], "freq": freq,
+                "channel": channel, "signal_pct": signal_pct, "dbm": dbm,
+                "security": parts[3], "band": "5 GHz" if freq >= 5000 else "2.4 GHz"
+            })
+    return networks
+
+
+def streaming_parse(stdout):
+    # Consume the generator without holding the records, as a pipeline would
+    n = 0
+    for _net in iter_nmcli(io.StringIO(stdout)):
+        n += 1
+    return n
+
+
+def measure(fn, text, rows):
+    repeat = max(1, 20000 // rows)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(text)
+    _cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows * repeat / elapsed, peak
+
+
+def main():
+    print(f"{'rows':>6} {'parser':<10} {'rows/s':>12} {'peak KiB':>10}")
+    for rows in SIZES:
+        text = load_fixture(rows)
+        for name, fn in (("legacy", legacy_parse), ("streaming", streaming_parse)):
+            rate, peak = measure(fn, text, rows)
+            print(f"{rows:>6} {name:<10} {rate:>12,.0f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
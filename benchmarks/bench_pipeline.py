@@ -0,0 +1,62 @@
+"""Headless scan pipeline at stadium scale, fed by the synthetic generator.
+
+Runs *scans* synthetic scans of 200/2000/5000 APs through everything a
+scan touches outside GTK — diffing in ScanService, the history ring,
+ScanFrame conversion and channel ranking — and reports the median and
+worst per-scan latency of each stage. The seed is fixed, so runs are
+comparable across commits.
+
+    python benchmarks/bench_pipeline.py [scans]   (default 30)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.history import ScanHistory  # noqa: E402
+from wifi_analyzer.interference import recommend  # noqa: E402
+from wifi_analyzer.records import ScanFrame  # noqa: E402
+from wifi_analyzer.service import ScanService  # noqa: E402
+from wifi_analyzer.simulate import SyntheticEnvironment  # noqa: E402
+
+SIZES = (200, 2000, 5000)
+
+
+def main():
+    scans = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    print(f"{'APs':>5} {'stage':<10} {'median ms':>10} {'max ms':>8}")
+    for aps in SIZES:
+        env = SyntheticEnvironment(aps, seed=42, churn=0.02)
+        stages = {"generate": [], "diff": [], "history": [], "frame": [], "recommend": []}
+        with tempfile.TemporaryDirectory() as tmp:
+            history = ScanHistory(os.path.join(tmp, "history.bin"), max_blocks=4 * aps)
+            nets = []
+            # The closure hands each freshly generated scan to the service
+            service = ScanService(backend=lambda: nets)
+            for i in range(scans):
+                t = time.perf_counter()
+                nets = env()
+                stages["generate"].append(time.perf_counter() - t)
+                t = time.perf_counter()
+                service.poll()
+                stages["diff"].append(time.perf_counter() - t)
+                t = time.perf_counter()
+                history.append_scan(float(i), nets)
+                stages["history"].append(time.perf_counter() - t)
+                t = time.perf_counter()
+                ScanFrame.from_networks(nets)
+                stages["frame"].append(time.perf_counter() - t)
+                t = time.perf_counter()
+                recommend(nets)
+                stages["recommend"].append(time.perf_counter() - t)
+            history.close()
+        for stage, times in stages.items():
+            times.sort()
+            print(f"{aps:>5} {stage:<10} {times[len(times) // 2] * 1e3:>10.2f} "
+                  f"{times[-1] * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
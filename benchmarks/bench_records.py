@@ -0,0 +1,74 @@
+"""Memory benchmark: scan history as dicts vs Network records vs ScanFrame.
+
+Keeps *scans* scans of a 300-BSSID site in memory using each layout and
+reports traced bytes per stored row, plus the cost of band filtering and
+sorting one scan.
+
+    python benchmarks/bench_records.py [scans]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_parse import load_fixture  # noqa: E402
+from wifi_analyzer.records import BAND_5, ScanFrame  # noqa: E402
+from wifi_analyzer.scanner import iter_nmcli  # noqa: E402
+
+SITE_SIZE = 300
+
+
+def scans(count):
+    """Yield *count* freshly parsed scans, as the live app would see them."""
+    text = load_fixture(SITE_SIZE)
+    for _ in range(count):
+        yield list(iter_nmcli(text.splitlines()))
+
+
+def retain(layout, count):
+    tracemalloc.start()
+    kept = []
+    for scan in scans(count):
+        if layout == "dict":
+            kept.append([net.as_dict() for net in scan])
+        elif layout == "slots":
+            kept.append(scan)
+        else:
+            kept.append(ScanFrame.from_networks(scan))
+        del scan
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, kept
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = count * SITE_SIZE
+    print(f"{count} scans x {SITE_SIZE} BSSIDs = {rows} rows")
+    print(f"{'layout':<8} {'MiB':>8} {'bytes/row':>10}")
+    for layout in ("dict", "slots", "frame"):
+        used, kept = retain(layout, count)
+        print(f"{layout:<8} {used / 2**20:>8.2f} {used / rows:>10.1f}")
+        del kept
+
+    scan = next(scans(1))
+    dicts = [net.as_dict() for net in scan]
+    frame = ScanFrame.from_networks(scan)
+    repeat = 2000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        sorted((n for n in dicts if n["band"] == BAND_5.label), key=lambda n: n["signal_pct"],
+               reverse=True)
+    dict_us = (time.perf_counter() - start) / repeat * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frame.argsort(indices=frame.band_indices(BAND_5))
+    frame_us = (time.perf_counter() - start) / repeat * 1e6
+    print(f"filter+sort one scan: dict {dict_us:.1f} us, frame {frame_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Write/reload benchmark for columnar scan-session files.
+
+Writes *rows* rows (1000 BSSIDs, one scan per second) to a ``.wscan``
+file, then times a full reload of every column into arrays, a one-hour
+time-range read and a single-BSSID lookup. The same rows written as
+NDJSON are parsed back for comparison on a 10**5 row sample.
+
+    python benchmarks/bench_scanfile.py [rows]   (default 10**7)
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.records import Network  # noqa: E402
+from wifi_analyzer.scanfile import SessionReader, SessionWriter  # noqa: E402
+
+BSSIDS = 1000
+NDJSON_ROWS = 10 ** 5
+
+
+def make_scan(rng):
+    nets = []
+    for i in range(BSSIDS):
+        pct = rng.randint(10, 100)
+        nets.append(Network(f"net-{i % 300}", f"3C:37:86:00:{i >> 8:02X}:{i & 0xFF:02X}",
+                            5180 + 20 * (i % 8), 36 + 4 * (i % 8), pct, (pct + 1) // 2 - 100,
+                            "WPA2", "5 GHz"))
+    return nets
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7
+    scans = max(rows // BSSIDS, 1)
+    nets = make_scan(random.Random(7))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.wscan")
+        start = time.perf_counter()
+        with SessionWriter(path) as writer:
+            for t in range(scans):
+                writer.append_scan(float(t), nets)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+        print(f"write: {scans * BSSIDS:,} rows in {elapsed:.1f} s, "
+              f"{size / 2 ** 20:.0f} MiB ({size / (scans * BSSIDS):.1f} bytes/row)")
+
+        with SessionReader(path) as reader:
+            start = time.perf_counter()
+            cols = reader.read()
+            elapsed = time.perf_counter() - start
+            print(f"full reload: {len(cols['ts']):,} rows in {elapsed * 1e3:.0f} ms")
+            del cols
+
+            t0 = scans / 2
+            start = time.perf_counter()
+            cols = reader.read(["ts", "dbm"], t0=t0, t1=t0 + 3600)
+            elapsed = time.perf_counter() - start
+            print(f"1 h range: {len(cols['ts']):,} rows from "
+                  f"{len(reader.select(t0, t0 + 3600))}/{len(reader.row_groups)} row groups "
+                  f"in {elapsed * 1e3:.1f} ms")
+            del cols
+
+            start = time.perf_counter()
+            found = sum(1 for _ in reader.networks(t0=t0, t1=t0 + 60, bssid=nets[123].bssid))
+            elapsed = time.perf_counter() - start
+            print(f"1 BSSID, 1 min: {found} rows in {elapsed * 1e3:.1f} ms")
+
+        sample = os.path.join(tmp, "sample.ndjson")
+        with open(sample, "w", encoding="utf-8") as f:
+            for t in range(NDJSON_ROWS // BSSIDS):
+                for net in nets:
+                    record = net.as_dict()
+                    record["ts"] = float(t)
+                    f.write(json.dumps(record) + "\n")
+        start = time.perf_counter()
+        with open(sample, encoding="utf-8") as f:
+            parsed = [json.loads(line) for line in f]
+        elapsed = time.perf_counter() - start
+        print(f"ndjson reload: {len(parsed):,} rows in {elapsed * 1e3:.0f} ms "
+              f"(~{elapsed * rows / len(parsed):.1f} s for {rows:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Adaptive scan scheduling against always-rescan, on a fake clock.
+
+Simulates two hours of a site with quiet stretches and bursts of APs
+coming and going. The fake radio takes 3 s per active sweep and 20 ms
+per cached read; its cache holds what the last sweep saw, ages out APs
+after CACHE_AGE seconds and picks up new APs on the home channel from
+their beacons. Everything runs on a fake clock, so results are exact
+and repeatable. Reports rescans, radio duty cycle, mean staleness (age
+of the last sweep, averaged over time) and how long it took for an AP
+appearing or vanishing to show up in the results.
+
+    python benchmarks/bench_scheduler.py [hours]   (default 2)
+"""
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.records import Network  # noqa: E402
+from wifi_analyzer.scheduler import AdaptiveScheduler, format_metrics  # noqa: E402
+
+SWEEP = 3.0
+READ = 0.02
+CACHE_AGE = 60.0
+HOME_CHANNEL = 6
+FIXED_INTERVAL = 10.0
+SITE = 150
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeRadio:
+    """A site whose APs come and go, seen through sweeps and a driver cache."""
+
+    def __init__(self, clock, seed=1):
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.t = 0.0
+        self.next_id = 0
+        self.aps = {}        # mac -> Network, what is on the air now
+        self.cache = {}      # mac -> (Network, last heard)
+        self.events = []     # (time, mac, appeared)
+        for _ in range(SITE):
+            self._add(log=False)
+
+    def _add(self, log=True):
+        self.next_id += 1
+        ch = self.rng.choice((1, 6, 11, 36, 44, 149))
+        mac = 0x020000000000 + self.next_id
+        self.aps[mac] = Network("ap", mac, 2407 + 5 * ch if ch < 14 else 5000 + 5 * ch, ch, 50,
+                                -60, "WPA2", "2.4 GHz" if ch < 14 else "5 GHz")
+        if log:
+            self.events.append((self.t, mac, True))
+
+    def churn_rate(self, t):
+        """APs replaced per minute: a burst for 10 minutes of every 40."""
+        return 6.0 if (t // 60) % 40 >= 30 else 0.0
+
+    def advance_to(self, t):
+        while self.t + 1 <= t:
+            self.t += 1
+            if self.rng.random() < self.churn_rate(self.t) / 60:
+                gone = self.rng.choice(list(self.aps))
+                del self.aps[gone]
+                self.events.append((self.t, gone, False))
+                self._add()
+
+    def sweep(self):
+        self.advance_to(self.clock())
+        self.clock.advance(SWEEP)
+        now = self.clock()
+        self.cache = {mac: (net, now) for mac, net in self.aps.items()}
+        return list(self.aps.values())
+
+    def read(self):
+        self.advance_to(self.clock())
+        self.clock.advance(READ)
+        now = self.clock()
+        for mac, net in self.aps.items():
+            if net.channel == HOME_CHANNEL:
+                self.cache[mac] = (net, now)
+        self.cache = {m: v for m, v in self.cache.items() if now - v[1] <= CACHE_AGE}
+        return [net for net, _t in self.cache.values()]
+
+
+def mean_age(samples):
+    """Time-averaged age of the freshest sweep, from ``(t, age)`` per result."""
+    total = weighted = 0.0
+    for (t, age), (t_next, _a) in zip(samples, samples[1:]):
+        gap = t_next - t
+        weighted += (age + gap / 2) * gap
+        total += gap
+    return weighted / total if total else 0.0
+
+
+class Detector:
+    """Time from each AP appearing or vanishing to the first result showing it."""
+
+    def __init__(self, radio):
+        self.radio = radio
+        self.seen = 0
+        self.pending = {}
+        self.delays = []
+
+    def result(self, nets, t):
+        events = self.radio.events
+        while self.seen < len(events):
+            te, mac, appeared = events[self.seen]
+            self.pending[mac] = (te, appeared)
+            self.seen += 1
+        macs = {n.mac for n in nets}
+        for mac, (te, appeared) in list(self.pending.items()):
+            if (mac in macs) == appeared:
+                self.delays.append(t - te)
+                del self.pending[mac]
+
+
+def run_fixed(hours):
+    clock = FakeClock()
+    radio = FakeRadio(clock)
+    det = Detector(radio)
+    sweeps = 0
+    ages = []
+    while clock() < hours * 3600:
+        start = clock()
+        det.result(radio.sweep(), clock())
+        sweeps += 1
+        ages.append((clock(), 0.0))
+        clock.advance(max(0.0, FIXED_INTERVAL - (clock() - start)))
+    duty = sweeps * SWEEP / clock()
+    return sweeps, sweeps, duty, mean_age(ages), det
+
+
+def run_adaptive(hours):
+    clock = FakeClock()
+    radio = FakeRadio(clock)
+    det = Detector(radio)
+    sched = AdaptiveScheduler(radio.sweep, radio.read, clock=clock)
+    ages = []
+
+    async def loop():
+        while clock() < hours * 3600:
+            nets = await sched()
+            det.result(nets, clock())
+            ages.append((clock(), sched.staleness()))
+            clock.advance(sched.next_delay())
+
+    asyncio.run(loop())
+    duty = sched.rescans * SWEEP / clock()
+    print(format_metrics(sched.metrics()))
+    return sched.scans, sched.rescans, duty, mean_age(ages), det
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print(f"{hours:g} h, {SITE} APs, bursts of 6 APs/min for 10 of every 40 min")
+    rows = []
+    for label, run in (("fixed 10 s", run_fixed), ("adaptive", run_adaptive)):
+        scans, rescans, duty, stale, det = run(hours)
+        d = sorted(det.delays)
+        p50 = d[len(d) // 2] if d else float("nan")
+        p95 = d[int(len(d) * 0.95)] if d else float("nan")
+        rows.append((label, scans, rescans, duty, stale, p50, p95, len(det.pending)))
+    print(f"{'policy':<11} {'scans':>6} {'rescans':>8} {'duty':>6} {'stale s':>8} "
+          f"{'detect p50':>11} {'p95':>6} {'missed':>7}")
+    for label, scans, rescans, duty, stale, p50, p95, missed in rows:
+        print(f"{label:<11} {scans:>6} {rescans:>8} {duty * 100:>5.1f}% {stale:>8.1f} "
+              f"{p50:>10.1f}s {p95:>5.1f}s {missed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Type-ahead filtering of a 10k-network list, indexed versus a linear scan.
+
+Replays typing sessions character by character over a synthetic site.
+Per keystroke it times the work between the key and the next frame
+that does not depend on GTK: parsing the query, looking up the matching
+set in the indexes, and re-running the list filter on only the rows GTK
+re-checks for that change (visible rows when the result got stricter,
+hidden rows when it got looser, all rows otherwise). The linear scan
+tests every network against the query instead. Also reports the cost
+of keeping the indexes in step with a scan.
+
+    python benchmarks/bench_search.py [networks]   (default 10000)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.search import NetworkIndex, parse_query  # noqa: E402
+from wifi_analyzer.simulate import SyntheticEnvironment  # noqa: E402
+
+SESSIONS = ("guest", "staff ch:36", "sec:wpa3 >-70", "b4:fb", "vendor ch:1,6,11")
+
+
+def keystrokes(text):
+    """Prefixes while typing *text*, then backspacing it away."""
+    typed = [text[:i] for i in range(1, len(text) + 1)]
+    return typed + typed[-2::-1] + [""]
+
+
+def pct(times, p):
+    times = sorted(times)
+    return times[min(int(len(times) * p), len(times) - 1)] * 1e3
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    env = SyntheticEnvironment(count, seed=11, churn=0.01)
+    nets = env()
+    index = NetworkIndex()
+    start = time.perf_counter()
+    for net in nets:
+        index.add(net)
+    print(f"{len(index)} networks, index built in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    indexed, linear = [], []
+    for session in SESSIONS:
+        matches = None
+        for text in keystrokes(session):
+            t0 = time.perf_counter()
+            terms = parse_query(text)
+            new = index.search(terms)
+            # What Gtk.CustomFilter re-checks for the change it is told about
+            if new is None or matches is not None and matches <= new:
+                recheck = [n for n in nets if n.mac not in matches] if matches is not None else []
+            elif matches is None or new <= matches:
+                recheck = [n for n in nets if n.mac in matches] if matches is not None else nets
+            else:
+                recheck = nets
+            for net in recheck:
+                new is None or net.mac in new
+            matches = new
+            indexed.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            terms = parse_query(text)
+            [net for net in nets if index.match(terms, net)]
+            linear.append(time.perf_counter() - t0)
+    print(f"{len(indexed)} keystrokes     p50 ms   p95 ms   max ms")
+    for label, times in (("indexed", indexed), ("linear scan", linear)):
+        print(f"{label:<16} {pct(times, 0.5):>7.2f}  {pct(times, 0.95):>7.2f}  {pct(times, 1):>7.2f}")
+
+    # Keeping the indexes current: one scan's worth of updates
+    scans = []
+    current = {n.mac: n for n in nets}
+    for _ in range(20):
+        new = {n.mac: n for n in env()}
+        t0 = time.perf_counter()
+        for mac in current.keys() - new.keys():
+            index.remove(mac)
+        for net in new.values():
+            index.add(net)
+        scans.append(time.perf_counter() - t0)
+        current = new
+    print(f"index update per scan  p50 {pct(scans, 0.5):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Startup timing harness.
+
+Default mode runs ``python -m wifi_analyzer scan --replay <fixture>
+--count 1`` in fresh interpreters and reports the median wall time,
+failing if it exceeds the 100 ms budget or if ``gi`` was imported.
+
+It also imports the package modules app.py imports at module level
+(everything the GUI loads before its first frame, apart from GTK) and
+fails if they take over 40 ms or pull in asyncio, which the scan service
+should only load once the window is up. This check needs no GTK.
+
+``--gui`` launches the GTK app with WIFI_ANALYZER_STARTUP_PROBE set; the
+app reports when its first frame was painted and quits, which gives the
+time-to-first-frame. Both modes also list the slowest imports from
+``python -X importtime``.
+
+    python benchmarks/bench_startup.py [--gui] [runs]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+FIXTURE = os.path.join(ROOT, "benchmarks", "fixtures", "nmcli_dense.txt")
+SCAN_BUDGET_MS = 100
+APP_IMPORTS_BUDGET_MS = 40
+SCAN_ARGS = ["scan", "--replay", FIXTURE, "--count", "1"]
+PROBE_ENV = "WIFI_ANALYZER_STARTUP_PROBE"
+
+
+def run(args, extra=(), probe=False):
+    """Run the package once; return (wall ms, ms to first frame or None, process)."""
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    if probe:
+        env[PROBE_ENV] = "1"
+    cmd = [sys.executable, *extra, "-m", "wifi_analyzer", *args]
+    start = time.monotonic()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    wall = (time.monotonic() - start) * 1000
+    first_frame = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("first-frame "):
+            first_frame = (float(line.split()[1]) - start) * 1000
+    return wall, first_frame, proc
+
+
+def app_imports():
+    """Package modules imported at the top level of app.py."""
+    with open(os.path.join(ROOT, "src", "wifi_analyzer", "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module.startswith("wifi_analyzer"):
+            if node.module == "wifi_analyzer":
+                names += [f"wifi_analyzer.{a.name}" for a in node.names]
+            else:
+                names.append(node.module)
+    return sorted(set(names))
+
+
+_IMPORT_APP_MODULES = """
+import importlib, sys, time
+skipped = []
+t = time.perf_counter()
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except ImportError as e:  # a third-party module (cairo) missing here
+        skipped.append(f"{name} ({e.name})")
+print((time.perf_counter() - t) * 1000, *skipped)
+"""
+
+
+def time_app_imports(runs):
+    """Import app_imports() in fresh interpreters.
+
+    Returns the median ms, the modules skipped for a missing dependency
+    and the names of every module loaded.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    cmd = [sys.executable, "-X", "importtime", "-c", _IMPORT_APP_MODULES, *app_imports()]
+    times = []
+    for _ in range(runs + 1):
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+        ms, *skipped = proc.stdout.split(" ", 1)
+        times.append(float(ms))
+    rows, _top = slowest_imports(proc.stderr)
+    return statistics.median(times[1:]), skipped, {name.strip() for _c, name in rows}
+
+
+def slowest_imports(stderr, limit=8):
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _self, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows, rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("runs", nargs="?", type=int, default=10)
+    parser.add_argument("--gui", action="store_true", help="measure time to first frame")
+    opts = parser.parse_args()
+
+    args = [] if opts.gui else SCAN_ARGS
+    run(args, probe=opts.gui)  # warm the page cache and bytecode
+    results = [run(args, probe=opts.gui) for _ in range(opts.runs)]
+    if opts.gui:
+        times = sorted(r[1] for r in results if r[1] is not None)
+        label = "time to first frame"
+    else:
+        times = sorted(r[0] for r in results)
+        label = "scan --count 1"
+    median = statistics.median(times)
+    print(f"{label}: median {median:.1f} ms, min {times[0]:.1f} ms over {len(times)} runs")
+
+    _wall, _ff, proc = run(args, ("-X", "importtime"), probe=opts.gui)
+    rows, top = slowest_imports(proc.stderr)
+    for cumulative, name in top:
+        print(f"  {cumulative / 1000:7.1f} ms {name}")
+
+    if opts.gui:
+        return 0
+    failed = False
+    if any(name.strip() == "gi" for _c, name in rows):
+        print("FAIL: the headless path imported gi")
+        failed = True
+    if median > SCAN_BUDGET_MS:
+        print(f"FAIL: over the {SCAN_BUDGET_MS} ms budget")
+        failed = True
+
+    app_ms, skipped, loaded = time_app_imports(opts.runs)
+    print(f"app.py package imports: median {app_ms:.1f} ms"
+          + (f" (skipped {skipped[0].strip()})" if skipped else ""))
+    if "asyncio" in loaded:
+        print("FAIL: app.py imports asyncio before the first frame")
+        failed = True
+    if app_ms > APP_IMPORTS_BUDGET_MS:
+        print(f"FAIL: over the {APP_IMPORTS_BUDGET_MS} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
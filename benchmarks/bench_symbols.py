@@ -0,0 +1,122 @@
+"""Interned records versus plain strings over a long replayed session.
+
+Records a synthetic 300-AP site for 2000 scans as ``nmcli -t`` text,
+then replays it twice: once into records shaped like the old ones (BSSID,
+SSID and security as fresh strings per scan, band as a label) and once
+through the real parser (BSSID as a 48-bit integer, shared symbol-table
+strings, Band enum). Reports traced memory when every scan is kept, and
+per-scan time (measured in a second run, without tracemalloc) to parse, filter
+by band, join with the previous scan and group by SSID.
+
+    python benchmarks/bench_symbols.py [scans] [aps]   (default 2000 300)
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.channels import band_for_freq  # noqa: E402
+from wifi_analyzer.records import BAND_5  # noqa: E402
+from wifi_analyzer.scanner import iter_nmcli  # noqa: E402
+from wifi_analyzer.simulate import SyntheticEnvironment  # noqa: E402
+
+
+class LegacyNetwork:
+    """The record as it was: every field a per-scan object, band a label."""
+
+    __slots__ = ("ssid", "bssid", "freq", "channel", "signal_pct", "dbm", "security", "band")
+
+    def __init__(self, ssid, bssid, freq, channel, signal_pct, dbm, security, band):
+        self.ssid = ssid
+        self.bssid = bssid
+        self.freq = freq
+        self.channel = channel
+        self.signal_pct = signal_pct
+        self.dbm = dbm
+        self.security = security
+        self.band = band
+
+
+def legacy_parse(lines):
+    out = []
+    for line in lines:
+        freq_s, signal_s, chan_s, security, rest = line.split(":", 4)
+        # Same fast path as scanner.parse_line: escaped BSSID, then the SSID
+        bssid = rest[:23].replace("\\", "")
+        ssid = rest[24:]
+        freq = int(freq_s[:-4])
+        pct = int(signal_s)
+        out.append(LegacyNetwork(ssid, bssid, freq, int(chan_s), pct, (pct + 1) // 2 - 100,
+                                 security, str(band_for_freq(freq))))
+    return out
+
+
+def record(scans, aps):
+    env = SyntheticEnvironment(aps, seed=7, churn=0.002)
+    session = []
+    for _ in range(scans):
+        session.append([
+            f"{n.freq} MHz:{n.signal_pct}:{n.channel}:{n.security}:"
+            f"{n.bssid.replace(':', chr(92) + ':')}:{n.ssid}" for n in env()])
+    return session
+
+
+def replay(session, parse, key, band):
+    kept = []
+    t_parse = t_filter = t_join = t_group = 0.0
+    prev = {}
+    for lines in session:
+        t0 = time.perf_counter()
+        nets = parse(lines)
+        t1 = time.perf_counter()
+        [n for n in nets if n.band == band]
+        t2 = time.perf_counter()
+        cur = {key(n): n for n in nets}
+        [n for k, n in cur.items() if (p := prev.get(k)) is None or p.dbm != n.dbm
+         or p.ssid != n.ssid or p.security != n.security]
+        t3 = time.perf_counter()
+        groups = {}
+        for n in nets:
+            groups.setdefault(n.ssid, []).append(n)
+        t4 = time.perf_counter()
+        prev = cur
+        kept.append(nets)
+        t_parse += t1 - t0
+        t_filter += t2 - t1
+        t_join += t3 - t2
+        t_group += t4 - t3
+    n = len(session)
+    return [t / n * 1e3 for t in (t_parse, t_filter, t_join, t_group)], kept
+
+
+def retained(session, parse):
+    tracemalloc.start()
+    kept = [parse(lines) for lines in session]
+    used, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+def main():
+    scans = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    aps = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    session = record(scans, aps)
+    rows = sum(len(s) for s in session)
+    print(f"{scans} scans of {aps} APs, {rows:,} rows kept")
+    print(f"{'records':<9} {'MiB':>7} {'B/row':>6} {'parse':>7} {'filter':>7} {'join':>7} "
+          f"{'group':>7}  (ms/scan)")
+    runs = (("strings", legacy_parse, lambda n: n.bssid, BAND_5.label),
+            ("interned", lambda lines: list(iter_nmcli(lines)), lambda n: n.mac, BAND_5))
+    for label, parse, key, band in runs:
+        used = retained(session, parse)
+        times, kept = replay(session, parse, key, band)
+        del kept
+        print(f"{label:<9} {used / 2**20:>7.1f} {used / rows:>6.0f} "
+              + " ".join(f"{t:>7.3f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
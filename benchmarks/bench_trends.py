@@ -0,0 +1,75 @@
+"""Cost and effect of the incremental per-BSSID trend statistics.
+
+Feeds 10 minutes of 1 Hz scans of 10,000 synthetic BSSIDs (1 dB of
+noise on top of slow drifts) into a TrendTracker and reports the time
+per scan and the resulting CPU share at 1 Hz. It also counts how many
+rows change position per scan when sorting by the raw dBm versus the
+tracker's hysteresis key (the fewest rows that would have to move).
+
+    python benchmarks/bench_trends.py [bssids] [scans]   (default 10000 600)
+"""
+import os
+import random
+from bisect import bisect_left
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wifi_analyzer.records import Network  # noqa: E402
+from wifi_analyzer.trends import TrendTracker  # noqa: E402
+
+
+def moved(order, prev):
+    """Fewest rows that must move to turn *prev* into *order* (n - LIS)."""
+    rank = {b: i for i, b in enumerate(prev)}
+    tails = []
+    for b in order:
+        r = rank[b]
+        i = bisect_left(tails, r)
+        if i == len(tails):
+            tails.append(r)
+        else:
+            tails[i] = r
+    return len(order) - len(tails)
+
+
+def main():
+    bssids = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    scans = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    rng = random.Random(5)
+    levels = [rng.uniform(-90, -35) for _ in range(bssids)]
+    drift = [rng.uniform(-0.05, 0.05) for _ in range(bssids)]
+    nets = [Network("ssid", f"02:00:00:00:{i >> 8 & 0xFF:02X}:{i & 0xFF:02X}", 2437, 6, 50,
+                    -60, "WPA2", "2.4 GHz") for i in range(bssids)]
+
+    tracker = TrendTracker()
+    elapsed = 0.0
+    raw_moves = key_moves = 0
+    prev_raw = prev_key = None
+    for t in range(scans):
+        for i, net in enumerate(nets):
+            net.dbm = round(levels[i] + drift[i] * t + rng.gauss(0, 1.0))
+        start = time.perf_counter()
+        tracker.update_scan(float(t), nets)
+        tracker.take_dirty()
+        elapsed += time.perf_counter() - start
+        if t % 10 == 0:
+            raw = [n.mac for n in sorted(nets, key=lambda n: (-n.dbm, n.mac))]
+            key = [n.mac for n in sorted(nets, key=lambda n: (-tracker.get(n.mac).key,
+                                                                 n.mac))]
+            if prev_raw is not None:
+                raw_moves += moved(raw, prev_raw)
+                key_moves += moved(key, prev_key)
+            prev_raw, prev_key = raw, key
+
+    per_scan = elapsed / scans
+    print(f"{bssids:,} BSSIDs x {scans} scans: {per_scan * 1e3:.2f} ms/scan, "
+          f"{per_scan * 1e9 / bssids:.0f} ns/sample, {per_scan * 100:.1f}% CPU at 1 Hz")
+    samples = max(scans // 10 - 1, 1)
+    print(f"rows moving per 10 s: raw dBm {raw_moves / samples:,.0f}, "
+          f"hysteresis key {key_moves / samples:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Build hook: compile the OUI vendor table into the package.
+
+Metadata lives in pyproject.toml. When the IEEE registry CSVs are found
+(``$WIFI_ANALYZER_IEEE_DATA``, else the ieee-data package's directory),
+build_py compiles them into ``wifi_analyzer/oui.bin`` so the table ships
+with the package; otherwise it is compiled on first use at runtime.
+"""
+import os
+import sys
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from wifi_analyzer.oui import IEEE_DATA_DIRS, TABLE_NAME, build_table, registry_csvs  # noqa: E402
+
+IEEE_DATA_ENV = "WIFI_ANALYZER_IEEE_DATA"
+
+
+class BuildPyWithOui(build_py):
+    def run(self):
+        super().run()
+        env = os.environ.get(IEEE_DATA_ENV)
+        sources = registry_csvs((env,) if env else IEEE_DATA_DIRS)
+        if not sources:
+            self.announce("no IEEE registry CSVs found; not bundling an OUI table", level=2)
+            return
+        out = os.path.join(self.build_lib, "wifi_analyzer", TABLE_NAME)
+        if not self.dry_run:
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            count = build_table(sources, out)
+            self.announce(f"compiled {count} OUI prefixes into {out}", level=2)
+
+
+setup(cmdclass={"build_py": BuildPyWithOui})
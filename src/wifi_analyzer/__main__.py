@@ -1,7 +1,8 @@
 """Allow running as python3 -m wifi_analyzer."""
-from wifi_analyzer.app import main
-from wifi_analyzer.accessibility import AccessibilityManager
-main()
+import sys
+
+from wifi_analyzer.cli import main
+sys.exit(main())
 
 
 # --- Session restore ---
@@ -0,0 +1,130 @@
+"""Asyncio scanning core.
+
+Scan sources are async callables returning a list of Network records.
+A :class:`CommandSource` runs a scanner command with
+``asyncio.create_subprocess_exec``; the process is killed when the scan
+times out or is cancelled, so a stopped scan never leaves nmcli or iw
+running. :class:`AsyncScanner` runs several sources (interfaces,
+backends) concurrently, merges their results by BSSID and coalesces
+concurrent scan requests into the one scan already in flight.
+
+The command is just an argument list, so tests can point a source at a
+script that prints recorded output, sleeps or fails.
+"""
+import asyncio
+import subprocess
+
+from wifi_analyzer.instrument import span
+from wifi_analyzer.scanner import SCAN_TIMEOUT
+
+
+async def run_command(args, timeout=SCAN_TIMEOUT):
+    """Run *args* and return its stdout as text.
+
+    Raises subprocess.CalledProcessError on a non-zero exit and
+    subprocess.TimeoutExpired after *timeout* seconds. On timeout or
+    cancellation the process is killed before the exception propagates.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    try:
+        out, _err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(args, timeout)
+    except BaseException:
+        await _kill(proc)
+        raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, out)
+    return out.decode("utf-8", "replace")
+
+
+async def _kill(proc):
+    if proc.returncode is None:
+        proc.kill()
+        # Reap it even while being cancelled
+        await asyncio.shield(proc.wait())
+
+
+class CommandSource:
+    """Scan source running *args* and parsing its output lines with *parse*."""
+
+    def __init__(self, args, parse, timeout=SCAN_TIMEOUT, name=None):
+        self.args = list(args)
+        self.parse = parse
+        self.timeout = timeout
+        self.name = name or self.args[0]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+    async def __call__(self):
+        with span("exec"):
+            text = await run_command(self.args, self.timeout)
+        with span("parse") as s:
+            nets = list(self.parse(text.splitlines()))
+            s.n = len(nets)
+        return nets
+
+
+def merge_by_bssid(scans):
+    """Merge lists of networks, keeping the strongest record per BSSID."""
+    merged = {}
+    extra = []
+    for nets in scans:
+        for net in nets:
+            mac = net.mac
+            if not mac:
+                extra.append(net)
+                continue
+            prev = merged.get(mac)
+            if prev is None or net.dbm > prev.dbm:
+                merged[mac] = net
+    return list(merged.values()) + extra
+
+
+class AsyncScanner:
+    """Scan all *sources* concurrently and merge the results.
+
+    Calling :meth:`scan` while a scan is in flight waits for that scan
+    instead of starting another one. A source that fails is left out of
+    the merged result and its exception kept in ``errors``; only when
+    every source fails does the scan raise (the first error).
+    """
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+        self.errors = []
+        self._inflight = None
+
+    async def __call__(self):
+        return await self.scan()
+
+    async def scan(self):
+        task = self._inflight
+        if task is None or task.done():
+            task = self._inflight = asyncio.ensure_future(self._scan())
+        # A cancelled waiter must not cancel the scan others are waiting for
+        return await asyncio.shield(task)
+
+    def cancel(self):
+        """Cancel the scan in flight, killing its processes."""
+        if self._inflight is not None:
+            self._inflight.cancel()
+
+    async def _scan(self):
+        results = await asyncio.gather(*(source() for source in self.sources),
+                                       return_exceptions=True)
+        scans = []
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            else:
+                scans.append(result)
+        self.errors = errors
+        if errors and not scans:
+            raise errors[0]
+        return merge_by_bssid(scans)
+
@@ -0,0 +1,358 @@
+"""BSS grouping and rogue AP detection over successive scans.
+
+BSSIDs are grouped into physical access points and those into networks
+(ESSes) by SSID, and a few signs of a rogue or evil-twin AP are flagged
+as scans come in:
+
+* an SSID advertised with different kinds of security (an open twin of
+  a WPA network is the classic evil twin);
+* a new BSSID for an established SSID from a vendor none of its APs
+  come from;
+* a sudden large jump of a BSSID's signal, as when a nearby device
+  starts spoofing it;
+* a BSSID heard on two channels, in one scan or flapping between them.
+
+An AP's radios and virtual BSSes use consecutive addresses, sometimes
+with the locally administered bit set, so BSSIDs that agree once that
+bit and the low *RADIO_BITS* bits are cleared count as one AP. All
+grouping is done with hash indexes updated per BSSID as it appears,
+changes or is forgotten, never by comparing BSSIDs pairwise, so a scan
+costs the same per BSSID at ten or ten thousand of them.
+"""
+import enum
+import gettext
+import threading
+
+from wifi_analyzer.oui import LOCAL_BIT
+from wifi_analyzer.records import int_to_bssid
+
+_ = gettext.gettext
+
+RADIO_BITS = 4       # low address bits that differ between BSSes of one AP
+JUMP_DB = 20         # dB away from the running level counted as a jump
+JUMP_ALPHA = 0.3     # weight of the newest sample in the running level
+MIN_SAMPLES = 3      # samples of a BSSID before jumps are reported
+JUMP_WINDOW = 60.0   # seconds; a BSSID unseen longer may simply have moved
+WARMUP = 3           # scans an SSID is seen before new BSSIDs are suspicious
+FLAPS = 2            # channel changes back and forth counted as a clone
+MAX_AGE = 3600.0     # seconds unseen before a BSSID is forgotten
+PRUNE_EVERY = 100    # scans between checks for unseen BSSIDs
+
+SECURITY_MISMATCH = "security-mismatch"
+NEW_BSSID = "new-bssid"
+SIGNAL_JUMP = "signal-jump"
+CLONED_BSSID = "cloned-bssid"
+
+# Kinds of security, weakest first
+OPEN, WEP, PERSONAL, ENTERPRISE = "open", "wep", "personal", "enterprise"
+_RANK = {OPEN: 0, WEP: 1, PERSONAL: 2, ENTERPRISE: 3}
+
+
+class Severity(enum.IntEnum):
+    WARNING = 1
+    CRITICAL = 2
+
+    def __str__(self):
+        return self.name.lower()
+
+
+def security_class(security):
+    """Kind of security of a security string ("WPA2 WPA3" is ``PERSONAL``)."""
+    tokens = security.upper().split()
+    if not tokens:
+        return OPEN
+    if "802.1X" in tokens or "EAP" in tokens:
+        return ENTERPRISE
+    if tokens == ["WEP"]:
+        return WEP
+    return PERSONAL
+
+
+def ap_key(mac):
+    """Key shared by the BSSIDs of one physical AP."""
+    return (mac & ~LOCAL_BIT) >> RADIO_BITS
+
+
+class Alert:
+    """One suspicious observation; *detail* holds the values of its message."""
+
+    __slots__ = ("kind", "severity", "mac", "ssid", "ts", "detail")
+
+    def __init__(self, kind, severity, mac, ssid, ts, **detail):
+        self.kind = kind
+        self.severity = severity
+        self.mac = mac
+        self.ssid = ssid
+        self.ts = ts
+        self.detail = detail
+
+    @property
+    def bssid(self):
+        return int_to_bssid(self.mac)
+
+    @property
+    def message(self):
+        if self.kind == SECURITY_MISMATCH:
+            text = _("{ssid}: {bssid} is {security}, other BSSIDs are {others}")
+        elif self.kind == NEW_BSSID:
+            text = _("{ssid}: new BSSID {bssid} from {maker}, unlike its other APs")
+        elif self.kind == SIGNAL_JUMP:
+            text = _("{ssid}: {bssid} jumped {delta:+d} dB to {dbm} dBm")
+        else:
+            text = _("{ssid}: {bssid} heard on channels {channel} and {other}")
+        return text.format(ssid=self.ssid, bssid=self.bssid, **self.detail)
+
+    def __repr__(self):
+        return f"Alert({self.kind}, {self.severity}, {self.bssid})"
+
+    def as_dict(self):
+        out = {"ts": self.ts, "kind": self.kind, "severity": str(self.severity),
+               "bssid": self.bssid, "ssid": self.ssid, "message": self.message}
+        out.update(self.detail)
+        return out
+
+
+class _Bss:
+    __slots__ = ("mac", "ssid", "security", "kind", "ap", "maker", "trusted", "channel",
+                 "last_channel", "flaps", "level", "n", "last_seen")
+
+
+class Ess:
+    """The BSSIDs sharing one SSID, with counts of what they have in common.
+
+    The ``trusted_`` counts leave out BSSIDs that raised an alert.
+    """
+
+    __slots__ = ("ssid", "macs", "aps", "makers", "kinds", "trusted_makers", "trusted_kinds",
+                 "first_scan")
+
+    def __init__(self, ssid, scan):
+        self.ssid = ssid
+        self.macs = set()
+        self.aps = {}      # ap key -> BSSIDs
+        self.makers = {}   # vendor (or OUI) -> BSSIDs
+        self.kinds = {}    # security class -> BSSIDs
+        self.trusted_makers = {}
+        self.trusted_kinds = {}
+        self.first_scan = scan
+
+
+def _count(counts, key, n):
+    n += counts.get(key, 0)
+    if n:
+        counts[key] = n
+    else:
+        del counts[key]
+
+
+class ScanAnalyzer:
+    """Groups and checks the BSSIDs of successive scans.
+
+    Feed it with update() (it fits ``ScanService.subscribe_scans``); it
+    returns the alerts that scan raised and also collects them until
+    take_alerts() is called, which may happen on another thread.
+    ``active`` maps each BSSID to its latest alert and, like the
+    groupings, is only safe to read on the thread that calls update().
+    *vendor_of* maps a BSSID integer to a vendor name; without it
+    vendors are told apart by OUI.
+    """
+
+    def __init__(self, vendor_of=None, jump_db=JUMP_DB, warmup=WARMUP, max_age=MAX_AGE):
+        self.vendor_of = vendor_of
+        self.jump_db = jump_db
+        self.warmup = warmup
+        self.max_age = max_age
+        self.scans = 0
+        self.active = {}
+        self._bss = {}
+        self._aps = {}   # ap key -> set of macs
+        self._ess = {}   # ssid -> Ess
+        self._hidden = {"", _("<Hidden>")}
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._bss)
+
+    # -- queries ---------------------------------------------------------
+
+    def access_point(self, mac):
+        """BSSIDs grouped with *mac* into one physical AP (empty if unknown)."""
+        return set(self._aps.get(ap_key(mac), ()))
+
+    def access_points(self):
+        """``{ap key: set of BSSIDs}`` for every physical AP."""
+        return self._aps
+
+    def ess(self, ssid):
+        """The :class:`Ess` of *ssid*, or None."""
+        return self._ess.get(ssid)
+
+    def networks(self):
+        """``{ssid: Ess}`` for every SSID that is not hidden."""
+        return self._ess
+
+    def take_alerts(self):
+        """Return and reset the alerts raised since the last call."""
+        with self._lock:
+            alerts, self._pending = self._pending, []
+        return alerts
+
+    # -- updates ---------------------------------------------------------
+
+    def update(self, ts, networks):
+        """Fold in one scan taken at *ts*; return the alerts it raised."""
+        self.scans += 1
+        alerts = []
+        channels = {}
+        bss = self._bss
+        for net in networks:
+            mac = net.mac
+            if not mac:
+                continue
+            channel = channels.get(mac)
+            if channel is not None:
+                seen = self.active.get(mac)
+                if channel != net.channel and (seen is None or seen.kind != CLONED_BSSID):
+                    alerts.append(Alert(CLONED_BSSID, Severity.CRITICAL, mac, net.ssid, ts,
+                                        channel=channel, other=net.channel))
+                continue
+            channels[mac] = net.channel
+            b = bss.get(mac)
+            if b is None:
+                self._add(net, ts, alerts)
+                continue
+            if net.ssid != b.ssid or net.security != b.security:
+                self._leave(b)
+                b.ssid = net.ssid
+                b.security = net.security
+                b.kind = security_class(net.security)
+                self._join(b, ts, alerts)
+            if net.channel != b.channel:
+                if net.channel == b.last_channel and ts - b.last_seen <= JUMP_WINDOW:
+                    b.flaps += 1
+                    if b.flaps == FLAPS:
+                        alerts.append(Alert(CLONED_BSSID, Severity.CRITICAL, mac, b.ssid, ts,
+                                            channel=b.channel, other=net.channel))
+                else:
+                    b.flaps = 0
+                b.last_channel = b.channel
+                b.channel = net.channel
+            x = net.dbm
+            if b.n >= MIN_SAMPLES and ts - b.last_seen <= JUMP_WINDOW and abs(
+                    x - b.level) >= self.jump_db:
+                alerts.append(Alert(SIGNAL_JUMP, Severity.WARNING, mac, b.ssid, ts,
+                                    delta=round(x - b.level), dbm=x))
+                # Follow the new level rather than alerting on every scan
+                b.level = float(x)
+                b.n = 1
+            else:
+                b.level += JUMP_ALPHA * (x - b.level)
+                b.n += 1
+            b.last_seen = ts
+        if self.scans % PRUNE_EVERY == 0:
+            self.prune(ts - self.max_age)
+        if alerts:
+            for alert in alerts:
+                self.active[alert.mac] = alert
+            with self._lock:
+                self._pending.extend(alerts)
+        return alerts
+
+    def _maker(self, mac):
+        mac &= ~LOCAL_BIT
+        name = self.vendor_of(mac) if self.vendor_of is not None else None
+        return name or mac >> 24
+
+    def _add(self, net, ts, alerts):
+        b = _Bss()
+        mac = b.mac = net.mac
+        b.ssid = net.ssid
+        b.security = net.security
+        b.kind = security_class(net.security)
+        b.ap = ap_key(mac)
+        b.maker = self._maker(mac)
+        b.channel = net.channel
+        b.last_channel = None
+        b.flaps = 0
+        b.level = float(net.dbm)
+        b.n = 1
+        b.last_seen = ts
+        self._bss[mac] = b
+        self._aps.setdefault(b.ap, set()).add(mac)
+        self._join(b, ts, alerts, new=True)
+
+    def _maker_label(self, b):
+        if isinstance(b.maker, str):
+            return b.maker
+        if b.mac & LOCAL_BIT:
+            return _("a private address")
+        return f"OUI {b.maker:06X}"
+
+    def _join(self, b, ts, alerts, new=False):
+        b.trusted = False
+        if b.ssid in self._hidden:
+            return
+        ess = self._ess.get(b.ssid)
+        if ess is None:
+            ess = self._ess[b.ssid] = Ess(b.ssid, self.scans)
+        # A kind of security or a vendor is normal for an SSID if trusted
+        # BSSIDs of it have it, or most of its BSSIDs do; flagged BSSIDs
+        # do not vouch for the next ones
+        n = len(ess.macs) + 1
+        trusted = True
+        kinds = ess.trusted_kinds
+        if kinds and b.kind not in kinds and 2 * (ess.kinds.get(b.kind, 0) + 1) <= n:
+            weaker = _RANK[b.kind] < min(_RANK[k] for k in kinds)
+            alerts.append(Alert(SECURITY_MISMATCH,
+                                Severity.CRITICAL if weaker else Severity.WARNING,
+                                b.mac, b.ssid, ts, security=b.kind,
+                                others=", ".join(sorted(kinds))))
+            trusted = False
+        if (new and self.scans - ess.first_scan >= self.warmup and b.ap not in ess.aps
+                and b.maker not in ess.trusted_makers
+                and 2 * (ess.makers.get(b.maker, 0) + 1) <= n):
+            alerts.append(Alert(NEW_BSSID, Severity.WARNING, b.mac, b.ssid, ts,
+                                maker=self._maker_label(b)))
+            trusted = False
+        ess.macs.add(b.mac)
+        _count(ess.aps, b.ap, 1)
+        _count(ess.makers, b.maker, 1)
+        _count(ess.kinds, b.kind, 1)
+        if trusted:
+            _count(ess.trusted_makers, b.maker, 1)
+            _count(ess.trusted_kinds, b.kind, 1)
+        b.trusted = trusted
+
+    def _leave(self, b):
+        ess = self._ess.get(b.ssid)
+        if ess is None or b.mac not in ess.macs:
+            return
+        ess.macs.discard(b.mac)
+        _count(ess.aps, b.ap, -1)
+        _count(ess.makers, b.maker, -1)
+        _count(ess.kinds, b.kind, -1)
+        if b.trusted:
+            _count(ess.trusted_makers, b.maker, -1)
+            _count(ess.trusted_kinds, b.kind, -1)
+        if not ess.macs:
+            del self._ess[b.ssid]
+
+    def forget(self, mac):
+        """Drop *mac* from every index."""
+        b = self._bss.pop(mac, None)
+        if b is None:
+            return
+        self._leave(b)
+        macs = self._aps[b.ap]
+        macs.discard(mac)
+        if not macs:
+            del self._aps[b.ap]
+        self.active.pop(mac, None)
+
+    def prune(self, older_than):
+        """Forget BSSIDs not seen since timestamp *older_than*."""
+        stale = [mac for mac, b in self._bss.items() if b.last_seen < older_than]
+        for mac in stale:
+            self.forget(mac)
+        return len(stale)
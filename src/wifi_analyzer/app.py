@@ -1,88 +1,54 @@
 """WiFi Analyzer — WiFi Network Analysis Tool."""
+import gettext
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
 import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw, GLib, Gio, Gdk, Pango
-import subprocess, threading, re, gettext, math, cairo
-from datetime import datetime
+from gi.repository import Gtk, Adw, GLib, GObject, Gio
+
+# Only what the first frame needs is imported here; the scan service and
+# backends (asyncio), the analyzer and the history chart load on first use
+from wifi_analyzer.chart import ChannelChartRenderer
+from wifi_analyzer.history import ScanHistory
+from wifi_analyzer import instrument
+from wifi_analyzer.instrument import span
+from wifi_analyzer.oui import vendor
+from wifi_analyzer.records import BAND_24, BAND_5, BAND_6, Band
+from wifi_analyzer.scandiff import ADDED, REMOVED
+from wifi_analyzer.search import NetworkIndex, parse_query
+from wifi_analyzer.trends import TrendTracker
 
 APP_ID = "io.github.yeager.WifiAnalyzer"
 _ = gettext.gettext
 
-# 2.4 GHz channel center frequencies
-CHANNEL_FREQ_24 = {1: 2412, 2: 2417, 3: 2422, 4: 2427, 5: 2432, 6: 2437,
-                   7: 2442, 8: 2447, 9: 2452, 10: 2457, 11: 2462, 12: 2467, 13: 2472}
-# 5 GHz common channels
-CHANNEL_FREQ_5 = {36: 5180, 40: 5200, 44: 5220, 48: 5240, 52: 5260, 56: 5280,
-                  60: 5300, 64: 5320, 100: 5500, 104: 5520, 108: 5540, 112: 5560,
-                  116: 5580, 120: 5600, 124: 5620, 128: 5640, 132: 5660, 136: 5680,
-                  140: 5700, 144: 5720, 149: 5745, 153: 5765, 157: 5785, 161: 5805, 165: 5825}
-
-def freq_to_channel(freq):
-    for ch, f in {**CHANNEL_FREQ_24, **CHANNEL_FREQ_5}.items():
-        if f == freq:
-            return ch
-    if 2412 <= freq <= 2484:
-        return (freq - 2407) // 5
-    if freq >= 5000:
-        return (freq - 5000) // 5
-    return 0
-
-def parse_nmcli():
-    """Parse nmcli dev wifi list output."""
-    networks = []
-    try:
-        result = subprocess.run(
-            ["nmcli", "-t", "-f", "SSID,BSSID,FREQ,SIGNAL,SECURITY,CHAN,BARS,MODE", "dev", "wifi", "list", "--rescan", "yes"],
-            capture_output=True, text=True, timeout=15
-        )
-        for line in result.stdout.strip().split("\n"):
-            if not line.strip():
-                continue
-            # nmcli -t uses : as separator but BSSID contains colons
-            # Format: SSID:BSSID:FREQ:SIGNAL:SECURITY:CHAN:BARS:MODE
-            # BSSID is like AA\:BB\:CC\:DD\:EE\:FF (escaped)
-            parts = line.replace("\\:", "§").split(":")
-            parts = [p.replace("§", ":") for p in parts]
-            if len(parts) >= 6:
-                ssid = parts[0] or _("<Hidden>")
-                bssid = parts[1]
-                try:
-                    freq = int(parts[2].strip().split()[0])
-                except (ValueError, IndexError):
-                    freq = 0
-                try:
-                    signal_pct = int(parts[3])
-                except ValueError:
-                    signal_pct = 0
-                security = parts[4] if len(parts) > 4 else ""
-                try:
-                    channel = int(parts[5])
-                except (ValueError, IndexError):
-                    channel = freq_to_channel(freq)
-                # Convert signal % to approximate dBm
-                dbm = int(signal_pct / 2 - 100) if signal_pct else -100
-                networks.append({
-                    "ssid": ssid, "bssid": bssid, "freq": freq, "channel": channel,
-                    "signal_pct": signal_pct, "dbm": dbm, "security": security,
-                    "band": "5 GHz" if freq >= 5000 else "2.4 GHz"
-                })
-    except Exception as e:
-        networks.append({"ssid": f"Error: {e}", "bssid": "", "freq": 0, "channel": 0,
-                         "signal_pct": 0, "dbm": -100, "security": "", "band": ""})
-    return networks
+# Set by the startup harness (benchmarks/bench_startup.py --gui): report the
+# CLOCK_MONOTONIC time of the first painted frame on stderr, then quit.
+STARTUP_PROBE_ENV = "WIFI_ANALYZER_STARTUP_PROBE"
 
 
+def _cache_dir():
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    d = os.path.join(xdg, "wifi-analyzer")
+    os.makedirs(d, exist_ok=True)
+    return d
+
+
+def _history_path():
+    return os.path.join(_cache_dir(), "history.bin")
+
 
 def _wlc_settings_path():
-    import os
     xdg = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
     d = os.path.join(xdg, "wifi-analyzer")
     os.makedirs(d, exist_ok=True)
     return os.path.join(d, "welcome.json")
 
 def _load_wlc_settings():
-    import os, json
     p = _wlc_settings_path()
     if os.path.exists(p):
         with open(p) as f:
@@ -90,172 +56,367 @@ def _load_wlc_settings():
     return {"welcome_shown": False}
 
 def _save_wlc_settings(s):
-    import json
     with open(_wlc_settings_path(), "w") as f:
         json.dump(s, f, indent=2)
 
+
+def _on_main_loop(callback):
+    """Wrap a scan subscriber so *callback* runs on the GTK main loop.
+
+    ScanService calls scan subscribers on its own thread; state the GUI
+    also reads must only change on the main loop.
+    """
+    def run(ts, networks):
+        callback(ts, networks)
+        return GLib.SOURCE_REMOVE
+
+    def dispatch(ts, networks):
+        GLib.idle_add(run, ts, list(networks))
+    return dispatch
+
 class ChannelDrawingArea(Gtk.DrawingArea):
     """Custom drawing area for channel overlap visualization."""
     def __init__(self):
         super().__init__()
-        self.networks = []
-        self.band_filter = "2.4 GHz"
+        self.renderer = ChannelChartRenderer()
         self.set_draw_func(self._draw)
         self.set_content_height(220)
 
-    def set_networks(self, networks, band="2.4 GHz"):
-        self.networks = networks
-        self.band_filter = band
+    @property
+    def networks(self):
+        return self.renderer.networks
+
+    @property
+    def band_filter(self):
+        return self.renderer.band_filter
+
+    def set_networks(self, networks, band=BAND_24):
+        self.renderer.set_networks(networks, band)
         self.queue_draw()
 
     def _draw(self, area, cr, width, height):
-        # Background
-        cr.set_source_rgb(0.15, 0.15, 0.18)
-        cr.rectangle(0, 0, width, height)
-        cr.fill()
-
-        filtered = [n for n in self.networks if n["band"] == self.band_filter and n["channel"] > 0]
-        if not filtered:
-            cr.set_source_rgb(0.6, 0.6, 0.6)
-            cr.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
-            cr.set_font_size(14)
-            cr.move_to(width / 2 - 60, height / 2)
-            cr.show_text(_("No networks found"))
-            return
+        with span("draw"):
+            self.renderer.render(cr, width, height)
 
-        margin_left, margin_right, margin_top, margin_bottom = 50, 20, 20, 40
-        plot_w = width - margin_left - margin_right
-        plot_h = height - margin_top - margin_bottom
 
-        if self.band_filter == "2.4 GHz":
-            ch_min, ch_max = 0, 14
-        else:
-            channels = sorted(set(n["channel"] for n in filtered))
-            ch_min = min(channels) - 4 if channels else 30
-            ch_max = max(channels) + 4 if channels else 170
-
-        dbm_min, dbm_max = -100, -20
-
-        def ch_to_x(ch):
-            return margin_left + (ch - ch_min) / max(ch_max - ch_min, 1) * plot_w
-
-        def dbm_to_y(dbm):
-            return margin_top + plot_h - (dbm - dbm_min) / (dbm_max - dbm_min) * plot_h
-
-        # Grid
-        cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
-        cr.set_line_width(0.5)
-        for dbm in range(-100, -10, 10):
-            y = dbm_to_y(dbm)
-            cr.move_to(margin_left, y); cr.line_to(width - margin_right, y)
-            cr.stroke()
-            cr.set_source_rgb(0.6, 0.6, 0.6)
-            cr.set_font_size(10)
-            cr.move_to(5, y + 4)
-            cr.show_text(f"{dbm}")
-            cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
-
-        if self.band_filter == "2.4 GHz":
-            ch_range = range(1, 14)
-        else:
-            ch_range = sorted(set(n["channel"] for n in filtered))
-        for ch in ch_range:
-            x = ch_to_x(ch)
-            cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
-            cr.move_to(x, margin_top); cr.line_to(x, height - margin_bottom)
-            cr.stroke()
-            cr.set_source_rgb(0.6, 0.6, 0.6)
-            cr.set_font_size(10)
-            cr.move_to(x - 5, height - margin_bottom + 15)
-            cr.show_text(str(ch))
-
-        # Draw networks as bell curves
-        colors = [
-            (0.2, 0.6, 1.0), (1.0, 0.4, 0.3), (0.3, 0.9, 0.4), (1.0, 0.8, 0.2),
-            (0.8, 0.3, 0.9), (0.2, 0.9, 0.9), (1.0, 0.5, 0.0), (0.6, 0.6, 1.0),
-        ]
-        bw = 2.5 if self.band_filter == "2.4 GHz" else 2.0  # channel bandwidth
-
-        for i, net in enumerate(filtered):
-            color = colors[i % len(colors)]
-            cr.set_source_rgba(*color, 0.3)
-            cr.set_line_width(2)
-
-            center = net["channel"]
-            peak_y = dbm_to_y(net["dbm"])
-            base_y = dbm_to_y(-100)
-
-            steps = 60
-            points = []
-            for s in range(steps + 1):
-                ch = center - bw * 2 + (bw * 4) * s / steps
-                x = ch_to_x(ch)
-                dist = (ch - center) / bw
-                amp = math.exp(-dist * dist * 2)
-                y = base_y + (peak_y - base_y) * amp
-                points.append((x, y))
-
-            # Fill
-            cr.move_to(points[0][0], base_y)
-            for x, y in points:
-                cr.line_to(x, y)
-            cr.line_to(points[-1][0], base_y)
-            cr.close_path()
-            cr.fill()
-
-            # Outline
-            cr.set_source_rgba(*color, 0.9)
-            cr.move_to(*points[0])
-            for x, y in points:
-                cr.line_to(x, y)
-            cr.stroke()
-
-            # Label
-            cr.set_source_rgb(*color)
-            cr.set_font_size(9)
-            label = net["ssid"][:18]
-            tx = ch_to_x(center)
-            cr.move_to(tx - len(label) * 2.5, peak_y - 6)
-            cr.show_text(label)
-
-
-class NetworkRow(Gtk.ListBoxRow):
-    def __init__(self, net):
+class HistoryDrawingArea(Gtk.DrawingArea):
+    """Signal over time of a few BSSIDs, from the history file plus live scans.
+
+    Scroll zooms around the pointer, dragging pans and a double click
+    goes back to following the newest samples.
+    """
+
+    SERIES = 8  # BSSIDs plotted at once
+    CACHED = 4 * SERIES  # pyramids kept, so BSSIDs that drop in and out do not reload
+
+    def __init__(self, history):
+        super().__init__()
+        self.history = history
+        # Nothing is plotted before the first scan, so the renderer (and
+        # cairo) load on first use
+        self._renderer = None
+        self.pyramids = {}  # mac -> MinMaxPyramid, least recently plotted first
+        self._pointer_x = None
+        self._drag_end = None
+        self.set_draw_func(self._draw)
+        self.set_content_height(220)
+        scroll = Gtk.EventControllerScroll.new(Gtk.EventControllerScrollFlags.VERTICAL)
+        scroll.connect("scroll", self._on_scroll)
+        self.add_controller(scroll)
+        motion = Gtk.EventControllerMotion()
+        motion.connect("motion", lambda c, x, y: setattr(self, "_pointer_x", x))
+        motion.connect("leave", lambda c: setattr(self, "_pointer_x", None))
+        self.add_controller(motion)
+        drag = Gtk.GestureDrag()
+        drag.connect("drag-begin", self._on_drag_begin)
+        drag.connect("drag-update", self._on_drag_update)
+        self.add_controller(drag)
+        click = Gtk.GestureClick()
+        click.connect("pressed", self._on_pressed)
+        self.add_controller(click)
+
+    @property
+    def renderer(self):
+        if self._renderer is None:
+            from wifi_analyzer.history_chart import SignalHistoryRenderer
+            self._renderer = SignalHistoryRenderer()
+        return self._renderer
+
+    def set_networks(self, networks):
+        """Plot the strongest of *networks*, loading their history on first use."""
+        from wifi_analyzer.pyramid import MinMaxPyramid
+        items = []
+        for net in sorted(networks, key=lambda n: n.dbm, reverse=True)[:self.SERIES]:
+            pyramid = self.pyramids.pop(net.mac, None)
+            if pyramid is None:
+                pyramid = MinMaxPyramid()
+                with span("history-load") as s:
+                    for ts, dbm in self.history.query(net.mac):
+                        pyramid.extend(ts, dbm)
+                    s.n = len(pyramid)
+            self.pyramids[net.mac] = pyramid
+            items.append((net.mac, pyramid, net.ssid or net.bssid))
+        # The plotted ones were just moved to the end
+        for mac in list(self.pyramids)[:len(self.pyramids) - self.CACHED]:
+            del self.pyramids[mac]
+        self.renderer.set_series(items)
+        self.queue_draw()
+
+    def append_scan(self, ts, networks):
+        """Add one scan's samples to the BSSIDs with a loaded history."""
+        for net in networks:
+            pyramid = self.pyramids.get(net.mac)
+            # Loading may already have picked this scan up from the file
+            if pyramid is not None and (not len(pyramid) or ts > pyramid.ts[-1]):
+                pyramid.append(ts, net.dbm)
+        self.queue_draw()
+
+    def _on_scroll(self, controller, dx, dy):
+        anchor = 1.0 if self._pointer_x is None else self.renderer.plot_fraction(
+            self._pointer_x, self.get_width())
+        self.renderer.zoom(1.25 ** dy, anchor)
+        self.queue_draw()
+        return True
+
+    def _on_drag_begin(self, gesture, x, y):
+        self._drag_end = self.renderer.view()[1]
+
+    def _on_drag_update(self, gesture, dx, dy):
+        r = self.renderer
+        r.end = self._drag_end
+        r.pan(-dx * r.seconds_per_px(self.get_width()))
+        self.queue_draw()
+
+    def _on_pressed(self, gesture, n_press, x, y):
+        if n_press == 2:
+            self.renderer.follow()
+            self.queue_draw()
+
+    def _draw(self, area, cr, width, height):
+        with span("draw-history") as s:
+            s.n = self.renderer.render(cr, width, height)
+
+
+class NetworkItem(GObject.Object):
+    """List model item wrapping the current Network record for one BSSID."""
+    __gtype_name__ = "WifiAnalyzerNetworkItem"
+    __gsignals__ = {"changed": (GObject.SignalFlags.RUN_FIRST, None, ())}
+
+    def __init__(self, net, stats=None):
         super().__init__()
         self.net = net
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
-        box.set_margin_start(12); box.set_margin_end(12)
-        box.set_margin_top(6); box.set_margin_bottom(6)
+        self.stats = stats  # SignalStats of this BSSID, if tracked
 
-        # Signal strength icon
-        if net["signal_pct"] > 75:
-            icon = "network-wireless-signal-excellent-symbolic"
-        elif net["signal_pct"] > 50:
-            icon = "network-wireless-signal-good-symbolic"
-        elif net["signal_pct"] > 25:
-            icon = "network-wireless-signal-ok-symbolic"
+    def update(self, net):
+        self.net = net
+        self.emit("changed")
+
+
+class NetworkListModel:
+    """Keyed list of NetworkItems with band filtering and signal sorting.
+
+    Scan events are reconciled into the store: changed BSSIDs are updated
+    in place, new ones are appended in one splice and vanished ones are
+    removed, so unchanged rows keep their item and widgets. With a
+    TrendTracker, rows sort by its hysteresis key instead of the raw
+    signal, so they only move when a signal really changed.
+
+    A search query is answered from a NetworkIndex kept in step with the
+    store; the filter then only checks set membership, and tells GTK
+    whether the result got stricter or looser so it re-checks only the
+    rows that can change.
+    """
+
+    def __init__(self, trends=None, vendor_of=None):
+        self.band = BAND_24
+        self.trends = trends
+        self.index = NetworkIndex(vendor_of)
+        self.terms = ()
+        self.matches = None  # macs matching the search, None for no search
+        self.store = Gio.ListStore(item_type=NetworkItem)
+        self.filter = Gtk.CustomFilter.new(self._filter)
+        self.sorter = Gtk.CustomSorter.new(self._compare)
+        filtered = Gtk.FilterListModel(model=self.store, filter=self.filter)
+        self.model = Gtk.SortListModel(model=filtered, sorter=self.sorter)
+        self._items = {}
+
+    @staticmethod
+    def _compare(a, b, *args):
+        # Strongest first, BSSID as tie-break so equal keys keep their order
+        ka = a.stats.key if a.stats is not None else a.net.dbm
+        kb = b.stats.key if b.stats is not None else b.net.dbm
+        if ka != kb:
+            return -1 if ka > kb else 1
+        return (a.net.mac > b.net.mac) - (a.net.mac < b.net.mac)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _filter(self, item):
+        net = item.net
+        return net.band == self.band and (self.matches is None or net.mac in self.matches)
+
+    def set_query(self, text):
+        terms = parse_query(text)
+        if terms == self.terms:
+            return
+        with span("search", len(self.index)):
+            matches = self.index.search(terms)
+        old, self.terms, self.matches = self.matches, terms, matches
+        if matches == old:
+            return
+        if matches is None or old is not None and old <= matches:
+            change = Gtk.FilterChange.LESS_STRICT
+        elif old is None or matches <= old:
+            change = Gtk.FilterChange.MORE_STRICT
         else:
-            icon = "network-wireless-signal-weak-symbolic"
-        img = Gtk.Image.new_from_icon_name(icon)
-        box.append(img)
+            change = Gtk.FilterChange.DIFFERENT
+        self.filter.changed(change)
+
+    def set_band(self, band):
+        band = Band.parse(band)
+        if band != self.band:
+            self.band = band
+            self.filter.changed(Gtk.FilterChange.DIFFERENT)
+
+    def apply(self, events):
+        """Reconcile a list of ScanEvents into the store."""
+        added = []
+        removed = set()
+        changed = False
+        refilter = False
+        index, matches = self.index, self.matches
+        for ev in events:
+            if ev.kind == REMOVED:
+                index.remove(ev.mac)
+                if matches is not None:
+                    matches.discard(ev.mac)
+            else:
+                index.add(ev.network)
+                if matches is not None:
+                    # Keep the search result current without searching again
+                    hit = index.match(self.terms, ev.network)
+                    if hit != (ev.mac in matches):
+                        if hit:
+                            matches.add(ev.mac)
+                        else:
+                            matches.discard(ev.mac)
+                        if ev.kind != ADDED:
+                            refilter = True
+            if ev.kind == ADDED:
+                item = NetworkItem(ev.network,
+                                   self.trends.get(ev.mac) if self.trends is not None else None)
+                self._items[ev.mac] = item
+                added.append(item)
+            elif ev.kind == REMOVED:
+                item = self._items.pop(ev.mac, None)
+                if item is not None:
+                    removed.add(item)
+            else:
+                item = self._items.get(ev.mac)
+                if item is not None:
+                    refilter = refilter or item.net.band != ev.network.band
+                    item.update(ev.network)
+                    changed = True
+        if refilter:
+            self.filter.changed(Gtk.FilterChange.DIFFERENT)
+        if removed:
+            positions = [i for i in range(self.store.get_n_items())
+                         if self.store.get_item(i) in removed]
+            for pos in reversed(positions):
+                self.store.remove(pos)
+        if added:
+            self.store.splice(self.store.get_n_items(), 0, added)
+        if self.trends is not None:
+            # Smoothed key or trend arrow moved without a scan event
+            for mac in self.trends.take_dirty():
+                item = self._items.get(mac)
+                if item is not None:
+                    if item.stats is None:
+                        item.stats = self.trends.get(mac)
+                    item.emit("changed")
+                    changed = True
+        if changed:
+            self.sorter.changed(Gtk.SorterChange.DIFFERENT)
+
+    def refresh(self, macs):
+        """Redraw the rows of *macs* (e.g. after they were flagged)."""
+        for mac in macs:
+            item = self._items.get(mac)
+            if item is not None:
+                item.emit("changed")
+
+
+class NetworkRow(Gtk.Box):
+    """Row widget for the network list; built once and rebound to items.
+
+    *alerts* maps BSSIDs to their latest analysis Alert; flagged rows get
+    a warning mark and the alert as tooltip.
+    """
+    def __init__(self, alerts=None):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        self.alerts = alerts if alerts is not None else {}
+        self.item = None
+        self._handler = None
+        self.set_margin_start(12); self.set_margin_end(12)
+        self.set_margin_top(6); self.set_margin_bottom(6)
+
+        # Signal strength icon
+        self.img = Gtk.Image()
+        self.append(self.img)
 
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
         vbox.set_hexpand(True)
-        ssid_label = Gtk.Label(label=net["ssid"], xalign=0)
-        ssid_label.add_css_class("heading")
-        vbox.append(ssid_label)
-        detail = f"Ch {net['channel']} · {net['band']} · {net['dbm']} dBm · {net['security'] or 'Open'}"
-        sub = Gtk.Label(label=detail, xalign=0)
-        sub.add_css_class("dim-label")
-        vbox.append(sub)
-        box.append(vbox)
+        self.ssid_label = Gtk.Label(xalign=0)
+        self.ssid_label.add_css_class("heading")
+        vbox.append(self.ssid_label)
+        self.sub = Gtk.Label(xalign=0)
+        self.sub.add_css_class("dim-label")
+        vbox.append(self.sub)
+        self.append(vbox)
 
         # Signal bar
-        pct_label = Gtk.Label(label=f"{net['signal_pct']}%")
-        pct_label.add_css_class("numeric")
-        box.append(pct_label)
-
-        self.set_child(box)
+        self.pct_label = Gtk.Label()
+        self.pct_label.add_css_class("numeric")
+        self.append(self.pct_label)
+
+    def bind(self, item):
+        self.item = item
+        self._handler = item.connect("changed", lambda it: self._refresh())
+        self._refresh()
+
+    def unbind(self):
+        if self.item is not None:
+            self.item.disconnect(self._handler)
+        self.item = None
+        self._handler = None
+
+    def _refresh(self):
+        net = self.item.net
+        if net.signal_pct > 75:
+            icon = "network-wireless-signal-excellent-symbolic"
+        elif net.signal_pct > 50:
+            icon = "network-wireless-signal-good-symbolic"
+        elif net.signal_pct > 25:
+            icon = "network-wireless-signal-ok-symbolic"
+        else:
+            icon = "network-wireless-signal-weak-symbolic"
+        self.img.set_from_icon_name(icon)
+        alert = self.alerts.get(net.mac)
+        self.ssid_label.set_label(f"⚠ {net.ssid}" if alert is not None else net.ssid)
+        self.set_tooltip_text(alert.message if alert is not None else None)
+        stats = self.item.stats
+        if stats is not None:
+            # Hysteresis-latched average, so the text does not flicker
+            level = f"{stats.key:.0f} dBm avg ±{stats.stddev:.0f}"
+            arrow = f" {stats.arrow}" if stats.arrow else ""
+        else:
+            level = f"{net.dbm} dBm"
+            arrow = ""
+        maker = vendor(net.mac)
+        maker = f" · {maker}" if maker else ""
+        self.sub.set_label(f"Ch {net.channel} · {net.band} · {level} · {net.security or 'Open'}{maker}")
+        self.pct_label.set_label(f"{net.signal_pct}%{arrow}")
 
 
 class WifiAnalyzerWindow(Adw.ApplicationWindow):
@@ -271,6 +432,10 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
         header.pack_end(theme_btn)
         # Menu
         menu = Gio.Menu()
+        menu.append(_("Site Survey"), "win.survey")
+        menu.append(_("Link Signal"), "win.link")
+        menu.append(_("Performance Stats"), "win.stats-overlay")
+        menu.append(_("Save Performance Trace"), "win.dump-trace")
         menu.append(_("About"), "win.about")
         menu_btn = Gtk.MenuButton(icon_name="open-menu-symbolic", menu_model=menu)
         header.pack_end(menu_btn)
@@ -282,6 +447,19 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
         about_action = Gio.SimpleAction.new("about", None)
         about_action.connect("activate", self._show_about)
         self.add_action(about_action)
+        stats_action = Gio.SimpleAction.new_stateful("stats-overlay", None,
+                                                     GLib.Variant.new_boolean(False))
+        stats_action.connect("change-state", self._on_stats_overlay)
+        self.add_action(stats_action)
+        trace_action = Gio.SimpleAction.new("dump-trace", None)
+        trace_action.connect("activate", self._dump_trace)
+        self.add_action(trace_action)
+        survey_action = Gio.SimpleAction.new("survey", None)
+        survey_action.connect("activate", self._show_survey)
+        self.add_action(survey_action)
+        link_action = Gio.SimpleAction.new("link", None)
+        link_action.connect("activate", self._show_link)
+        self.add_action(link_action)
 
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         main_box.append(header)
@@ -289,28 +467,53 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
         # Band selector
         band_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
         band_box.set_margin_start(12); band_box.set_margin_end(12); band_box.set_margin_top(8)
-        self.band_24_btn = Gtk.ToggleButton(label="2.4 GHz", active=True)
-        self.band_5_btn = Gtk.ToggleButton(label="5 GHz", group=self.band_24_btn)
+        self.band_24_btn = Gtk.ToggleButton(label=BAND_24.label, active=True)
+        self.band_5_btn = Gtk.ToggleButton(label=BAND_5.label, group=self.band_24_btn)
+        self.band_6_btn = Gtk.ToggleButton(label=BAND_6.label, group=self.band_24_btn)
         self.band_24_btn.connect("toggled", self._on_band_toggle)
         self.band_5_btn.connect("toggled", self._on_band_toggle)
+        self.band_6_btn.connect("toggled", self._on_band_toggle)
         band_box.append(self.band_24_btn)
         band_box.append(self.band_5_btn)
+        band_box.append(self.band_6_btn)
+        self.search_entry = Gtk.SearchEntry(
+            placeholder_text=_("Filter: SSID, BSSID, vendor, ch:6, sec:wpa3, >-70"), width_chars=32)
+        self.search_entry.connect("search-changed", self._on_search_changed)
+        # Typing anywhere in the window goes to the filter
+        self.search_entry.set_key_capture_widget(self)
+        band_box.append(self.search_entry)
+        self.best_channel_label = Gtk.Label(xalign=1, hexpand=True)
+        self.best_channel_label.add_css_class("dim-label")
+        band_box.append(self.best_channel_label)
         main_box.append(band_box)
 
-        # Channel overlap visualization
+        # Channel overlap visualization and signal history
         frame = Gtk.Frame()
         frame.set_margin_start(12); frame.set_margin_end(12); frame.set_margin_top(8)
+        self.history = ScanHistory(_history_path())
         self.channel_chart = ChannelDrawingArea()
-        frame.set_child(self.channel_chart)
+        self.history_chart = HistoryDrawingArea(self.history)
+        self.chart_stack = Gtk.Stack()
+        self.chart_stack.add_titled(self.channel_chart, "channels", _("Channels"))
+        self.chart_stack.add_titled(self.history_chart, "history", _("History"))
+        frame.set_child(self.chart_stack)
+        band_box.append(Gtk.StackSwitcher(stack=self.chart_stack))
         main_box.append(frame)
 
         # Network list
         sw = Gtk.ScrolledWindow(vexpand=True)
         sw.set_margin_start(12); sw.set_margin_end(12); sw.set_margin_top(8); sw.set_margin_bottom(4)
-        self.listbox = Gtk.ListBox()
-        self.listbox.set_selection_mode(Gtk.SelectionMode.NONE)
-        self.listbox.add_css_class("boxed-list")
-        sw.set_child(self.listbox)
+        self.trends = TrendTracker()
+        self.analyzer = None  # created with the service; rows exist only after a scan
+        self.network_list = NetworkListModel(self.trends, vendor_of=vendor)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", lambda f, li: li.set_child(NetworkRow(self.analyzer.active)))
+        factory.connect("bind", lambda f, li: li.get_child().bind(li.get_item()))
+        factory.connect("unbind", lambda f, li: li.get_child().unbind())
+        self.listview = Gtk.ListView(model=Gtk.NoSelection(model=self.network_list.model),
+                                     factory=factory)
+        self.listview.add_css_class("rich-list")
+        sw.set_child(self.listview)
         main_box.append(sw)
 
         # Status bar
@@ -320,8 +523,51 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
         self.statusbar.add_css_class("dim-label")
         main_box.append(self.statusbar)
 
-        self.set_content(main_box)
-        self._scan()
+        # Performance stats, drawn over the content when toggled on
+        self.stats_label = Gtk.Label(xalign=0, visible=False, can_target=False)
+        self.stats_label.set_halign(Gtk.Align.END); self.stats_label.set_valign(Gtk.Align.END)
+        self.stats_label.set_margin_end(16); self.stats_label.set_margin_bottom(32)
+        self.stats_label.add_css_class("osd")
+        self.stats_label.add_css_class("monospace")
+        self._stats_source = None
+        self._trace_requested = False
+        overlay = Gtk.Overlay(child=main_box)
+        overlay.add_overlay(self.stats_label)
+        self.set_content(overlay)
+
+        self.service = None
+        self.connect("close-request", self._on_close_request)
+        # Start scanning once the window is up so the first frame is not
+        # competing with the nmcli fork (or with importing asyncio)
+        self.connect("map", lambda w: GLib.idle_add(self._start_scanning))
+
+    def _start_scanning(self):
+        if self.service is None:
+            self._create_service()
+        self._set_status(_("Scanning..."))
+        self.service.start()
+        return GLib.SOURCE_REMOVE
+
+    def _create_service(self):
+        from wifi_analyzer.analysis import ScanAnalyzer
+        from wifi_analyzer.service import SCAN_INTERVAL, ScanService
+        app = self.get_application()
+        backend = app.backend
+        if backend is None:
+            # A fixed interval rescans every time; otherwise mostly cached reads
+            from wifi_analyzer.backends import make_adaptive_scanner, make_scanner
+            backend = make_scanner() if app.interval is not None else make_adaptive_scanner()
+        interval = app.interval if app.interval is not None else getattr(
+            backend, "interval", SCAN_INTERVAL)
+        self.analyzer = ScanAnalyzer(vendor_of=vendor)
+        # Scan results reach GTK state only through idle_add, so nothing the
+        # GUI reads changes on the scan thread
+        self.service = ScanService(backend, interval, dispatch=GLib.idle_add)
+        self.service.subscribe(self._on_scan_events)
+        self.service.subscribe_scans(_on_main_loop(self.history.append_scan))
+        self.service.subscribe_scans(_on_main_loop(self.history_chart.append_scan))
+        self.service.subscribe_scans(_on_main_loop(self.trends.update_scan))
+        self.service.subscribe_scans(_on_main_loop(self.analyzer.update))
 
     def _set_status(self, msg):
         ts = datetime.now().strftime("%H:%M:%S")
@@ -333,36 +579,115 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
         mgr.set_color_scheme(Adw.ColorScheme.FORCE_DARK if self.dark_mode else Adw.ColorScheme.FORCE_LIGHT)
 
     def _get_band(self):
-        return "2.4 GHz" if self.band_24_btn.get_active() else "5 GHz"
+        if self.band_24_btn.get_active():
+            return BAND_24
+        return BAND_5 if self.band_5_btn.get_active() else BAND_6
+
+    def _on_search_changed(self, entry):
+        self.network_list.set_query(entry.get_text())
 
     def _on_band_toggle(self, btn):
         self._update_ui()
 
     def _scan(self):
+        if self.service is None:
+            return
         self._set_status(_("Scanning..."))
-        def worker():
-            nets = parse_nmcli()
-            GLib.idle_add(self._on_scan_done, nets)
-        threading.Thread(target=worker, daemon=True).start()
-
-    def _on_scan_done(self, nets):
-        self.networks = sorted(nets, key=lambda n: n["signal_pct"], reverse=True)
-        self._update_ui()
-        self._set_status(f"Found {len(self.networks)} networks")
+        request_rescan = getattr(self.service.backend, "request_rescan", None)
+        if request_rescan is not None:
+            request_rescan()
+        self.service.scan_now()
+
+    def _on_scan_events(self, events):
+        if self.service.last_error is not None:
+            self._set_status(f"Error: {self.service.last_error}")
+            return
+        with span("apply", len(events)):
+            self.network_list.apply(events)
+        alerts = self.analyzer.take_alerts()
+        if alerts:
+            self.network_list.refresh({a.mac for a in alerts})
+        if events:
+            self.networks = list(self.service.snapshot.values())
+            self._update_ui()
+        status = f"Found {len(self.networks)} networks"
+        if alerts:
+            worst = max(alerts, key=lambda a: a.severity)
+            more = _(" (+{n} more)").format(n=len(alerts) - 1) if len(alerts) > 1 else ""
+            status += f" · ⚠ {worst.message}{more}"
+        self._set_status(status)
+
+    def _on_close_request(self, win):
+        if self.service is not None:
+            self.service.stop()
+        self.history.close()
+        return False
 
     def _update_ui(self):
-        band = self._get_band()
-        # Update list
-        child = self.listbox.get_first_child()
-        while child:
-            nxt = child.get_next_sibling()
-            self.listbox.remove(child)
-            child = nxt
-        filtered = [n for n in self.networks if n["band"] == band]
-        for net in filtered:
-            self.listbox.append(NetworkRow(net))
-        # Update chart
-        self.channel_chart.set_networks(self.networks, band)
+        with span("update"):
+            band = self._get_band()
+            self.network_list.set_band(band)
+            self.channel_chart.set_networks(self.networks, band)
+            self.history_chart.set_networks([n for n in self.networks if n.band == band])
+            if self.networks:
+                from wifi_analyzer.interference import rank_channels
+                best, best_dbm = rank_channels(self.networks, band)[0]
+                self.best_channel_label.set_label(_("Least congested: channel {ch}").format(ch=best))
+            else:
+                self.best_channel_label.set_label("")
+
+    def _on_stats_overlay(self, action, value):
+        action.set_state(value)
+        on = value.get_boolean()
+        self.stats_label.set_visible(on)
+        if self._stats_source is not None:
+            GLib.source_remove(self._stats_source)
+            self._stats_source = None
+        if on:
+            instrument.recorder.enabled = True
+            self._refresh_stats()
+            self._stats_source = GLib.timeout_add_seconds(1, self._refresh_stats)
+        else:
+            # Back to near-free spans unless something else wants them
+            instrument.recorder.enabled = instrument.TRACE_DEFAULT or self._trace_requested
+
+    def _refresh_stats(self):
+        rec = instrument.recorder
+        text = instrument.format_summary(rec.stats(), rec.counters)
+        metrics = getattr(getattr(self.service, "backend", None), "metrics", None)
+        if metrics is not None:
+            from wifi_analyzer.scheduler import format_metrics
+            text = "\n".join(filter(None, (text, format_metrics(metrics()))))
+        self.stats_label.set_label(text or _("Waiting for a scan…"))
+        return GLib.SOURCE_CONTINUE
+
+    def _dump_trace(self, *args):
+        rec = instrument.recorder
+        if not rec.enabled:
+            rec.enabled = self._trace_requested = True
+            self._set_status(_("Recording performance trace; save again after a few scans"))
+            return
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        path = rec.dump(os.path.join(_cache_dir(), f"trace_{stamp}.json"))
+        rec.dump(os.path.join(_cache_dir(), f"stats_{stamp}.json"), fmt="json")
+        self._set_status(_("Trace saved to {path}").format(path=path))
+
+    def _show_survey(self, *args):
+        # Imported on demand; only surveys need the heatmap code
+        if self.service is None:
+            return
+        from wifi_analyzer.survey_view import SurveyWindow
+        SurveyWindow(self, self.service).present()
+
+    def _show_link(self, *args):
+        from wifi_analyzer.link import LinkSampler
+        try:
+            sampler = LinkSampler()
+        except OSError:
+            self._set_status(_("No connected Wi-Fi interface to sample"))
+            return
+        from wifi_analyzer.link_view import LinkWindow
+        LinkWindow(self, sampler).present()
 
     def _show_about(self, *args):
         about = Adw.AboutDialog(
@@ -382,35 +707,35 @@ class WifiAnalyzerWindow(Adw.ApplicationWindow):
 
 
 class WifiAnalyzerApp(Adw.Application):
-    def __init__(self):
+    def __init__(self, backend=None, interval=None):
         super().__init__(application_id=APP_ID, flags=Gio.ApplicationFlags.DEFAULT_FLAGS)
+        # Scan source override (replay or simulation); None scans with nmcli
+        self.backend = backend
+        self.interval = interval
         GLib.set_application_name(_("WiFi Analyzer"))
 
     def do_activate(self):
         win = self.get_active_window()
         if not win:
             win = WifiAnalyzerWindow(self)
+            if os.environ.get(STARTUP_PROBE_ENV):
+                self._probe_first_frame(win)
+                win.present()
+                return
         win.present()
         # Welcome dialog
         self._wlc_settings = _load_wlc_settings()
         if not self._wlc_settings.get("welcome_shown"):
             self._show_welcome(self.props.active_window or self)
 
-
     def do_startup(self):
         Adw.Application.do_startup(self)
         quit_action = Gio.SimpleAction.new("quit", None)
         quit_action.connect("activate", lambda *a: self.quit())
         self.add_action(quit_action)
         self.set_accels_for_action("app.quit", ["<Control>q"])
-
-
-def main():
-    app = WifiAnalyzerApp()
-    app.run()
-
-if __name__ == "__main__":
-    main()
+        self.set_accels_for_action("win.stats-overlay", ["<Control><Shift>d"])
+        self.set_accels_for_action("win.dump-trace", ["<Control><Shift>t"])
 
     def _show_welcome(self, win):
         dialog = Adw.Dialog()
@@ -441,3 +766,23 @@ if __name__ == "__main__":
         _save_wlc_settings(self._wlc_settings)
         dialog.close()
 
+    def _probe_first_frame(self, win):
+        def on_after_paint(clock):
+            clock.disconnect(handler)
+            print(f"first-frame {time.monotonic():.6f}", file=sys.stderr, flush=True)
+            self.quit()
+        handler = None
+
+        def on_tick(widget, clock):
+            nonlocal handler
+            handler = clock.connect("after-paint", on_after_paint)
+            return GLib.SOURCE_REMOVE
+        win.add_tick_callback(on_tick)
+
+
+def main(backend=None, interval=None):
+    app = WifiAnalyzerApp(backend, interval)
+    app.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Scan backends: nmcli and ``iw dev <if> scan dump``.
+
+A backend is a :class:`~wifi_analyzer.aioscan.CommandSource`: a command
+line plus a parser turning its output lines into Network records. The
+nmcli backend only gets a 0-100 signal quality; the iw backend (parser
+in iw.py) reports real dBm, channel width and capabilities. Either can
+run an active rescan or read the cached results (*rescan*), and
+:func:`make_adaptive_scanner` mixes the two.
+"""
+import subprocess
+
+from wifi_analyzer.aioscan import AsyncScanner, CommandSource, run_command
+from wifi_analyzer.iw import iter_iw
+from wifi_analyzer.scanner import NMCLI_ARGS, SCAN_TIMEOUT, iter_nmcli
+from wifi_analyzer.scheduler import AdaptiveScheduler
+
+NMCLI_DEVICE_ARGS = ["nmcli", "-t", "-f", "DEVICE,TYPE", "dev"]
+IW_DEV_ARGS = ["iw", "dev"]
+
+
+class NmcliBackend(CommandSource):
+    """``nmcli dev wifi list``, for one interface or (*ifname* None) all of them.
+
+    With *rescan* False NetworkManager returns its cached list instead of
+    sweeping the channels first.
+    """
+
+    def __init__(self, ifname=None, args=None, timeout=SCAN_TIMEOUT, rescan=True):
+        args = list(args or NMCLI_ARGS)
+        if "--rescan" in args:
+            args[args.index("--rescan") + 1] = "yes" if rescan else "no"
+        if ifname:
+            # "ifname X" goes right after "dev wifi list"
+            pos = args.index("list") + 1
+            args[pos:pos] = ["ifname", ifname]
+        super().__init__(args, iter_nmcli, timeout,
+                         name=f"nmcli:{ifname or '*'}{'' if rescan else ':cached'}")
+
+
+class IwBackend(CommandSource):
+    """``iw dev <ifname> scan dump``: the kernel's cached scan results.
+
+    With *rescan* it runs ``iw dev <ifname> scan`` instead, which sweeps
+    first (and needs CAP_NET_ADMIN).
+    """
+
+    def __init__(self, ifname, args=None, timeout=SCAN_TIMEOUT, rescan=False):
+        args = list(args or ["iw", "dev", ifname, "scan"] + ([] if rescan else ["dump"]))
+        super().__init__(args, iter_iw, timeout,
+                         name=f"iw:{ifname}{':rescan' if rescan else ''}")
+
+
+BACKENDS = {"nmcli": NmcliBackend, "iw": IwBackend}
+
+
+def iw_interfaces():
+    """Return the wireless interface names listed by ``iw dev``."""
+    out = subprocess.run(IW_DEV_ARGS, capture_output=True, text=True, check=True,
+                         timeout=SCAN_TIMEOUT).stdout
+    return [line.split()[1] for line in out.splitlines()
+            if line.strip().startswith("Interface ") and len(line.split()) > 1]
+
+
+async def nmcli_interfaces(timeout=SCAN_TIMEOUT):
+    """Return the names of the Wi-Fi devices NetworkManager knows about."""
+    text = await run_command(NMCLI_DEVICE_ARGS, timeout)
+    names = []
+    for line in text.splitlines():
+        device, _sep, kind = line.rpartition(":")
+        if kind == "wifi" and device:
+            names.append(device.replace("\\:", ":"))
+    return names
+
+
+def make_scanner(backend="nmcli", ifnames=None, timeout=SCAN_TIMEOUT, rescan=None):
+    """AsyncScanner using *backend* on each interface in *ifnames*.
+
+    nmcli without interfaces scans them all in one run; iw needs names,
+    so they are looked up with ``iw dev``. *rescan* None keeps each
+    backend's default (nmcli rescans, iw reads its cache).
+    """
+    cls = BACKENDS[backend]
+    kw = {"timeout": timeout}
+    if rescan is not None:
+        kw["rescan"] = rescan
+    if not ifnames:
+        if cls is NmcliBackend:
+            return AsyncScanner([NmcliBackend(**kw)])
+        ifnames = iw_interfaces()
+    return AsyncScanner([cls(ifname, **kw) for ifname in ifnames])
+
+
+def make_adaptive_scanner(backend="nmcli", ifnames=None, timeout=SCAN_TIMEOUT, **options):
+    """AdaptiveScheduler over active and cached scanners of *backend*.
+
+    *options* are passed on to AdaptiveScheduler (intervals, backoff...).
+    """
+    if backend == "iw" and not ifnames:
+        ifnames = iw_interfaces()
+    return AdaptiveScheduler(make_scanner(backend, ifnames, timeout, rescan=True),
+                             make_scanner(backend, ifnames, timeout, rescan=False), **options)
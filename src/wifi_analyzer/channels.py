@@ -0,0 +1,115 @@
+"""Wi-Fi channel plan with precomputed frequency lookup tables.
+
+Covers 2.4 GHz (including channel 14 at 2484 MHz), 5 GHz and 6 GHz
+(Wi-Fi 6E). Frequencies are looked up in dense per-MHz tables built once
+at import, so converting a frequency is a single index operation.
+"""
+from array import array
+
+from wifi_analyzer.records import BAND_24, BAND_5, BAND_6, Band
+
+# 2.4 GHz channel center frequencies
+CHANNEL_FREQ_24 = {ch: 2407 + 5 * ch for ch in range(1, 14)}
+CHANNEL_FREQ_24[14] = 2484
+# 5 GHz common channels
+CHANNEL_FREQ_5 = {ch: 5000 + 5 * ch for ch in (
+    36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 120, 124, 128,
+    132, 136, 140, 144, 149, 153, 157, 161, 165, 169, 173, 177)}
+# 6 GHz 20 MHz channels (1, 5, 9, ... 233) plus the 5935 MHz channel 2
+CHANNEL_FREQ_6 = {ch: 5950 + 5 * ch for ch in range(1, 234, 4)}
+CHANNEL_FREQ_6[2] = 5935
+
+# Center channel of each bonded block, by band and width in MHz
+CENTER_CHANNELS = {
+    (BAND_5, 40): (38, 46, 54, 62, 102, 110, 118, 126, 134, 142, 151, 159, 167, 175),
+    (BAND_5, 80): (42, 58, 106, 122, 138, 155, 171),
+    (BAND_5, 160): (50, 114, 163),
+    (BAND_6, 40): tuple(range(3, 230, 8)),
+    (BAND_6, 80): tuple(range(7, 216, 16)),
+    (BAND_6, 160): tuple(range(15, 208, 32)),
+}
+WIDTHS = (20, 40, 80, 160)
+
+FREQ_MIN = 2400
+FREQ_MAX = 7125
+_BAND_NAMES = (Band.NONE, BAND_24, BAND_5, BAND_6)
+
+
+def _build_tables():
+    size = FREQ_MAX - FREQ_MIN + 1
+    channels = array("h", bytes(2 * size))
+    bands = array("b", bytes(size))
+    for ch, freq in CHANNEL_FREQ_24.items():
+        channels[freq - FREQ_MIN] = ch
+        bands[freq - FREQ_MIN] = 1
+    # Every 5 MHz step in 5 GHz has a channel number, bonded centers included
+    for freq in range(5000, 5926, 5):
+        channels[freq - FREQ_MIN] = (freq - 5000) // 5
+        bands[freq - FREQ_MIN] = 2
+    for freq in range(5935, FREQ_MAX + 1, 5):
+        channels[freq - FREQ_MIN] = (freq - 5950) // 5 if freq != 5935 else 2
+        bands[freq - FREQ_MIN] = 3
+    # Primary channel -> center channel, per (band, width)
+    centers = {}
+    for (band, width), blocks in CENTER_CHANNELS.items():
+        table = array("h", bytes(2 * 240))
+        half = width // 10  # channel numbers covered on each side of center
+        for center in blocks:
+            for ch in range(center - half + 2, center + half - 1, 4):
+                table[ch] = center
+        centers[band, width] = table
+    return channels, bands, centers
+
+
+_CHANNEL_BY_MHZ, _BAND_BY_MHZ, _CENTER_BY_PRIMARY = _build_tables()
+
+
+def freq_to_channel(freq):
+    """Return the channel number for a center frequency in MHz, or 0."""
+    if FREQ_MIN <= freq <= FREQ_MAX:
+        return _CHANNEL_BY_MHZ[freq - FREQ_MIN]
+    return 0
+
+
+def band_for_freq(freq):
+    """Return the Band of a frequency in MHz (Band.NONE if unknown)."""
+    if FREQ_MIN <= freq <= FREQ_MAX:
+        return _BAND_NAMES[_BAND_BY_MHZ[freq - FREQ_MIN]]
+    return Band.NONE
+
+
+def channel_to_freq(band, channel):
+    """Return the center frequency in MHz of *channel* in *band*, or 0."""
+    if band == BAND_24:
+        return CHANNEL_FREQ_24.get(channel, 0)
+    if band == BAND_5:
+        return 5000 + 5 * channel if 0 < channel < 186 else 0
+    if band == BAND_6:
+        return 5935 if channel == 2 else (5950 + 5 * channel if 0 < channel < 234 else 0)
+    return 0
+
+
+def center_channel(band, channel, width):
+    """Return the center channel of the *width* MHz block containing *channel*.
+
+    20 MHz and 2.4 GHz channels are their own center; channels that are
+    not part of any block of that width return 0.
+    """
+    table = _CENTER_BY_PRIMARY.get((band, width))
+    if table is None:
+        return channel
+    return table[channel] if 0 < channel < len(table) else 0
+
+
+def channels_for(freqs):
+    """Convert a whole column of frequencies to an ``array('h')`` of channels."""
+    table = _CHANNEL_BY_MHZ
+    lo, hi = FREQ_MIN, FREQ_MAX
+    return array("h", [table[f - lo] if lo <= f <= hi else 0 for f in freqs])
+
+
+def bands_for(freqs):
+    """Convert a whole column of frequencies to a list of Bands."""
+    table, names = _BAND_BY_MHZ, _BAND_NAMES
+    lo, hi = FREQ_MIN, FREQ_MAX
+    return [names[table[f - lo]] if lo <= f <= hi else Band.NONE for f in freqs]
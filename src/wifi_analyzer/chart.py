@@ -0,0 +1,192 @@
+"""Channel overlap chart renderer (cairo + Pango, no GTK widgets).
+
+Background, grid and axis labels are drawn once into a cached surface
+and reused until the size, band or channel axis changes. Every network
+is drawn from one precomputed unit bell curve that is scaled and moved
+into place, and text is laid out with Pango once per distinct label.
+"""
+import gettext
+import math
+
+import cairo
+import gi
+gi.require_version("Pango", "1.0")
+gi.require_version("PangoCairo", "1.0")
+from gi.repository import Pango, PangoCairo
+
+from wifi_analyzer.records import BAND_24, Band
+
+_ = gettext.gettext
+
+COLORS = [
+    (0.2, 0.6, 1.0), (1.0, 0.4, 0.3), (0.3, 0.9, 0.4), (1.0, 0.8, 0.2),
+    (0.8, 0.3, 0.9), (0.2, 0.9, 0.9), (1.0, 0.5, 0.0), (0.6, 0.6, 1.0),
+]
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 50, 20, 20, 40
+DBM_MIN, DBM_MAX = -100, -20
+LABEL_CACHE_SIZE = 4096
+
+# Gaussian spanning +-2 channel bandwidths: (offset in bandwidths, amplitude)
+_STEPS = 60
+UNIT_CURVE = tuple((u, math.exp(-u * u * 2))
+                   for u in (-2 + 4 * s / _STEPS for s in range(_STEPS + 1)))
+
+
+def _font(px):
+    desc = Pango.FontDescription.from_string("Sans")
+    desc.set_absolute_size(px * Pango.SCALE)
+    return desc
+
+
+class ChannelChartRenderer:
+    """Draws the channel overlap chart for one band onto a cairo context."""
+
+    def __init__(self):
+        self.networks = []
+        self.band_filter = BAND_24
+        self._visible = []
+        self._static = None
+        self._static_key = None
+        self._pango = None
+        self._labels = {}
+        self._curve_fill = None
+        self._curve_line = None
+
+    def set_networks(self, networks, band=BAND_24):
+        self.networks = networks
+        self.band_filter = band = Band.parse(band)
+        self._visible = [n for n in networks if n.band == band and n.channel > 0]
+
+    def _axis(self):
+        if self.band_filter == BAND_24:
+            return 0, 14, tuple(range(1, 14))
+        channels = tuple(sorted(set(n.channel for n in self._visible)))
+        if not channels:
+            return 30, 170, ()
+        return channels[0] - 4, channels[-1] + 4, channels
+
+    def _label(self, cr, text, px):
+        """Return a cached (layout, width, baseline) for *text*."""
+        cached = self._labels.get((text, px))
+        if cached is None:
+            if len(self._labels) >= LABEL_CACHE_SIZE:
+                self._labels.clear()
+            if self._pango is None:
+                self._pango = PangoCairo.create_context(cr)
+            layout = Pango.Layout.new(self._pango)
+            layout.set_font_description(_font(px))
+            layout.set_text(text, -1)
+            width, _height = layout.get_pixel_size()
+            cached = (layout, width, layout.get_baseline() / Pango.SCALE)
+            self._labels[text, px] = cached
+        return cached
+
+    def _show_label(self, cr, text, px, x, baseline_y):
+        layout, _w, baseline = self._label(cr, text, px)
+        cr.move_to(x, baseline_y - baseline)
+        PangoCairo.show_layout(cr, layout)
+
+    def _unit_paths(self, cr):
+        """Build the unit curve fill and outline paths once, in identity space."""
+        cr.save()
+        cr.identity_matrix()
+        cr.new_path()
+        cr.move_to(UNIT_CURVE[0][0], 0)
+        for u, amp in UNIT_CURVE:
+            cr.line_to(u, amp)
+        cr.line_to(UNIT_CURVE[-1][0], 0)
+        cr.close_path()
+        self._curve_fill = cr.copy_path()
+        cr.new_path()
+        cr.move_to(*UNIT_CURVE[0])
+        for u, amp in UNIT_CURVE[1:]:
+            cr.line_to(u, amp)
+        self._curve_line = cr.copy_path()
+        cr.new_path()
+        cr.restore()
+
+    def _render_static(self, cr, width, height, ch_min, ch_max, ch_range):
+        surface = cr.get_target().create_similar(cairo.CONTENT_COLOR_ALPHA, width, height)
+        sc = cairo.Context(surface)
+        sc.set_source_rgb(0.15, 0.15, 0.18)
+        sc.rectangle(0, 0, width, height)
+        sc.fill()
+        if not self._visible:
+            sc.set_source_rgb(0.6, 0.6, 0.6)
+            self._show_label(sc, _("No networks found"), 14, width / 2 - 60, height / 2)
+            return surface
+
+        plot_w = width - MARGIN_LEFT - MARGIN_RIGHT
+        plot_h = height - MARGIN_TOP - MARGIN_BOTTOM
+        x_scale = plot_w / max(ch_max - ch_min, 1)
+
+        # Grid
+        sc.set_line_width(0.5)
+        for dbm in range(-100, -10, 10):
+            y = MARGIN_TOP + plot_h - (dbm - DBM_MIN) / (DBM_MAX - DBM_MIN) * plot_h
+            sc.set_source_rgba(0.4, 0.4, 0.4, 0.3)
+            sc.move_to(MARGIN_LEFT, y); sc.line_to(width - MARGIN_RIGHT, y)
+            sc.stroke()
+            sc.set_source_rgb(0.6, 0.6, 0.6)
+            self._show_label(sc, f"{dbm}", 10, 5, y + 4)
+        for ch in ch_range:
+            x = MARGIN_LEFT + (ch - ch_min) * x_scale
+            sc.set_source_rgba(0.4, 0.4, 0.4, 0.3)
+            sc.move_to(x, MARGIN_TOP); sc.line_to(x, height - MARGIN_BOTTOM)
+            sc.stroke()
+            sc.set_source_rgb(0.6, 0.6, 0.6)
+            self._show_label(sc, str(ch), 10, x - 5, height - MARGIN_BOTTOM + 15)
+        return surface
+
+    def render(self, cr, width, height):
+        ch_min, ch_max, ch_range = self._axis()
+        key = (width, height, self.band_filter, ch_range, bool(self._visible))
+        if key != self._static_key:
+            self._static = self._render_static(cr, width, height, ch_min, ch_max, ch_range)
+            self._static_key = key
+        cr.set_source_surface(self._static, 0, 0)
+        cr.paint()
+        if not self._visible:
+            return
+        if self._curve_fill is None:
+            self._unit_paths(cr)
+
+        plot_w = width - MARGIN_LEFT - MARGIN_RIGHT
+        plot_h = height - MARGIN_TOP - MARGIN_BOTTOM
+        x_scale = plot_w / max(ch_max - ch_min, 1)
+        y_scale = plot_h / (DBM_MAX - DBM_MIN)
+        base_y = MARGIN_TOP + plot_h
+        bw = 2.5 if self.band_filter == BAND_24 else 2.0  # channel bandwidth
+        curve_fill, curve_line = self._curve_fill, self._curve_line
+
+        cr.set_line_width(2)
+        for i, net in enumerate(self._visible):
+            color = COLORS[i % len(COLORS)]
+            x = MARGIN_LEFT + (net.channel - ch_min) * x_scale
+            peak_y = base_y - (net.dbm - DBM_MIN) * y_scale
+
+            # Place the unit curve; restore before painting so the line
+            # width stays in device units. The vertical scale is kept
+            # invertible for networks sitting at the floor.
+            rise = min(peak_y - base_y, -0.5)
+            cr.save()
+            cr.translate(x, base_y)
+            cr.scale(bw * x_scale, rise)
+            cr.append_path(curve_fill)
+            cr.restore()
+            cr.set_source_rgba(*color, 0.3)
+            cr.fill()
+
+            cr.save()
+            cr.translate(x, base_y)
+            cr.scale(bw * x_scale, rise)
+            cr.append_path(curve_line)
+            cr.restore()
+            cr.set_source_rgba(*color, 0.9)
+            cr.stroke()
+
+            # Label
+            label = net.ssid[:18]
+            _layout, label_w, _baseline = self._label(cr, label, 9)
+            cr.set_source_rgb(*color)
+            self._show_label(cr, label, 9, x - label_w / 2, peak_y - 6)
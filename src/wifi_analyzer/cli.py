@@ -0,0 +1,342 @@
+"""Command-line entry point.
+
+``wifi-analyzer`` starts the GTK application; ``wifi-analyzer scan``
+runs headless and streams NDJSON (or writes a columnar ``.wscan``
+session) without ever importing ``gi``. ``wifi-analyzer link`` streams
+the connected link's signal at a high rate, and ``wifi-analyzer analyze``
+reports rogue and evil-twin APs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BANDS = {"2.4": "2.4 GHz", "5": "5 GHz", "6": "6 GHz"}
+
+
+def add_source_arguments(parser):
+    """Options picking a scan source other than the Wi-Fi adapter.
+
+    Returns the group of mutually exclusive sources, for commands that
+    add their own.
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--replay", metavar="FILE",
+                       help="replay a recorded session (.wscan or NDJSON) or nmcli -t / "
+                            "iw scan dump output instead of scanning")
+    group.add_argument("--simulate", metavar="APS", type=int,
+                       help="scan a synthetic site with this many access points")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed factor, 0 for as fast as possible (default: 1)")
+    parser.add_argument("--loop", action="store_true", help="restart the replay at the end")
+    parser.add_argument("--seed", type=int, help="random seed for --simulate")
+    parser.add_argument("--churn", type=float, default=0.01,
+                        help="share of simulated APs replaced per scan (default: 0.01)")
+    return group
+
+
+def make_source(args):
+    """Return the backend chosen by add_source_arguments() options, or None."""
+    if args.replay:
+        from wifi_analyzer.simulate import open_replay
+        return open_replay(args.replay, args.speed, args.loop)
+    if args.simulate is not None:
+        from wifi_analyzer.simulate import SyntheticEnvironment
+        return SyntheticEnvironment(args.simulate, seed=args.seed, churn=args.churn)
+    return None
+
+
+def _scan_parser():
+    parser = argparse.ArgumentParser(
+        prog="wifi-analyzer scan",
+        description="Scan without the GUI and write one JSON object per network per scan.")
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="number of scans, 0 to run until interrupted (default: 1)")
+    parser.add_argument("-i", "--interval", type=float,
+                        help="seconds between scan starts (default: 10; recorded "
+                             "sessions replay at their own pace)")
+    parser.add_argument("-b", "--band", choices=sorted(BANDS), action="append",
+                        help="only report this band; may be repeated")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to append to, '-' for stdout (default)")
+    parser.add_argument("-f", "--format", choices=("ndjson", "wscan"), default="ndjson",
+                        help="output format; wscan writes a columnar session file "
+                             "and needs --output (default: ndjson)")
+    parser.add_argument("-I", "--interface", action="append", metavar="IFNAME",
+                        help="scan this Wi-Fi interface; may be repeated to scan "
+                             "several concurrently (default: all)")
+    parser.add_argument("--backend", choices=("nmcli", "iw"), default="nmcli",
+                        help="scan with nmcli, or read the kernel's cached results with "
+                             "iw for real dBm and channel width (default: nmcli)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="read cached results between occasional active rescans, "
+                             "scanning faster while networks come and go (ignores -i)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record stage timings, write them to FILE in Chrome "
+                             "trace format and print a summary on exit")
+    add_source_arguments(parser)
+    return parser
+
+
+def scan_main(argv):
+    """Run the headless ``scan`` subcommand."""
+    args = _scan_parser().parse_args(argv)
+    from wifi_analyzer import instrument
+    if args.trace:
+        instrument.recorder.enabled = True
+    backend = make_source(args)
+    scheduler = None
+    if backend is None and (args.interface or args.backend != "nmcli" or args.adaptive):
+        import asyncio
+        from wifi_analyzer.backends import make_adaptive_scanner, make_scanner
+        try:
+            if args.adaptive:
+                scanner = scheduler = make_adaptive_scanner(args.backend, args.interface)
+            else:
+                scanner = make_scanner(args.backend, args.interface)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"wifi-analyzer: cannot list interfaces: {e}", file=sys.stderr)
+            return 1
+        backend = lambda: asyncio.run(scanner())  # noqa: E731
+    elif backend is None:
+        from wifi_analyzer.scanner import scan_nmcli
+        backend = scan_nmcli
+    interval = args.interval if args.interval is not None else getattr(
+        backend, "interval", 10.0)
+    if args.band:
+        from wifi_analyzer.records import Band
+        bands = {Band.parse(BANDS[b]) for b in args.band}
+    else:
+        bands = None
+    if args.format == "wscan":
+        if args.output == "-":
+            print("wifi-analyzer: --format wscan needs --output FILE", file=sys.stderr)
+            return 2
+        from wifi_analyzer.scanfile import SessionWriter
+        try:
+            session = SessionWriter(args.output, append=True)
+        except ValueError as e:
+            print(f"wifi-analyzer: {e}", file=sys.stderr)
+            return 1
+        out = None
+    else:
+        session = None
+        out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+
+    scan = 0
+    try:
+        while True:
+            started = time.monotonic()
+            ts = round(time.time(), 3)
+            try:
+                with instrument.span("scan"):
+                    nets = backend()
+            except Exception as e:
+                print(f"wifi-analyzer: scan failed: {e}", file=sys.stderr)
+                instrument.count("scan errors")
+                nets = []
+            if bands is not None:
+                nets = [net for net in nets if net.band in bands]
+            if session is not None:
+                session.append_scan(ts, nets)
+            else:
+                for net in nets:
+                    record = net.as_dict()
+                    record["ts"] = ts
+                    record["scan"] = scan
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            scan += 1
+            if args.count and scan >= args.count or getattr(backend, "exhausted", False):
+                break
+            if scheduler is not None:
+                time.sleep(scheduler.next_delay())
+            else:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); keep the interpreter
+        # from complaining again when it flushes stdout at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if session is not None:
+            session.close()
+        elif out is not sys.stdout:
+            out.close()
+        if args.trace:
+            instrument.recorder.dump(args.trace)
+            rec = instrument.recorder
+            print(instrument.format_summary(rec.stats(), rec.counters), file=sys.stderr)
+        if scheduler is not None:
+            from wifi_analyzer.scheduler import format_metrics
+            print(format_metrics(scheduler.metrics()), file=sys.stderr)
+    return 0
+
+
+def _link_parser():
+    from wifi_analyzer.link import PROC_WIRELESS, SAMPLE_RATE
+    parser = argparse.ArgumentParser(
+        prog="wifi-analyzer link",
+        description="Sample the signal of the connected link and write one JSON object "
+                    "per sample.")
+    parser.add_argument("-I", "--interface", metavar="IFNAME",
+                        help="sample this interface (default: the first one connected)")
+    parser.add_argument("-r", "--rate", type=float, default=SAMPLE_RATE,
+                        help=f"samples per second (default: {SAMPLE_RATE})")
+    parser.add_argument("-n", "--count", type=int, default=0,
+                        help="number of samples, 0 to run until interrupted (default: 0)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to append to, '-' for stdout (default)")
+    parser.add_argument("--proc", default=PROC_WIRELESS, metavar="FILE",
+                        help=f"read this file instead of {PROC_WIRELESS}")
+    return parser
+
+
+def link_main(argv):
+    """Run the headless ``link`` subcommand."""
+    args = _link_parser().parse_args(argv)
+    from wifi_analyzer.link import LinkSampler
+    try:
+        sampler = LinkSampler(args.interface, args.proc, capacity=1)
+    except OSError as e:
+        print(f"wifi-analyzer: cannot sample the link: {e}", file=sys.stderr)
+        return 1
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    period = 1.0 / args.rate
+    taken = 0
+    deadline = time.monotonic()
+    try:
+        while True:
+            reading = sampler.sample()
+            if reading is not None:
+                link, level, noise = reading
+                out.write(json.dumps({
+                    "ts": round(time.time(), 3), "ifname": sampler.ifname, "link": link,
+                    "level": level, "noise": None if noise != noise else noise}) + "\n")
+                out.flush()
+            taken += 1
+            if args.count and taken >= args.count:
+                break
+            # Keep the rate steady instead of drifting by the write time
+            deadline += period
+            time.sleep(max(0.0, deadline - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        sampler.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def _analyze_parser():
+    parser = argparse.ArgumentParser(
+        prog="wifi-analyzer analyze",
+        description="Group BSSIDs into access points and networks while scanning, and "
+                    "report signs of rogue and evil-twin APs.")
+    parser.add_argument("-n", "--count", type=int, default=0,
+                        help="number of scans, 0 to run until interrupted or the "
+                             "replay ends (default: 0)")
+    parser.add_argument("-i", "--interval", type=float,
+                        help="seconds between scans, 0 to run simulations as fast as "
+                             "possible (default: 10; recorded sessions replay at their "
+                             "own pace)")
+    parser.add_argument("--json", action="store_true",
+                        help="write one JSON object per alert instead of text")
+    group = add_source_arguments(parser)
+    group.add_argument("--scenario", metavar="APS", type=int,
+                       help="scan a synthetic site with this many access points where "
+                            "rogue APs turn up every few scans, and check the alerts")
+    return parser
+
+
+def analyze_main(argv):
+    """Run the headless ``analyze`` subcommand."""
+    args = _analyze_parser().parse_args(argv)
+    from wifi_analyzer.analysis import ScanAnalyzer
+    from wifi_analyzer.oui import vendor
+    scenario = None
+    if args.scenario is not None:
+        from wifi_analyzer.simulate import RogueScenario
+        backend = scenario = RogueScenario(args.scenario, seed=args.seed, churn=args.churn)
+    else:
+        backend = make_source(args)
+    if backend is None:
+        from wifi_analyzer.scanner import scan_nmcli
+        backend = scan_nmcli
+    interval = args.interval if args.interval is not None else getattr(
+        backend, "interval", 10.0)
+    analyzer = ScanAnalyzer(vendor_of=vendor)
+    raised = set()
+    ts = time.time()
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                nets = backend()
+            except Exception as e:
+                print(f"wifi-analyzer: scan failed: {e}", file=sys.stderr)
+                nets = []
+            # Simulated sites keep simulated time, so runs repeat exactly
+            ts = ts + backend.interval if scenario is not None else time.time()
+            for alert in analyzer.update(ts, nets):
+                raised.add((alert.kind, alert.mac))
+                if args.json:
+                    print(json.dumps(alert.as_dict(), ensure_ascii=False), flush=True)
+                else:
+                    print(f"{time.strftime('%H:%M:%S', time.localtime(ts))} "
+                          f"{alert.severity!s:<8} {alert.message}", flush=True)
+            if (args.count and analyzer.scans >= args.count
+                    or getattr(backend, "exhausted", False)):
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    aps = analyzer.access_points()
+    print(f"{analyzer.scans} scans: {len(analyzer)} BSSIDs, {len(aps)} access points, "
+          f"{len(analyzer.networks())} networks", file=sys.stderr)
+    if scenario is not None:
+        expected = scenario.expected_alerts()
+        print(f"{len(scenario.incidents)} staged incidents: {len(expected & raised)} of "
+              f"{len(expected)} expected alerts raised, {len(raised - expected)} "
+              f"unexpected", file=sys.stderr)
+        return 0 if raised == expected else 1
+    return 0
+
+
+def _gui_parser():
+    parser = argparse.ArgumentParser(
+        prog="wifi-analyzer",
+        description="WiFi network analyzer. Run 'wifi-analyzer scan --help' or "
+                    "'wifi-analyzer link --help' or 'wifi-analyzer analyze --help' for "
+                    "headless use.")
+    parser.add_argument("-i", "--interval", type=float,
+                        help="rescan every this many seconds (default: adapt, reading "
+                             "cached results between occasional rescans)")
+    add_source_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["scan"]:
+        return scan_main(argv[1:])
+    if argv[:1] == ["link"]:
+        return link_main(argv[1:])
+    if argv[:1] == ["analyze"]:
+        return analyze_main(argv[1:])
+    args = _gui_parser().parse_args(argv)
+    backend = make_source(args)
+    from wifi_analyzer.app import main as app_main
+    return app_main(backend, args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
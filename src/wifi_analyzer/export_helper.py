@@ -1,58 +1,134 @@
-"""Extended export: CSV, JSON, ODS, PDF."""
+"""Extended export: CSV, JSON/NDJSON, ODS, PDF.
+
+Exporters accept any iterable of rows (lists, generators) and write in
+bounded chunks, so memory use does not grow with the number of rows.
+CSV and JSON can be gzip or zstd compressed.
+"""
 import csv
+import gzip
 import json
 import os
 import time
+import zipfile
+from itertools import islice
+from xml.sax.saxutils import escape, quoteattr
+
+CHUNK_ROWS = 1000
+COMPRESSION_SUFFIX = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _chunks(rows, size=CHUNK_ROWS):
+    """Yield lists of at most *size* rows from any iterable."""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _open_text(filepath, compression=None):
+    """Open *filepath* for writing text, optionally compressed."""
+    if compression is None:
+        return open(filepath, 'w', newline='', encoding='utf-8')
+    if compression == 'gzip':
+        return gzip.open(filepath, 'wt', newline='', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            from compression import zstd  # Python 3.14+
+        except ImportError:
+            try:
+                import zstandard as zstd
+            except ImportError as err:
+                raise RuntimeError(
+                    "zstd output needs Python 3.14 or the zstandard package") from err
+        return zstd.open(filepath, 'wt', newline='', encoding='utf-8')
+    raise ValueError(f"Unknown compression: {compression}")
 
 
-def export_csv(data, headers, filepath):
+def export_csv(data, headers, filepath, compression=None):
     """Export data as CSV."""
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+    with _open_text(filepath, compression) as f:
         writer = csv.writer(f)
         if headers:
             writer.writerow(headers)
-        writer.writerows(data)
+        for chunk in _chunks(data):
+            writer.writerows(chunk)
     return filepath
 
 
-def export_json(data, headers, filepath):
-    """Export data as JSON."""
-    if headers:
-        records = [dict(zip(headers, row)) for row in data]
-    else:
-        records = data
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
+def export_json(data, headers, filepath, ndjson=False, compression=None):
+    """Export data as JSON (an array, one record per line) or NDJSON."""
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with _open_text(filepath, compression) as f:
+        if not ndjson:
+            f.write('[')
+        first = True
+        for chunk in _chunks(data):
+            records = [dict(zip(headers, row)) for row in chunk] if headers else chunk
+            lines = [dumps(r) for r in records]
+            if ndjson:
+                f.write('\n'.join(lines) + '\n')
+            else:
+                f.write(('\n' if first else ',\n') + ',\n'.join(lines))
+            first = False
+        if not ndjson:
+            f.write('\n]\n')
     return filepath
 
 
+_ODS_MIMETYPE = 'application/vnd.oasis.opendocument.spreadsheet'
+_ODS_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+    'manifest:version="1.2">'
+    f'<manifest:file-entry manifest:full-path="/" manifest:media-type="{_ODS_MIMETYPE}"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    '</manifest:manifest>'
+)
+_ODS_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.2">'
+    '<office:body><office:spreadsheet><table:table table:name="Sheet1">'
+)
+_ODS_TAIL = '</table:table></office:spreadsheet></office:body></office:document-content>'
+
+
+def _ods_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (f'<table:table-cell office:value-type="float" office:value={quoteattr(str(value))}>'
+                f'<text:p>{value}</text:p></table:table-cell>')
+    return f'<table:table-cell office:value-type="string"><text:p>{escape(str(value))}</text:p></table:table-cell>'
+
+
+def _ods_row(row):
+    return '<table:table-row>' + ''.join(_ods_cell(c) for c in row) + '</table:table-row>'
+
+
 def export_ods(data, headers, filepath):
-    """Export data as ODS (simple XML)."""
-    xml = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml.append('<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
-               'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
-               'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">')
-    xml.append('<office:body><office:spreadsheet><table:table table:name="Sheet1">')
-    if headers:
-        xml.append('<table:table-row>')
-        for h in headers:
-            xml.append(f'<table:table-cell><text:p>{h}</text:p></table:table-cell>')
-        xml.append('</table:table-row>')
-    for row in data:
-        xml.append('<table:table-row>')
-        for cell in row:
-            xml.append(f'<table:table-cell><text:p>{cell}</text:p></table:table-cell>')
-        xml.append('</table:table-row>')
-    xml.append('</table:table></office:spreadsheet></office:body></office:document-content>')
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(xml))
+    """Export data as an ODS spreadsheet package."""
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as zf:
+        # The mimetype entry must come first and be stored uncompressed
+        zf.writestr(zipfile.ZipInfo('mimetype'), _ODS_MIMETYPE, compress_type=zipfile.ZIP_STORED)
+        zf.writestr('META-INF/manifest.xml', _ODS_MANIFEST)
+        with zf.open('content.xml', 'w', force_zip64=True) as f:
+            f.write(_ODS_HEAD.encode('utf-8'))
+            if headers:
+                f.write(_ods_row(headers).encode('utf-8'))
+            for chunk in _chunks(data):
+                f.write(''.join(_ods_row(row) for row in chunk).encode('utf-8'))
+            f.write(_ODS_TAIL.encode('utf-8'))
     return filepath
 
 
-def get_export_path(title, fmt, output_dir=None):
+def get_export_path(title, fmt, output_dir=None, compression=None):
     """Generate export file path."""
     if output_dir is None:
         output_dir = os.path.expanduser("~")
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    ext = {'csv': '.csv', 'json': '.json', 'ods': '.ods', 'pdf': '.pdf'}.get(fmt, '.txt')
+    ext = {'csv': '.csv', 'json': '.json', 'ndjson': '.ndjson', 'ods': '.ods',
+           'pdf': '.pdf', 'wscan': '.wscan'}.get(fmt, '.txt')
+    ext += COMPRESSION_SUFFIX.get(compression, '')
     return os.path.join(output_dir, f"{title}_{timestamp}{ext}")
@@ -0,0 +1,200 @@
+"""Signal heatmaps interpolated from site-survey samples.
+
+Values are interpolated with a modified Shepard (inverse distance)
+scheme with compact support: a sample at distance ``d`` weighs
+``((R - d) / (R d))**2`` inside radius ``R`` and nothing beyond it. That
+keeps the surface exact at the samples and continuous everywhere, and it
+makes every cell depend only on nearby samples, so the grid can be
+computed tile by tile (in any order, without seams) from a short
+candidate list per tile. Cells with no sample within ``R`` are NaN.
+
+NumPy is used for the per-tile arithmetic when it is installed; the
+pure-Python fallback gives the same result, only slower.
+"""
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional, see module docstring
+    np = None
+
+CELL = 8           # map pixels per grid cell
+TILE = 16          # grid cells per tile side
+NEIGHBOURS = 8     # samples expected within the radius on average
+NODATA = float("nan")
+
+# dBm -> colour stops for rendering (red = poor ... green = strong)
+COLOR_STOPS = (
+    (-90, (0.55, 0.0, 0.0)),
+    (-80, (0.9, 0.2, 0.0)),
+    (-70, (1.0, 0.75, 0.0)),
+    (-60, (0.55, 0.85, 0.1)),
+    (-45, (0.0, 0.7, 0.3)),
+)
+ALPHA = 0.6
+
+
+def default_radius(width, height, samples, neighbours=NEIGHBOURS):
+    """Radius that holds about *neighbours* samples if they were spread evenly."""
+    return math.sqrt(neighbours * width * height / (math.pi * max(samples, 1)))
+
+
+class Interpolator:
+    """Compact-support IDW over scattered ``(x, y, value)`` samples."""
+
+    def __init__(self, xs, ys, values, radius):
+        self.xs = array("d", xs)
+        self.ys = array("d", ys)
+        self.values = array("d", values)
+        self.radius = float(radius)
+        # Bucket the samples on a grid of radius-sized squares
+        self._buckets = {}
+        for i, (x, y) in enumerate(zip(self.xs, self.ys)):
+            key = (int(x // self.radius), int(y // self.radius))
+            self._buckets.setdefault(key, []).append(i)
+
+    def candidates(self, x0, y0, x1, y1):
+        """Indices of samples within the radius of the rectangle [x0, x1] x [y0, y1]."""
+        r = self.radius
+        out = []
+        for bx in range(int((x0 - r) // r), int((x1 + r) // r) + 1):
+            for by in range(int((y0 - r) // r), int((y1 + r) // r) + 1):
+                for i in self._buckets.get((bx, by), ()):
+                    dx = max(x0 - self.xs[i], 0.0, self.xs[i] - x1)
+                    dy = max(y0 - self.ys[i], 0.0, self.ys[i] - y1)
+                    if dx * dx + dy * dy < r * r:
+                        out.append(i)
+        return out
+
+    def grid(self, x0, y0, cols, rows, step):
+        """Interpolate at cell centres ``x0 + (c + 0.5) * step`` (and likewise y).
+
+        Returns ``array('f')`` of ``rows * cols`` values, row-major.
+        """
+        x1 = x0 + cols * step
+        y1 = y0 + rows * step
+        cand = self.candidates(x0, y0, x1, y1)
+        if not cand:
+            return array("f", [NODATA]) * (rows * cols)
+        if np is not None:
+            return self._grid_numpy(cand, x0, y0, cols, rows, step)
+        return self._grid_python(cand, x0, y0, cols, rows, step)
+
+    def _grid_numpy(self, cand, x0, y0, cols, rows, step):
+        idx = np.asarray(cand)
+        px = np.frombuffer(self.xs, dtype=np.float64)[idx]
+        py = np.frombuffer(self.ys, dtype=np.float64)[idx]
+        pv = np.frombuffer(self.values, dtype=np.float64)[idx]
+        cx = x0 + (np.arange(cols) + 0.5) * step
+        cy = y0 + (np.arange(rows) + 0.5) * step
+        dx = cx[None, :, None] - px
+        dy = cy[:, None, None] - py
+        d = np.sqrt(dx * dx + dy * dy)
+        r = self.radius
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = np.where(d < r, ((r - d) / (r * d)) ** 2, 0.0)
+            exact = d < 1e-6
+            w = np.where(exact, 1e30, w)
+            den = w.sum(axis=2)
+            out = np.where(den > 0, (w * pv).sum(axis=2) / den, np.nan)
+        return array("f", out.astype(np.float32).tobytes())
+
+    def _grid_python(self, cand, x0, y0, cols, rows, step):
+        r = self.radius
+        r2 = r * r
+        sqrt = math.sqrt
+        pts = [(self.xs[i], self.ys[i], self.values[i]) for i in cand]
+        out = array("f")
+        for row in range(rows):
+            y = y0 + (row + 0.5) * step
+            # Only samples within the radius of this row can contribute
+            near = [(px, py - y, v) for px, py, v in pts if abs(py - y) < r]
+            for col in range(cols):
+                x = x0 + (col + 0.5) * step
+                num = den = 0.0
+                for px, dy, v in near:
+                    dx = x - px
+                    d2 = dx * dx + dy * dy
+                    if d2 >= r2:
+                        continue
+                    if d2 < 1e-12:
+                        num, den = v, 1.0
+                        break
+                    d = sqrt(d2)
+                    w = (r - d) / (r * d)
+                    w *= w
+                    num += w * v
+                    den += w
+                out.append(num / den if den else NODATA)
+        return out
+
+
+class HeatmapGrid:
+    """A width x height map split into square tiles of grid cells."""
+
+    def __init__(self, width, height, cell=CELL, tile=TILE):
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.tile = tile
+        self.cols = max(1, math.ceil(width / cell))
+        self.rows = max(1, math.ceil(height / cell))
+
+    def tiles(self, focus=None):
+        """Yield ``(col0, row0, cols, rows)`` per tile, nearest to *focus* first.
+
+        *focus* is a map position (e.g. the viewport centre or the last
+        survey point); without one tiles come in reading order.
+        """
+        t = self.tile
+        out = [(c, r, min(t, self.cols - c), min(t, self.rows - r))
+               for r in range(0, self.rows, t) for c in range(0, self.cols, t)]
+        if focus is not None:
+            fx, fy = focus[0] / self.cell, focus[1] / self.cell
+            out.sort(key=lambda tl: (tl[0] + tl[2] / 2 - fx) ** 2 + (tl[1] + tl[3] / 2 - fy) ** 2)
+        return out
+
+    def compute(self, interp, col0, row0, cols, rows):
+        """Interpolated values of one tile (see Interpolator.grid)."""
+        return interp.grid(col0 * self.cell, row0 * self.cell, cols, rows, self.cell)
+
+
+def _build_lut():
+    """Premultiplied ARGB32 pixel (little-endian BGRA bytes) per whole dBm -120..0."""
+    lut = []
+    for dbm in range(-120, 1):
+        if dbm <= COLOR_STOPS[0][0]:
+            rgb = COLOR_STOPS[0][1]
+        elif dbm >= COLOR_STOPS[-1][0]:
+            rgb = COLOR_STOPS[-1][1]
+        else:
+            for (d0, c0), (d1, c1) in zip(COLOR_STOPS, COLOR_STOPS[1:]):
+                if d0 <= dbm <= d1:
+                    f = (dbm - d0) / (d1 - d0)
+                    rgb = tuple(a + (b - a) * f for a, b in zip(c0, c1))
+                    break
+        a = ALPHA
+        lut.append(bytes((round(rgb[2] * a * 255), round(rgb[1] * a * 255),
+                          round(rgb[0] * a * 255), round(a * 255))))
+    return lut
+
+
+_LUT = _build_lut()
+_CLEAR = b"\0\0\0\0"
+
+
+def colorize(values, cols, stride=None):
+    """Turn a tile of dBm values into ARGB32 rows for a cairo ImageSurface.
+
+    Returns bytes of ``rows * stride``; NaN cells are transparent.
+    """
+    stride = stride or cols * 4
+    pad = b"\0" * (stride - cols * 4)
+    lut = _LUT
+    rows = []
+    for start in range(0, len(values), cols):
+        row = [_CLEAR if v != v else lut[min(max(int(round(v)), -120), 0) + 120]
+               for v in values[start:start + cols]]
+        rows.append(b"".join(row) + pad)
+    return b"".join(rows)
@@ -0,0 +1,258 @@
+"""Per-BSSID signal history with bounded memory and an on-disk ring.
+
+Each BSSID collects samples in a small fixed-size in-memory buffer. When
+the buffer fills it is written as one fixed-layout block into a
+memory-mapped ring file, so the samples of a block are contiguous and can
+be handed out as ``memoryview`` slices without copying. The ring file has
+a fixed size; once it is full the oldest block is overwritten.
+
+Memory stays bounded however many BSSIDs come and go: at most
+MAX_LIVE_SERIES buffers are held (the one started longest ago is
+written out early to make room), and a BSSID is forgotten once the ring
+has overwritten its last block.
+
+File layout (little endian)::
+
+    header   8s magic, I block_samples, I max_blocks
+    block    Q bssid, Q sequence, I count, I reserved, d first timestamp,
+             d timestamps[block_samples], h dbm[block_samples] (padded to 8)
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+
+MAGIC = b"WAHIST01"
+_FILE_HEADER = struct.Struct("<8sII")
+_BLOCK_HEADER = struct.Struct("<QQIId")
+
+BLOCK_SAMPLES = 256
+MAX_BLOCKS = 16384
+MAX_LIVE_SERIES = 4096  # BSSIDs with buffered samples, about 10 MB of buffers
+
+
+def _block_size(block_samples):
+    dbm_bytes = (2 * block_samples + 7) // 8 * 8
+    return _BLOCK_HEADER.size + 8 * block_samples + dbm_bytes
+
+
+class _Series:
+    """Live buffer and on-disk block index for one BSSID.
+
+    The buffer is allocated by the first sample after a spill, so a
+    BSSID that is no longer heard only costs its block index.
+    """
+
+    __slots__ = ("ts", "dbm", "n", "slots", "t_first", "t_last")
+
+    def __init__(self):
+        self.ts = self.dbm = None
+        self.n = 0
+        self.slots = deque()    # ring slots holding this BSSID, oldest first
+        self.t_first = deque()  # first/last timestamp of each of those slots
+        self.t_last = deque()
+
+
+class ScanHistory:
+    """Signal history store backed by a memory-mapped ring file.
+
+    Not tied to any thread, but safe to share between the scan thread
+    (appending) and the GUI (querying).
+    """
+
+    def __init__(self, path, block_samples=BLOCK_SAMPLES, max_blocks=MAX_BLOCKS,
+                 max_live=MAX_LIVE_SERIES):
+        self.path = path
+        self.closed = False
+        self.max_live = max_live
+        self._lock = threading.Lock()
+        self._series = {}
+        self._live = {}  # bssid -> series with buffered samples, oldest buffer first
+        exists = os.path.exists(path) and os.path.getsize(path) >= _FILE_HEADER.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if exists:
+            magic, block_samples, max_blocks = _FILE_HEADER.unpack(
+                os.pread(self._fd, _FILE_HEADER.size, 0))
+            if magic != MAGIC:
+                os.close(self._fd)
+                raise ValueError(f"{path}: not a scan history file")
+        self.block_samples = block_samples
+        self.max_blocks = max_blocks
+        self._block_size = _block_size(block_samples)
+        size = _FILE_HEADER.size + max_blocks * self._block_size
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+        if not exists:
+            os.pwrite(self._fd, _FILE_HEADER.pack(MAGIC, block_samples, max_blocks), 0)
+        self._map = mmap.mmap(self._fd, size)
+        self._view = memoryview(self._map)
+        self._owners = array("Q", bytes(8 * max_blocks))
+        self._seq = 0
+        if exists:
+            self._load_index()
+
+    # -- file ------------------------------------------------------------
+
+    def _slot_offset(self, slot):
+        return _FILE_HEADER.size + slot * self._block_size
+
+    def _load_index(self):
+        blocks = []
+        for slot in range(self.max_blocks):
+            bssid, seq, count, _r, t0 = _BLOCK_HEADER.unpack_from(self._map, self._slot_offset(slot))
+            if count:
+                blocks.append((seq, slot, bssid, count, t0))
+        blocks.sort()
+        for seq, slot, bssid, count, t0 in blocks:
+            ts, _dbm = self._block_views(slot, count)
+            self._index_block(bssid, slot, t0, ts[count - 1])
+            self._seq = seq + 1
+
+    def _index_block(self, bssid, slot, t_first, t_last):
+        series = self._series.get(bssid)
+        if series is None:
+            series = self._series[bssid] = _Series()
+        series.slots.append(slot)
+        series.t_first.append(t_first)
+        series.t_last.append(t_last)
+        self._owners[slot] = bssid
+
+    def _block_views(self, slot, count):
+        start = self._slot_offset(slot) + _BLOCK_HEADER.size
+        ts = self._view[start:start + 8 * count].cast("d")
+        start += 8 * self.block_samples
+        return ts, self._view[start:start + 2 * count].cast("h")
+
+    def _spill(self, bssid, series):
+        """Write the live buffer of *series* into the next ring slot."""
+        slot = self._seq % self.max_blocks
+        if self._seq >= self.max_blocks:
+            # Evict the block this slot held; it is always its owner's oldest
+            owner_bssid = self._owners[slot]
+            owner = self._series.get(owner_bssid)
+            if owner is not None and owner.slots and owner.slots[0] == slot:
+                owner.slots.popleft()
+                owner.t_first.popleft()
+                owner.t_last.popleft()
+                if not owner.slots and not owner.n and owner is not series:
+                    # Nothing left of it on disk or in memory
+                    del self._series[owner_bssid]
+            self._owners[slot] = 0
+        n = series.n
+        off = self._slot_offset(slot)
+        _BLOCK_HEADER.pack_into(self._map, off, bssid, self._seq, n, 0, series.ts[0])
+        off += _BLOCK_HEADER.size
+        self._map[off:off + 8 * n] = series.ts[:n].tobytes()
+        off += 8 * self.block_samples
+        self._map[off:off + 2 * n] = series.dbm[:n].tobytes()
+        self._index_block(bssid, slot, series.ts[0], series.ts[n - 1])
+        self._seq += 1
+        series.n = 0
+        series.ts = series.dbm = None
+        del self._live[bssid]
+
+    # -- ingest ----------------------------------------------------------
+
+    def append(self, bssid, ts, dbm):
+        """Record one sample; *bssid* is a 48-bit integer."""
+        with self._lock:
+            if not self.closed:
+                self._append(bssid, ts, dbm)
+
+    def _append(self, bssid, ts, dbm):
+        series = self._series.get(bssid)
+        if series is None or not series.n:
+            live = self._live
+            if len(live) >= self.max_live:
+                stale = next(iter(live))
+                self._spill(stale, live[stale])
+                # The spill may have evicted this BSSID's last block
+                series = self._series.get(bssid)
+            if series is None:
+                series = self._series[bssid] = _Series()
+            series.ts = array("d", bytes(8 * self.block_samples))
+            series.dbm = array("h", bytes(2 * self.block_samples))
+            live[bssid] = series
+        series.ts[series.n] = ts
+        series.dbm[series.n] = dbm
+        series.n += 1
+        if series.n == self.block_samples:
+            self._spill(bssid, series)
+
+    def append_scan(self, ts, networks):
+        """Record every network of one scan taken at *ts*."""
+        with self._lock:
+            if self.closed:
+                return
+            for net in networks:
+                if net.mac:
+                    self._append(net.mac, ts, net.dbm)
+
+    # -- queries ---------------------------------------------------------
+
+    def bssids(self):
+        return list(self._series)
+
+    def query(self, bssid, t0=float("-inf"), t1=float("inf")):
+        """Return the samples of *bssid* with ``t0 <= ts <= t1``.
+
+        The result is a list of ``(timestamps, dbm)`` segments in time
+        order. Segments from the ring file are memoryviews straight into
+        the mapping (valid until the ring wraps over them); the still
+        buffered tail is returned as a copy.
+        """
+        with self._lock:
+            series = self._series.get(bssid)
+            if series is None or self.closed:
+                return []
+            segments = []
+            # Blocks are in time order; skip the ones outside the window
+            first = bisect_left(series.t_last, t0)
+            for i in range(first, len(series.slots)):
+                if series.t_first[i] > t1:
+                    break
+                slot = series.slots[i]
+                count = self._block_count(slot)
+                ts, dbm = self._block_views(slot, count)
+                lo = bisect_left(ts, t0)
+                hi = bisect_right(ts, t1)
+                if lo < hi:
+                    segments.append((ts[lo:hi], dbm[lo:hi]))
+            n = series.n
+            if n:
+                ts = series.ts[:n]
+                lo = bisect_left(ts, t0)
+                hi = bisect_right(ts, t1)
+                if lo < hi:
+                    segments.append((ts[lo:hi], series.dbm[lo:hi]))
+            return segments
+
+    def _block_count(self, slot):
+        return _BLOCK_HEADER.unpack_from(self._map, self._slot_offset(slot))[2]
+
+    # -- lifetime --------------------------------------------------------
+
+    def flush(self):
+        """Write all partially filled buffers to the ring and sync the file."""
+        with self._lock:
+            for bssid, series in list(self._live.items()):
+                self._spill(bssid, series)
+            self._map.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        with self._lock:
+            self.closed = True
+            self._view.release()
+            try:
+                self._map.close()
+            except BufferError:
+                # Callers still hold query views; the mapping goes with them
+                pass
+            os.close(self._fd)
@@ -0,0 +1,179 @@
+"""Signal-over-time chart renderer (cairo only, no GTK widgets).
+
+Every series is a MinMaxPyramid drawn through a ColumnDecimator (see
+pyramid.py): each pixel column becomes at most four line vertices, its
+first, lowest, highest and last sample, so a frame costs the same for a
+minute of history as for weeks of it, and looks the same as drawing
+every sample. Samples further apart than MAX_GAP are not joined.
+"""
+import gettext
+import math
+import time
+
+import cairo
+
+from wifi_analyzer.chart import COLORS, DBM_MAX, DBM_MIN
+from wifi_analyzer.pyramid import ColumnDecimator
+
+_ = gettext.gettext
+
+SPAN = 3600.0                # seconds shown at first
+SPAN_MIN = 60.0
+SPAN_MAX = 90 * 86400.0
+MAX_GAP = 60.0               # seconds between samples that still get a line
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 50, 20, 20, 30
+TICK_PX = 100                # rough spacing of time labels
+TICK_STEPS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200,
+              10800, 21600, 43200, 86400, 172800, 604800)
+
+
+class SignalHistoryRenderer:
+    """Draws dBm over time for a set of series onto a cairo context.
+
+    The view is *span* seconds wide and ends at *end*, or at the newest
+    sample while *end* is None (following live data).
+    """
+
+    def __init__(self):
+        self.series = {}  # key -> (decimator, label, color)
+        self.span = SPAN
+        self.end = None
+
+    def set_series(self, items):
+        """Show *items*, a list of ``(key, pyramid, label)``; colours follow their order."""
+        old = self.series
+        self.series = {}
+        for i, (key, pyramid, label) in enumerate(items):
+            dec = old[key][0] if key in old and old[key][0].pyramid is pyramid \
+                else ColumnDecimator(pyramid)
+            self.series[key] = (dec, label, COLORS[i % len(COLORS)])
+
+    def latest(self):
+        ends = [dec.pyramid.ts[-1] for dec, _l, _c in self.series.values() if len(dec.pyramid)]
+        return max(ends) if ends else time.time()
+
+    def view(self):
+        end = self.latest() if self.end is None else self.end
+        return end - self.span, end
+
+    def zoom(self, factor, anchor=1.0):
+        """Scale the span by *factor*, keeping the point at *anchor* (0..1 across) in place."""
+        t0, t1 = self.view()
+        span = min(max(self.span * factor, SPAN_MIN), SPAN_MAX)
+        at = t0 + anchor * self.span
+        end = at + (1 - anchor) * span
+        self.span = span
+        self.end = None if self.end is None and anchor >= 1.0 else end
+        self._clamp()
+
+    def pan(self, seconds):
+        """Move the view by *seconds* (positive is later)."""
+        self.end = self.view()[1] + seconds
+        self._clamp()
+
+    def follow(self):
+        self.end = None
+        self.span = SPAN
+
+    def _clamp(self):
+        # Reaching the newest sample resumes following it
+        if self.end is not None and self.end >= self.latest():
+            self.end = None
+
+    def plot_fraction(self, x, width):
+        """Where widget coordinate *x* falls across the plot, 0 to 1."""
+        plot_w = width - MARGIN_LEFT - MARGIN_RIGHT
+        return min(max((x - MARGIN_LEFT) / plot_w, 0.0), 1.0) if plot_w > 0 else 1.0
+
+    def seconds_per_px(self, width):
+        return self.span / max(width - MARGIN_LEFT - MARGIN_RIGHT, 1)
+
+    def _draw_axes(self, cr, width, height, t0, t1):
+        cr.set_source_rgb(0.15, 0.15, 0.18)
+        cr.paint()
+        plot_w = width - MARGIN_LEFT - MARGIN_RIGHT
+        plot_h = height - MARGIN_TOP - MARGIN_BOTTOM
+        base_y = MARGIN_TOP + plot_h
+        cr.set_line_width(0.5)
+        cr.set_font_size(10)
+        for dbm in range(DBM_MIN, DBM_MAX + 1, 10):
+            y = base_y - (dbm - DBM_MIN) / (DBM_MAX - DBM_MIN) * plot_h
+            cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
+            cr.move_to(MARGIN_LEFT, y); cr.line_to(width - MARGIN_RIGHT, y)
+            cr.stroke()
+            cr.set_source_rgb(0.6, 0.6, 0.6)
+            cr.move_to(5, y + 4)
+            cr.show_text(str(dbm))
+        wanted = (t1 - t0) * TICK_PX / plot_w
+        step = next((s for s in TICK_STEPS if s >= wanted), TICK_STEPS[-1])
+        fmt = "%H:%M:%S" if step < 60 else "%H:%M" if step < 86400 else "%d %b"
+        t = math.ceil(t0 / step) * step
+        while t <= t1:
+            x = MARGIN_LEFT + (t - t0) / (t1 - t0) * plot_w
+            cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
+            cr.move_to(x, MARGIN_TOP); cr.line_to(x, base_y)
+            cr.stroke()
+            cr.set_source_rgb(0.6, 0.6, 0.6)
+            cr.move_to(x - 14, height - MARGIN_BOTTOM + 15)
+            cr.show_text(time.strftime(fmt, time.localtime(t)))
+            t += step
+
+    def render(self, cr, width, height):
+        """Draw the chart; returns the number of columns drawn."""
+        t0, t1 = self.view()
+        self._draw_axes(cr, width, height, t0, t1)
+        plot_w = int(width - MARGIN_LEFT - MARGIN_RIGHT)
+        plot_h = height - MARGIN_TOP - MARGIN_BOTTOM
+        if plot_w <= 0 or plot_h <= 0:
+            return 0
+        if not self.series:
+            cr.set_source_rgb(0.6, 0.6, 0.6)
+            cr.move_to(width / 2 - 60, height / 2)
+            cr.show_text(_("No signal history yet"))
+            return 0
+
+        col_w = (t1 - t0) / plot_w
+        c0 = math.floor(t0 / col_w)
+        x0 = MARGIN_LEFT + (c0 * col_w - t0) / col_w + 0.5
+        y_scale = plot_h / (DBM_MAX - DBM_MIN)
+        base_y = MARGIN_TOP + plot_h
+        drawn = 0
+
+        cr.save()
+        cr.rectangle(MARGIN_LEFT, MARGIN_TOP, plot_w, plot_h)
+        cr.clip()
+        cr.set_line_width(1.5)
+        # Round caps keep lone samples visible as dots
+        cr.set_line_cap(cairo.LINE_CAP_ROUND)
+        cr.set_line_join(cairo.LINE_JOIN_ROUND)
+        for dec, _label, color in self.series.values():
+            prev_t = None
+            for i, col in enumerate(dec.columns(c0, c0 + plot_w + 2, col_w)):
+                if col is None:
+                    continue
+                first, lowest, highest, last, t_first, t_last = col
+                x = x0 + i
+                if prev_t is not None and t_first - prev_t <= MAX_GAP:
+                    cr.line_to(x, base_y - (first - DBM_MIN) * y_scale)
+                else:
+                    cr.move_to(x, base_y - (first - DBM_MIN) * y_scale)
+                if lowest != highest:
+                    cr.line_to(x, base_y - (lowest - DBM_MIN) * y_scale)
+                    cr.line_to(x, base_y - (highest - DBM_MIN) * y_scale)
+                cr.line_to(x, base_y - (last - DBM_MIN) * y_scale)
+                prev_t = t_last
+                drawn += 1
+            cr.set_source_rgba(*color, 0.9)
+            cr.stroke()
+        cr.restore()
+
+        # Legend
+        x = MARGIN_LEFT + 8
+        for _dec, label, color in self.series.values():
+            cr.set_source_rgb(*color)
+            cr.move_to(x, MARGIN_TOP + 12)
+            cr.show_text(label)
+            x += cr.text_extents(label).x_advance + 12
+            if x > width - MARGIN_RIGHT - 40:
+                break
+        return drawn
@@ -0,0 +1,192 @@
+"""Lightweight stage timings for the refresh cycle.
+
+Code marks a stage with ``with span("parse") as s: ...`` (optionally
+setting ``s.n`` to the number of rows handled). When recording is on,
+each span appends its monotonic start, duration, row count and thread
+to a fixed-size ring; when it is off, span() hands back one shared no-op
+object, so an instrumented call costs a function call and an attribute
+check.
+
+The ring can be summarized (p50/p95 per stage, time per row) or dumped
+as JSON or in the Chrome trace-event format, which chrome://tracing and
+Perfetto open directly.
+"""
+import json
+import os
+import threading
+import time
+from array import array
+
+RING_SIZE = 8192
+TRACE_ENV = "WIFI_ANALYZER_TRACE"
+# Whether spans record when nothing has asked for them
+TRACE_DEFAULT = bool(os.environ.get(TRACE_ENV))
+
+
+class _Span:
+    __slots__ = ("_recorder", "_stage", "_start", "n")
+
+    def __init__(self, recorder, stage, n):
+        self._recorder = recorder
+        self._stage = stage
+        self.n = n
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self._recorder.record(self._stage, self._start, end - self._start, self.n)
+
+
+class _NullSpan:
+    """Stand-in returned while recording is off; setting ``n`` is harmless."""
+
+    __slots__ = ("n",)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Recorder:
+    """Fixed-size ring of stage timings plus named counters."""
+
+    def __init__(self, size=RING_SIZE):
+        self.enabled = False
+        self.size = size
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._names = []
+        self._ids = {}
+        self._stage = array("H", bytes(2 * size))
+        self._start = array("d", bytes(8 * size))
+        self._dur = array("d", bytes(8 * size))
+        self._n = array("I", bytes(4 * size))
+        self._tid = array("Q", bytes(8 * size))
+        self._pos = 0  # total spans recorded; the ring holds the last `size`
+
+    def span(self, stage, n=0):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, n)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, stage, start, duration, n=0):
+        with self._lock:
+            sid = self._ids.get(stage)
+            if sid is None:
+                sid = self._ids[stage] = len(self._names)
+                self._names.append(stage)
+            i = self._pos % self.size
+            self._stage[i] = sid
+            self._start[i] = start
+            self._dur[i] = duration
+            self._n[i] = n
+            self._tid[i] = threading.get_ident()
+            self._pos += 1
+
+    def clear(self):
+        with self._lock:
+            self._pos = 0
+            self.counters.clear()
+
+    def events(self):
+        """Return ``[(stage, start, duration, n, thread), ...]`` oldest first."""
+        with self._lock:
+            count = min(self._pos, self.size)
+            first = self._pos - count
+            names = self._names
+            out = []
+            for k in range(first, self._pos):
+                i = k % self.size
+                out.append((names[self._stage[i]], self._start[i], self._dur[i],
+                            self._n[i], self._tid[i]))
+            return out
+
+    def stats(self):
+        """Return ``{stage: {count, p50, p95, max, rows, per_row, last_rows}}``.
+
+        Times are in seconds; ``per_row`` is total time over total rows
+        for stages that report row counts.
+        """
+        by_stage = {}
+        for stage, _start, dur, n, _tid in self.events():
+            by_stage.setdefault(stage, []).append((dur, n))
+        out = {}
+        for stage, rows in by_stage.items():
+            durs = sorted(d for d, _n in rows)
+            total_n = sum(n for _d, n in rows)
+            out[stage] = {
+                "count": len(durs),
+                "p50": durs[len(durs) // 2],
+                "p95": durs[min(len(durs) - 1, int(len(durs) * 0.95))],
+                "max": durs[-1],
+                "rows": total_n,
+                "per_row": sum(durs) / total_n if total_n else None,
+                "last_rows": rows[-1][1],
+            }
+        return out
+
+    def to_json(self):
+        return {
+            "stages": self.stats(),
+            "counters": dict(self.counters),
+            "events": [{"stage": s, "start": t, "duration": d, "n": n, "thread": tid}
+                       for s, t, d, n, tid in self.events()],
+        }
+
+    def to_chrome_trace(self):
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": s, "cat": "wifi-analyzer", "ph": "X", "ts": t * 1e6, "dur": d * 1e6,
+                 "pid": pid, "tid": tid, "args": {"n": n}}
+                for s, t, d, n, tid in self.events()],
+        }
+
+    def dump(self, path, fmt="chrome"):
+        """Write the ring to *path* as ``"chrome"`` trace events or plain ``"json"``."""
+        data = self.to_chrome_trace() if fmt == "chrome" else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+
+def _ms(seconds):
+    return f"{seconds * 1e3:.1f} ms"
+
+
+def format_summary(stats, counters=None):
+    """Short human-readable lines for the stats overlay and the CLI."""
+    lines = []
+    for stage, label in (("scan", "scan"), ("draw", "frame")):
+        st = stats.get(stage)
+        if st:
+            lines.append(f"{label:<6} p50 {_ms(st['p50'])}  p95 {_ms(st['p95'])}")
+    st = stats.get("parse")
+    if st and st["per_row"] is not None:
+        lines.append(f"parse  {st['per_row'] * 1e6:.2f} µs/row")
+    st = stats.get("apply")
+    if st:
+        lines.append(f"rows rebuilt {st['last_rows']} (last), {st['rows']} total")
+    for name, value in sorted((counters or {}).items()):
+        lines.append(f"{name} {value}")
+    return "\n".join(lines)
+
+
+recorder = Recorder()
+recorder.enabled = TRACE_DEFAULT
+span = recorder.span
+count = recorder.count
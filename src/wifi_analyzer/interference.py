@@ -0,0 +1,141 @@
+"""Channel interference scoring and channel recommendation.
+
+Every AP's transmit spectrum is modelled with the 802.11 OFDM spectral
+mask scaled to its channel width. The interference a 20 MHz channel
+receives from an AP is the AP's power (in mW) times the fraction of the
+mask that falls inside that channel. Those fractions only depend on the
+AP width and the center-frequency offset, so they are precomputed as
+kernels; APs are first summed per (center frequency, width) and each sum
+is spread over the candidate channels with its kernel. Cost is linear in
+the number of APs plus a small constant per occupied channel.
+"""
+import math
+
+from wifi_analyzer.channels import (
+    CHANNEL_FREQ_5, CHANNEL_FREQ_6, center_channel, channel_to_freq,
+)
+from wifi_analyzer.records import BAND_24, BAND_5, BAND_6
+
+# Candidate 20 MHz channels per band
+CANDIDATES = {
+    BAND_24: tuple(range(1, 14)),
+    BAND_5: tuple(sorted(CHANNEL_FREQ_5)),
+    BAND_6: tuple(ch for ch in sorted(CHANNEL_FREQ_6) if ch != 2),
+}
+# Channels recommended unless the caller passes its own: 2.4 GHz 12 and 13
+# and 5 GHz 169-177 (UNII-4) are not allowed in many regulatory domains,
+# and 1/6/11 are the only non-overlapping 2.4 GHz choices
+RECOMMENDED = {
+    BAND_24: (1, 6, 11),
+    BAND_5: tuple(ch for ch in CANDIDATES[BAND_5] if ch <= 165),
+    BAND_6: CANDIDATES[BAND_6],
+}
+RX_BANDWIDTH = 20  # MHz, the channel we would put our own AP on
+DSSS_WIDTH = 22    # 2.4 GHz 20 MHz channels are modelled with the DSSS width
+
+_kernels = {}
+
+
+def mask_dbr(offset, width):
+    """802.11 OFDM transmit mask in dBr at *offset* MHz, scaled to *width*."""
+    d = abs(offset)
+    half = width / 2
+    points = ((half - 1, 0.0), (half + 1, -20.0), (width, -28.0), (1.5 * width, -40.0))
+    if d <= points[0][0]:
+        return 0.0
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if d <= x1:
+            return y0 + (y1 - y0) * (d - x0) / (x1 - x0)
+    return None  # outside the mask
+
+
+def overlap(offset, width):
+    """Fraction of a *width* MHz AP's power inside a 20 MHz channel *offset* MHz away."""
+    reach = int(1.5 * width)
+    total = inside = 0.0
+    lo, hi = offset - RX_BANDWIDTH / 2, offset + RX_BANDWIDTH / 2
+    # Integrate the mask in 0.5 MHz steps
+    for step in range(-2 * reach, 2 * reach + 1):
+        d = step / 2
+        dbr = mask_dbr(d, width)
+        if dbr is None:
+            continue
+        p = 10 ** (dbr / 10)
+        total += p
+        if lo <= d <= hi:
+            inside += p
+    return inside / total if total else 0.0
+
+
+def kernel(width):
+    """Return ``{offset_mhz: fraction}`` for 5 MHz offsets an AP of *width* reaches."""
+    k = _kernels.get(width)
+    if k is None:
+        reach = int(1.5 * width + RX_BANDWIDTH / 2)
+        k = {}
+        for off in range(-reach // 5 * 5, reach + 1, 5):
+            frac = overlap(off, width)
+            if frac > 0:
+                k[off] = frac
+        _kernels[width] = k
+    return k
+
+
+def _ap_center(net, band):
+    """Center frequency and modelled width of an AP's whole channel block."""
+    width = net.width or 20
+    if band == BAND_24:
+        return net.freq, DSSS_WIDTH if width == 20 else width
+    center = center_channel(band, net.channel, width)
+    if not center:
+        return net.freq, 20
+    return channel_to_freq(band, center), width
+
+
+def interference_mw(networks, band):
+    """Return ``{channel: interference in mW}`` for every candidate channel of *band*."""
+    candidates = CANDIDATES[band]
+    power = {ch: 0.0 for ch in candidates}
+    freq_of = {channel_to_freq(band, ch): ch for ch in candidates}
+
+    # Sum APs sharing a center frequency and width in linear power
+    buckets = {}
+    for net in networks:
+        if net.band != band or not net.freq:
+            continue
+        key = _ap_center(net, band)
+        buckets[key] = buckets.get(key, 0.0) + 10 ** (net.dbm / 10)
+
+    for (fc, width), mw in buckets.items():
+        for off, frac in kernel(width).items():
+            ch = freq_of.get(fc + off)
+            if ch is not None:
+                power[ch] += mw * frac
+    return power
+
+
+def to_dbm(mw):
+    return 10 * math.log10(mw) if mw > 0 else float("-inf")
+
+
+def rank_channels(networks, band, channels=None):
+    """Return ``[(channel, interference_dbm), ...]``, least congested first.
+
+    Only *channels* are ranked, by default ``RECOMMENDED[band]``; pass
+    ``CANDIDATES[band]`` to rank every channel of the band.
+    """
+    power = interference_mw(networks, band)
+    if channels is None:
+        channels = RECOMMENDED[band]
+    ranked = sorted((power[ch], ch) for ch in channels if ch in power)
+    return [(ch, to_dbm(mw)) for mw, ch in ranked]
+
+
+def recommend(networks, bands=(BAND_24, BAND_5, BAND_6), channels=None):
+    """Return ``{band: [channels, least congested first]}`` for every band.
+
+    *channels* maps a band to the channels to rank (default RECOMMENDED).
+    """
+    channels = channels or {}
+    return {band: [ch for ch, _dbm in rank_channels(networks, band, channels.get(band))]
+            for band in bands}
@@ -0,0 +1,167 @@
+"""Parser for ``iw dev <if> scan dump`` output.
+
+``scan dump`` prints the kernel's cached nl80211 scan results, so unlike
+nmcli it gives real dBm, channel width, HT/VHT/HE capabilities and how
+long ago each BSS was heard. Like scanner.py this has no GTK (or asyncio)
+dependency and works on plain lines, so captured dumps can be parsed with
+no radio present.
+"""
+import gettext
+import re
+
+from wifi_analyzer.channels import band_for_freq, freq_to_channel
+from wifi_analyzer.records import Network
+
+_ = gettext.gettext
+
+_HEX_ESCAPE_RE = re.compile(r"\\x([0-9a-fA-F]{2})")
+# HE 6 GHz operation information / VHT operation channel width codes
+_HE_WIDTHS = {0: 20, 1: 40, 2: 80, 3: 160}
+_VHT_WIDTHS = {1: 80, 2: 160, 3: 160}
+# Sections whose nested lines are read; the rest are skipped unparsed
+_SECTIONS = frozenset(("RSN", "HT operation", "VHT operation", "HE Operation", "HE operation"))
+
+
+def dbm_to_pct(dbm):
+    """Signal quality in percent from dBm, the way NetworkManager computes it."""
+    dbm = min(max(dbm, -100), -40)
+    return 100 - int(100 * -(dbm + 40) / 60)
+
+
+def _unescape_ssid(ssid):
+    """Undo iw's ``\\xNN`` escaping and decode the raw bytes as UTF-8."""
+    if "\\x" not in ssid:
+        return ssid
+    raw = _HEX_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), ssid)
+    return raw.encode("latin-1", "replace").decode("utf-8", "replace")
+
+
+class _Bss:
+    """Fields of the BSS block being parsed."""
+
+    __slots__ = ("bssid", "freq", "dbm", "ssid", "last_seen_ms", "privacy", "wpa", "rsn",
+                 "auth", "ht", "vht", "he", "ht_width", "vht_width", "he_width")
+
+    def __init__(self, bssid):
+        self.bssid = bssid
+        self.freq = 0
+        self.dbm = -100
+        self.ssid = ""
+        self.last_seen_ms = None
+        self.privacy = self.wpa = self.rsn = False
+        self.auth = ""
+        self.ht = self.vht = self.he = False
+        self.ht_width = self.vht_width = self.he_width = 0
+
+    def network(self):
+        freq = self.freq
+        security = []
+        if self.wpa:
+            security.append("WPA1")
+        if self.rsn:
+            auth = self.auth
+            rsn = []
+            if "PSK" in auth or "802.1X" in auth or not auth:
+                rsn.append("WPA2")
+            if "SAE" in auth:
+                rsn.append("WPA3")
+            if "OWE" in auth or "00-0f-ac:18" in auth:
+                # Enhanced open (older iw prints the raw suite), which nmcli
+                # also reports as OWE
+                rsn.append("OWE")
+            if "802.1X" in auth:
+                rsn.append("802.1X")
+            # Other suites (FT-only, or unnamed by an older iw) are still RSN
+            security.extend(rsn or ["WPA2"])
+        elif not self.wpa and self.privacy:
+            security.append("WEP")
+        caps = " ".join(c for c, on in (("HT", self.ht), ("VHT", self.vht), ("HE", self.he)) if on)
+        width = self.he_width or self.vht_width or self.ht_width or 20
+        return Network(self.ssid or _("<Hidden>"), self.bssid, freq, freq_to_channel(freq),
+                       dbm_to_pct(self.dbm), self.dbm, " ".join(security), band_for_freq(freq),
+                       width, self.last_seen_ms, caps)
+
+
+def iter_iw(lines):
+    """Yield one Network per BSS block of ``iw dev <if> scan dump`` output.
+
+    A single pass over the lines: a ``BSS`` line starts a block, lines
+    with one leading tab are that block's fields and deeper lines belong
+    to the last field seen (RSN, HT operation, ...). Unknown or malformed
+    fields are skipped, so newer iw versions with extra fields still parse.
+    """
+    bss = None
+    section = ""
+    for line in lines:
+        if line[:1] == "\t":
+            if bss is None:
+                continue
+            if line[1:2] != "\t":
+                section, _sep, value = line[1:].partition(":")
+                _field(bss, section, value.strip())
+            elif section in _SECTIONS:
+                # Nested line, e.g. "\t\t * secondary channel offset: above"
+                key, _sep, value = line.strip().lstrip("* ").partition(":")
+                _section_field(bss, section, key, value.strip())
+        elif line.startswith("BSS "):
+            if bss is not None:
+                yield bss.network()
+            # "BSS 00:11:22:33:44:55(on wlan0) -- associated"
+            bss = _Bss(line[4:21].upper())
+            section = ""
+    if bss is not None:
+        yield bss.network()
+
+
+def _field(bss, key, value):
+    try:
+        if key == "freq":
+            bss.freq = int(float(value))
+        elif key == "signal":
+            # "-45.00 dBm"
+            bss.dbm = round(float(value.partition(" ")[0]))
+        elif key == "SSID":
+            bss.ssid = _unescape_ssid(value)
+        elif key == "last seen":
+            # Older iw: "20 ms ago"; newer also prints "1234.567s [boottime]"
+            if value.endswith("ms ago"):
+                bss.last_seen_ms = int(value.partition(" ")[0])
+        elif key == "capability":
+            bss.privacy = "Privacy" in value
+        elif key == "RSN":
+            bss.rsn = True
+            # The first item shares the line: "RSN:\t * Version: 1"
+            key, _sep, value = value.lstrip("* ").partition(":")
+            _section_field(bss, "RSN", key, value.strip())
+        elif key == "WPA":
+            bss.wpa = True
+        elif key.startswith("HT cap"):
+            bss.ht = True
+        elif key.startswith("VHT cap"):
+            bss.vht = True
+        elif key.startswith("HE cap"):
+            bss.he = True
+    except ValueError:
+        pass
+
+
+def _section_field(bss, section, key, value):
+    try:
+        if section == "RSN":
+            if key == "Authentication suites":
+                bss.auth = value.replace("IEEE 802.1X", "802.1X")
+        elif section == "HT operation":
+            if key == "secondary channel offset":
+                bss.ht_width = 20 if value.startswith("no") else 40
+        elif section == "VHT operation":
+            if key == "channel width":
+                # "1 (80 MHz)"; 0 means "use the HT width"
+                bss.vht_width = _VHT_WIDTHS.get(int(value.partition(" ")[0]), 0)
+            elif key == "center freq segment 2" and bss.vht_width == 80 and value not in ("", "0"):
+                # 160 MHz signalled the newer way, through segment 2
+                bss.vht_width = 160
+        elif section in ("HE Operation", "HE operation"):
+            if key == "Channel Width":
+                bss.he_width = _HE_WIDTHS.get(int(value.partition(" ")[0]), 0)
+    except ValueError:
+        pass
@@ -0,0 +1,181 @@
+"""Connected-link signal sampling from ``/proc/net/wireless`` without forking.
+
+The kernel keeps link quality, signal level and noise of the associated
+AP in ``/proc/net/wireless``::
+
+    Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE
+     face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22
+     wlan0: 0000   58.  -52.  -256        0      0      0      0     12        0
+
+:class:`LinkSampler` opens the file once and re-reads it from offset 0
+with ``preadv`` into a preallocated buffer, so a sample is one syscall
+and a short parse, cheap enough for 10-50 Hz where forking nmcli
+manages one sample every few seconds. Samples go into a fixed-size ring
+of arrays. *path* can point at any file in the same format, which is
+how it is tested and benchmarked.
+"""
+import math
+import os
+import time
+from array import array
+
+PROC_WIRELESS = "/proc/net/wireless"
+SAMPLE_RATE = 20         # Hz
+RING_SECONDS = 300       # history kept at the default rate
+READ_SIZE = 4096         # the whole file, even with many interfaces
+NOISE_UNKNOWN = -256     # what drivers report when they have no noise figure
+
+_HEADER_LINES = 2
+
+
+def _value(field):
+    """One quality field: ``58.`` (fresh) or ``58`` (not updated since last read)."""
+    return float(field.rstrip(b"."))
+
+
+def _level(value):
+    # Old drivers report dBm as an unsigned byte
+    return value - 256 if value > 0 else value
+
+
+def parse_wireless(data):
+    """Parse ``/proc/net/wireless`` contents into ``{ifname: (link, level, noise)}``.
+
+    *level* and *noise* are dBm; *noise* is NaN when the driver has none.
+    """
+    result = {}
+    for line in data.splitlines()[_HEADER_LINES:]:
+        name, sep, rest = line.partition(b":")
+        fields = rest.split()
+        if not sep or len(fields) < 4:
+            continue
+        noise = _level(_value(fields[3]))
+        result[name.strip().decode()] = (
+            _value(fields[1]), _level(_value(fields[2])),
+            math.nan if noise <= NOISE_UNKNOWN else noise)
+    return result
+
+
+def wireless_interfaces(path=PROC_WIRELESS):
+    """Names of the interfaces listed in *path* (empty if it is missing)."""
+    try:
+        with open(path, "rb") as f:
+            return list(parse_wireless(f.read()))
+    except OSError:
+        return []
+
+
+class LinkSampler:
+    """Samples one interface's link quality into a ring buffer.
+
+    ``sample()`` takes one reading and returns ``(link, level, noise)``,
+    or None while the interface is not listed (not associated, or
+    down). Not thread-safe; the GUI calls it from a main-loop timeout and
+    the CLI from its own loop. ``ifname`` defaults to the first
+    interface in the file.
+    """
+
+    def __init__(self, ifname=None, path=PROC_WIRELESS, capacity=SAMPLE_RATE * RING_SECONDS,
+                 clock=time.monotonic):
+        self.path = path
+        self.clock = clock
+        self.capacity = capacity
+        self.ts = array("d", bytes(8 * capacity))
+        self.link = array("f", bytes(4 * capacity))
+        self.level = array("f", bytes(4 * capacity))
+        self.noise = array("f", bytes(4 * capacity))
+        self.count = 0           # samples taken so far; the ring holds the last *capacity*
+        self.misses = 0          # reads that did not find the interface
+        self._buf = bytearray(READ_SIZE)
+        self._view = memoryview(self._buf)
+        self._fd = os.open(path, os.O_RDONLY)
+        if ifname is None:
+            names = list(parse_wireless(self._read()))
+            if not names:
+                self.close()
+                raise OSError(f"{path}: no wireless interface")
+            ifname = names[0]
+        self.ifname = ifname
+        self._key = ifname.encode() + b":"
+
+    def _read(self):
+        n = os.preadv(self._fd, [self._buf], 0)
+        return self._view[:n].tobytes()
+
+    def read(self):
+        """Return the current ``(link, level, noise)`` without recording it."""
+        n = os.preadv(self._fd, [self._buf], 0)
+        buf = self._buf
+        key = self._key
+        # The name is right-aligned after a newline; check it is not a suffix
+        i = buf.find(key, 0, n)
+        while i > 0 and buf[i - 1] not in b" \n":
+            i = buf.find(key, i + 1, n)
+        if i < 0:
+            return None
+        end = buf.find(b"\n", i, n)
+        fields = buf[i + len(key):end if end >= 0 else n].split(None, 4)
+        if len(fields) < 4:
+            return None
+        noise = _level(_value(fields[3]))
+        return (_value(fields[1]), _level(_value(fields[2])),
+                math.nan if noise <= NOISE_UNKNOWN else noise)
+
+    def sample(self):
+        """Take one reading and append it to the ring."""
+        reading = self.read()
+        if reading is None:
+            self.misses += 1
+            return None
+        i = self.count % self.capacity
+        self.ts[i] = self.clock()
+        self.link[i], self.level[i], self.noise[i] = reading
+        self.count += 1
+        return reading
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def latest(self):
+        """The last ``(ts, link, level, noise)`` recorded, or None."""
+        if not self.count:
+            return None
+        i = (self.count - 1) % self.capacity
+        return self.ts[i], self.link[i], self.level[i], self.noise[i]
+
+    def series(self, since=float("-inf")):
+        """Return ``(ts, link, level, noise)`` arrays of samples after *since*, oldest first."""
+        n = len(self)
+        start = self.count - n
+        # Samples are in time order, so binary search the ring by age
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ts[(start + mid) % self.capacity] <= since:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = (start + lo) % self.capacity
+        end = first + n - lo
+        if end <= self.capacity:
+            return tuple(arr[first:end] for arr in (self.ts, self.link, self.level, self.noise))
+        end -= self.capacity
+        return tuple(arr[first:] + arr[:end] for arr in (self.ts, self.link, self.level, self.noise))
+
+    def rate(self, window=2.0):
+        """Measured samples per second over the last *window* seconds."""
+        ts = self.series(self.clock() - window)[0]
+        if len(ts) < 2 or ts[-1] <= ts[0]:
+            return 0.0
+        return (len(ts) - 1) / (ts[-1] - ts[0])
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
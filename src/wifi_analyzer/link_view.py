@@ -0,0 +1,125 @@
+"""Live signal-over-time window for the connected link.
+
+Samples ``/proc/net/wireless`` (see link.py) from a main-loop timeout
+and plots signal level and noise of the last minute, for walk tests and
+watching roams happen. Each frame draws straight from the sampler's
+ring; nothing is copied beyond the visible window.
+"""
+import gettext
+import math
+
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw, GLib, Gtk
+
+from wifi_analyzer.chart import DBM_MAX, DBM_MIN
+from wifi_analyzer.instrument import span
+from wifi_analyzer.link import SAMPLE_RATE
+
+_ = gettext.gettext
+
+WINDOW = 60.0  # seconds shown
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 40, 10, 10, 24
+
+
+class LinkPlot(Gtk.DrawingArea):
+    """Level and noise of the sampler's last WINDOW seconds."""
+
+    def __init__(self, sampler):
+        super().__init__(hexpand=True, vexpand=True)
+        self.sampler = sampler
+        self.set_draw_func(self._draw)
+
+    def _draw(self, area, cr, width, height):
+        with span("draw-link") as s:
+            cr.set_source_rgb(0.15, 0.15, 0.18)
+            cr.paint()
+            plot_w = width - MARGIN_LEFT - MARGIN_RIGHT
+            plot_h = height - MARGIN_TOP - MARGIN_BOTTOM
+            if plot_w <= 0 or plot_h <= 0:
+                return
+            y_scale = plot_h / (DBM_MAX - DBM_MIN)
+            base_y = MARGIN_TOP + plot_h
+
+            cr.set_line_width(0.5)
+            cr.set_font_size(10)
+            for dbm in range(DBM_MIN, DBM_MAX + 1, 10):
+                y = base_y - (dbm - DBM_MIN) * y_scale
+                cr.set_source_rgba(0.4, 0.4, 0.4, 0.3)
+                cr.move_to(MARGIN_LEFT, y); cr.line_to(width - MARGIN_RIGHT, y)
+                cr.stroke()
+                cr.set_source_rgb(0.6, 0.6, 0.6)
+                cr.move_to(4, y + 4)
+                cr.show_text(str(dbm))
+            for sec in range(0, int(WINDOW) + 1, 10):
+                x = MARGIN_LEFT + plot_w * (1 - sec / WINDOW)
+                cr.move_to(x - 8, height - 6)
+                cr.show_text(f"-{sec}s" if sec else _("now"))
+
+            now = self.sampler.clock()
+            ts, _link, level, noise = self.sampler.series(now - WINDOW)
+            s.n = len(ts)
+            if not ts:
+                return
+            x_scale = plot_w / WINDOW
+            x0 = MARGIN_LEFT + plot_w - now * x_scale
+            cr.set_line_width(1.5)
+            for values, color in ((noise, (0.6, 0.6, 0.6)), (level, (0.2, 0.6, 1.0))):
+                cr.set_source_rgb(*color)
+                drawing = False
+                for t, v in zip(ts, values):
+                    if math.isnan(v):
+                        drawing = False
+                        continue
+                    y = base_y - (min(max(v, DBM_MIN), DBM_MAX) - DBM_MIN) * y_scale
+                    if drawing:
+                        cr.line_to(x0 + t * x_scale, y)
+                    else:
+                        cr.move_to(x0 + t * x_scale, y)
+                        drawing = True
+                cr.stroke()
+
+
+class LinkWindow(Adw.Window):
+    """Signal of the associated AP sampled at *rate* Hz."""
+
+    def __init__(self, parent, sampler, rate=SAMPLE_RATE):
+        super().__init__(title=_("Link Signal"), transient_for=parent,
+                         default_width=700, default_height=360)
+        self.sampler = sampler
+        header = Adw.HeaderBar()
+        header.set_title_widget(Adw.WindowTitle(title=_("Link Signal"), subtitle=sampler.ifname))
+        self.plot = LinkPlot(sampler)
+        self.status = Gtk.Label(xalign=0)
+        self.status.set_margin_start(12); self.status.set_margin_end(12)
+        self.status.set_margin_top(4); self.status.set_margin_bottom(4)
+        self.status.add_css_class("dim-label")
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        box.append(header)
+        box.append(self.plot)
+        box.append(self.status)
+        self.set_content(box)
+
+        self._source = GLib.timeout_add(max(1, round(1000 / rate)), self._tick)
+        self.connect("close-request", self._on_close_request)
+
+    def _on_close_request(self, win):
+        GLib.source_remove(self._source)
+        self.sampler.close()
+        return False
+
+    def _tick(self):
+        reading = self.sampler.sample()
+        if reading is None:
+            self.status.set_label(_("{ifname} is not connected").format(ifname=self.sampler.ifname))
+        else:
+            link, level, noise = reading
+            text = _("{level:.0f} dBm · link quality {link:.0f} · {rate:.0f} Hz").format(
+                level=level, link=link, rate=self.sampler.rate())
+            if not math.isnan(noise):
+                text += " · " + _("noise {noise:.0f} dBm").format(noise=noise)
+            self.status.set_label(text)
+        self.plot.queue_draw()
+        return GLib.SOURCE_CONTINUE
@@ -0,0 +1,247 @@
+"""AP vendor lookup from a memory-mapped IEEE OUI table.
+
+The IEEE registries assign 24-bit (MA-L), 28-bit (MA-M) and 36-bit
+(MA-S, and the older IAB) MAC prefixes. ``build_table()`` compiles their
+CSV files into one binary file with a sorted key array per prefix length
+and a pool of vendor names. :class:`OuiTable` maps that file and binary
+searches the key arrays in place, so opening it parses nothing and the
+data stays in the shared page cache instead of private memory. MA-M and
+MA-S blocks are carved out of a few MA-L blocks; the 24-bit prefixes of
+those are kept as a separate list so most lookups need one search in
+the MA-L keys and one in that short list.
+
+File layout (little endian)::
+
+    header   8s magic, I n24, I n28, I n36, I nparents, I pool size
+    keys     I prefix[n24], I parent[nparents], I prefix[n28],
+             (padded to 8) Q prefix[n36]
+    names    I pool offset[n24 + n28 + n36]
+    pool     per name: B length, UTF-8 bytes
+
+The table is looked for in ``$WIFI_ANALYZER_OUI``, next to this module
+(where the build puts it, see setup.py), and in the cache directory,
+where it is compiled once from the distribution's ieee-data CSVs if they
+exist. Build one by hand with::
+
+    python -m wifi_analyzer.oui oui.csv mam.csv oui36.csv -o oui.bin
+"""
+import csv
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"WAOUI002"
+_HEADER = struct.Struct("<8sIIIII")
+
+TABLE_NAME = "oui.bin"
+TABLE_ENV = "WIFI_ANALYZER_OUI"
+IEEE_DATA_DIRS = ("/usr/share/ieee-data",)
+IEEE_CSV_NAMES = ("oui.csv", "mam.csv", "oui36.csv", "iab.csv")
+LOCAL_BIT = 0x02 << 40  # locally administered (often randomized) address
+
+_BITS = {"MA-L": 24, "MA-M": 28, "MA-S": 36, "IAB": 36}
+_DIGITS_BITS = {6: 24, 7: 28, 9: 36}
+
+
+def _read_registry(path):
+    """Yield ``(bits, prefix, name)`` from one IEEE registry CSV."""
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) < 3 or row[0] == "Registry":
+                continue
+            digits = row[1].strip()
+            bits = _BITS.get(row[0].strip(), _DIGITS_BITS.get(len(digits)))
+            try:
+                prefix = int(digits, 16)
+            except ValueError:
+                continue
+            if bits is not None and len(digits) * 4 == bits:
+                yield bits, prefix, " ".join(row[2].split())
+
+
+def build_table(csv_paths, path):
+    """Compile IEEE registry CSVs into a table file at *path*; returns the entry count."""
+    entries = {24: {}, 28: {}, 36: {}}
+    for csv_path in csv_paths:
+        for bits, prefix, name in _read_registry(csv_path):
+            entries[bits][prefix] = name
+    pool = bytearray()
+    offsets = {}
+    keys = []
+    names = array("I")
+    for bits in (24, 28, 36):
+        sorted_keys = sorted(entries[bits])
+        keys.append(sorted_keys)
+        for prefix in sorted_keys:
+            name = entries[bits][prefix]
+            offset = offsets.get(name)
+            if offset is None:
+                raw = name.encode()[:255]
+                offset = offsets[name] = len(pool)
+                pool.append(len(raw))
+                pool += raw
+            names.append(offset)
+    k24, k28, k36 = keys
+    parents = sorted({k >> 4 for k in k28} | {k >> 12 for k in k36})
+    body = array("I", k24 + parents + k28).tobytes()
+    body += bytes(-(len(body) + _HEADER.size) % 8)
+    body += array("Q", k36).tobytes() + names.tobytes() + pool
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(k24), len(k28), len(k36), len(parents), len(pool)))
+        f.write(body)
+    os.replace(tmp, path)
+    return len(names)
+
+
+class OuiTable:
+    """Vendor names by BSSID, read straight from a mapped table file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n24, n28, n36, nparents, pool_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path}: not an OUI table")
+        view = memoryview(self._map)
+        off = _HEADER.size
+        self._keys24 = view[off:off + 4 * n24].cast("I")
+        off += 4 * n24
+        self._parents = view[off:off + 4 * nparents].cast("I")
+        off += 4 * nparents
+        keys28 = view[off:off + 4 * n28].cast("I")
+        off += 4 * n28
+        off += -off % 8
+        keys36 = view[off:off + 8 * n36].cast("Q")
+        off += 8 * n36
+        self._names = view[off:off + 4 * (n24 + n28 + n36)].cast("I")
+        off += 4 * (n24 + n28 + n36)
+        self._pool = view[off:off + pool_size]
+        # Under a parent prefix, longest first: (keys, shift, index of the first name)
+        self._sections = ((keys36, 12, n24 + n28), (keys28, 20, n24))
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self._names)
+
+    def lookup(self, mac):
+        """Vendor of the 48-bit integer *mac*, or None if unassigned or local."""
+        if mac & LOCAL_BIT:
+            return None
+        oui = mac >> 24
+        parents = self._parents
+        i = bisect_left(parents, oui)
+        if i < len(parents) and parents[i] == oui:
+            for keys, shift, base in self._sections:
+                prefix = mac >> shift
+                i = bisect_left(keys, prefix)
+                if i < len(keys) and keys[i] == prefix:
+                    return self._name(self._names[base + i])
+        keys = self._keys24
+        i = bisect_left(keys, oui)
+        if i < len(keys) and keys[i] == oui:
+            return self._name(self._names[i])
+        return None
+
+    def _name(self, offset):
+        name = self._decoded.get(offset)
+        if name is None:
+            n = self._pool[offset]
+            name = self._decoded[offset] = bytes(self._pool[offset + 1:offset + 1 + n]).decode(
+                errors="replace")
+        return name
+
+    def close(self):
+        for keys, _shift, _base in self._sections:
+            keys.release()
+        self._keys24.release()
+        self._parents.release()
+        self._names.release()
+        self._pool.release()
+        self._sections = ()
+        self._map.close()
+
+
+def _cache_path():
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(xdg, "wifi-analyzer", TABLE_NAME)
+
+
+def registry_csvs(dirs=IEEE_DATA_DIRS):
+    """Registry CSVs in the first of *dirs* that has any (an empty list if none does)."""
+    for d in dirs:
+        paths = [os.path.join(d, n) for n in IEEE_CSV_NAMES if os.path.exists(os.path.join(d, n))]
+        if paths:
+            return paths
+    return []
+
+
+def find_table():
+    """Path of the OUI table to use, compiling one from system CSVs if needed; or None."""
+    path = os.environ.get(TABLE_ENV)
+    if path:
+        return path if os.path.exists(path) else None
+    path = os.path.join(os.path.dirname(__file__), TABLE_NAME)
+    if os.path.exists(path):
+        return path
+    path = _cache_path()
+    sources = registry_csvs()
+    try:
+        if sources and (not os.path.exists(path) or os.path.getmtime(path) < max(
+                os.path.getmtime(p) for p in sources)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            build_table(sources, path)
+    except OSError:
+        return None
+    return path if os.path.exists(path) else None
+
+
+_table = None
+_opened = False
+_open_lock = threading.Lock()
+
+
+def _open_default():
+    global _table, _opened
+    with _open_lock:
+        if _opened:
+            return
+        path = find_table()
+        if path is not None:
+            try:
+                _table = OuiTable(path)
+            except (OSError, ValueError):
+                _table = None
+        # Only now, so other threads wait for the table instead of seeing None
+        _opened = True
+
+
+def vendor(mac):
+    """Vendor of *mac* from the default table (None if there is no table)."""
+    if not _opened:
+        _open_default()
+    return _table.lookup(mac) if _table is not None else None
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="python -m wifi_analyzer.oui",
+        description="Compile IEEE MA-L/MA-M/MA-S registry CSVs into an OUI table.")
+    parser.add_argument("csv", nargs="+", help="registry CSV files (oui.csv, mam.csv, oui36.csv)")
+    parser.add_argument("-o", "--output", default=TABLE_NAME, help=f"table file (default: {TABLE_NAME})")
+    args = parser.parse_args(argv)
+    count = build_table(args.csv, args.output)
+    print(f"{args.output}: {count} prefixes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
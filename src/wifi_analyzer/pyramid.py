@@ -0,0 +1,167 @@
+"""Min/max level-of-detail pyramid for plotting long signal series.
+
+A :class:`MinMaxPyramid` keeps the raw ``(ts, value)`` samples of one
+series plus levels of per-block minima and maxima: level 1 holds one
+entry per FANOUT samples, level 2 one per FANOUT level-1 blocks, and so
+on. The min/max of any index range is then assembled from at most
+``2 * FANOUT`` entries per level, so its cost depends on the logarithm
+of the range, not its length. Appending only rewrites the last block of
+each level.
+
+A :class:`ColumnDecimator` reduces a pyramid to one ``(first, min, max,
+last)`` tuple per pixel column, which is all a line chart needs to look
+the same as plotting every sample. Columns sit on a fixed time grid
+(column ``c`` covers ``[c * width, (c + 1) * width)``), so they can be
+cached: panning computes only the newly exposed columns and an append
+only invalidates the last one.
+"""
+from array import array
+from bisect import bisect_left
+
+FANOUT = 16
+CACHE_COLUMNS = 16384  # cached columns per decimator before starting over
+
+
+class MinMaxPyramid:
+    """Samples of one series with block min/max levels; timestamps must not decrease."""
+
+    def __init__(self, fanout=FANOUT):
+        self.fanout = fanout
+        self.ts = array("d")
+        self.values = array("f")
+        self.levels = []  # [(mins, maxs)] for blocks of fanout**1, fanout**2, ...
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, ts, value):
+        i = len(self.values)
+        self.ts.append(ts)
+        self.values.append(value)
+        value = self.values[-1]  # as stored, so comparisons match
+        fanout = self.fanout
+        for mins, maxs in self.levels:
+            i //= fanout
+            if i == len(mins):
+                mins.append(value)
+                maxs.append(value)
+            else:
+                if value < mins[i]:
+                    mins[i] = value
+                if value > maxs[i]:
+                    maxs[i] = value
+        top = self.levels[-1][0] if self.levels else self.values
+        if len(top) > fanout:
+            self._update(len(self.values) - 1)
+
+    def extend(self, ts, values):
+        """Append samples; *ts* and *values* are equal-length sequences."""
+        start = len(self.values)
+        self.ts.extend(ts)
+        self.values.extend(values)
+        self._update(start)
+
+    def _update(self, start):
+        """Recompute the blocks covering samples from *start* on, adding levels as needed."""
+        fanout = self.fanout
+        src_min = src_max = self.values
+        first = start  # first entry of the level below that changed
+        k = 0
+        while len(src_min) > fanout:
+            if k == len(self.levels):
+                # A new level covers everything below it, not just the tail
+                self.levels.append((array("f"), array("f")))
+                first = 0
+            mins, maxs = self.levels[k]
+            block = first // fanout
+            del mins[block:]
+            del maxs[block:]
+            n = len(src_min)
+            mins.extend([min(src_min[i:i + fanout]) for i in range(block * fanout, n, fanout)])
+            maxs.extend([max(src_max[i:i + fanout]) for i in range(block * fanout, n, fanout)])
+            src_min, src_max = mins, maxs
+            first = block
+            k += 1
+
+    def minmax(self, lo, hi):
+        """Return ``(min, max)`` of ``values[lo:hi]``; *lo* < *hi*."""
+        fanout = self.fanout
+        mins = maxs = self.values
+        levels = self.levels
+        lowest = float("inf")
+        highest = float("-inf")
+        k = 0
+        while hi - lo > 2 * fanout and k < len(levels):
+            # Take the unaligned ends here, the aligned middle one level up
+            a = -(-lo // fanout)
+            b = hi // fanout
+            if lo < a * fanout:
+                lowest = min(lowest, min(mins[lo:a * fanout]))
+                highest = max(highest, max(maxs[lo:a * fanout]))
+            if b * fanout < hi:
+                lowest = min(lowest, min(mins[b * fanout:hi]))
+                highest = max(highest, max(maxs[b * fanout:hi]))
+            lo, hi = a, b
+            mins, maxs = levels[k]
+            k += 1
+        if lo < hi:
+            lowest = min(lowest, min(mins[lo:hi]))
+            highest = max(highest, max(maxs[lo:hi]))
+        return lowest, highest
+
+
+class ColumnDecimator:
+    """Cached per-column ``(first, min, max, last, t_first, t_last)`` of a pyramid.
+
+    Empty columns are None. The cache is keyed by column width and kept
+    while the pyramid only grows at the end.
+    """
+
+    def __init__(self, pyramid):
+        self.pyramid = pyramid
+        self.width = None
+        self._cols = {}
+        self._seen = 0  # pyramid length the cache is valid for
+
+    def columns(self, c0, c1, width):
+        """Return the columns ``c0 <= c < c1`` of *width* seconds each.
+
+        Column c holds the samples with ``t // width == c``.
+        """
+        p = self.pyramid
+        cols = self._cols
+        if width != self.width or len(cols) > CACHE_COLUMNS:
+            cols.clear()
+            self.width = width
+            self._seen = len(p)
+        elif len(p) != self._seen:
+            # Only columns from the first new sample on can have changed
+            stale = int(p.ts[self._seen] // width) if self._seen < len(p) else None
+            if stale is None:
+                cols.clear()
+            else:
+                for c in [c for c in cols if c >= stale]:
+                    del cols[c]
+            self._seen = len(p)
+        ts, values = p.ts, p.values
+        # A sample's column is t // width; comparing against c * width
+        # instead puts some samples on a boundary in the wrong column
+        key = lambda t: t // width  # noqa: E731
+        out = []
+        hi = None
+        for c in range(c0, c1):
+            col = cols.get(c, False)
+            if col is False:
+                # Consecutive misses share a boundary, so one bisect each
+                lo = hi if hi is not None else bisect_left(ts, c, key=key)
+                hi = bisect_left(ts, c + 1, lo, key=key)
+                if lo == hi:
+                    col = None
+                else:
+                    lowest, highest = p.minmax(lo, hi)
+                    col = (values[lo], lowest, highest, values[hi - 1], ts[lo], ts[hi - 1])
+                cols[c] = col
+            else:
+                hi = None
+            out.append(col)
+        return out
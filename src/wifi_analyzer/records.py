@@ -0,0 +1,221 @@
+"""Compact network records: a slotted per-BSS record and a columnar scan.
+
+Records avoid per-scan string churn: the BSSID is kept as a 48-bit
+integer, SSID and security strings go through a shared symbol table so
+every scan of a site reuses the same string objects, and the band is a
+small :class:`Band` enum. Filtering, grouping and joining scans compare
+integers and shared objects instead of equal-but-distinct strings.
+"""
+import enum
+from array import array
+from itertools import compress
+
+SYMBOLS_MAX = 65536  # distinct strings kept by each symbol table
+
+
+class Band(enum.IntEnum):
+    """Wi-Fi band as a small integer; ``str()`` gives its label ("5 GHz")."""
+
+    NONE = 0
+    GHZ_24 = 1
+    GHZ_5 = 2
+    GHZ_6 = 3
+
+    @property
+    def label(self):
+        return _BAND_LABELS[self]
+
+    def __str__(self):
+        return _BAND_LABELS[self]
+
+    def __format__(self, spec):
+        return format(_BAND_LABELS[self], spec)
+
+    @classmethod
+    def parse(cls, value):
+        """Return the Band for a Band, a code or a label ("" and unknown give NONE)."""
+        if isinstance(value, str):
+            return _BAND_BY_LABEL.get(value, cls.NONE)
+        return cls(value or 0)
+
+
+_BAND_LABELS = {Band.NONE: "", Band.GHZ_24: "2.4 GHz", Band.GHZ_5: "5 GHz", Band.GHZ_6: "6 GHz"}
+_BAND_BY_LABEL = {label: band for band, label in _BAND_LABELS.items()}
+
+BAND_24 = Band.GHZ_24
+BAND_5 = Band.GHZ_5
+BAND_6 = Band.GHZ_6
+
+
+class SymbolTable:
+    """Bounded cache mapping keys to one shared value each.
+
+    ``get(key)`` returns the value stored for *key*, computing it with
+    *factory* (by default the key itself, which makes this an intern
+    table) on a miss. Entries live in two generations: lookups hit the
+    young one, a hit in the old one moves the entry back to the young
+    one, and once the young generation holds *maxsize* / 2 entries the
+    old one is dropped. Recently used entries therefore survive like in
+    an LRU, without reordering anything on the common hit path, and
+    memory stays bounded when SSIDs or randomized BSSIDs keep changing.
+    """
+
+    def __init__(self, factory=None, maxsize=SYMBOLS_MAX):
+        self.factory = factory
+        self.maxsize = maxsize
+        self._young = {}
+        self._old = {}
+
+    def __len__(self):
+        return len(self._young) + len(self._old)
+
+    def get(self, key):
+        value = self._young.get(key)
+        if value is not None:
+            return value
+        value = self._old.pop(key, None)
+        if value is None:
+            value = key if self.factory is None else self.factory(key)
+        young = self._young
+        if len(young) >= self.maxsize // 2:
+            self._old = young
+            young = self._young = {}
+        young[key] = value
+        return value
+
+    def clear(self):
+        self._young.clear()
+        self._old.clear()
+
+
+class Network:
+    """One BSS as seen in a single scan.
+
+    *bssid* may be given as "AA:BB:CC:DD:EE:FF" or as its 48-bit integer,
+    which is what is stored (``mac``, 0 if missing or malformed); the
+    ``bssid`` attribute formats it back. *band* may be a Band or a label.
+    *width* is the channel width in MHz (20 when the backend cannot tell),
+    *last_seen_ms* how long ago the BSS was last heard (None if unknown)
+    and *caps* a space-separated list of PHY capabilities ("HT VHT HE").
+    """
+
+    __slots__ = ("ssid", "mac", "freq", "channel", "signal_pct", "dbm", "security", "band",
+                 "width", "last_seen_ms", "caps")
+    # Public field names, in constructor order
+    FIELDS = ("ssid", "bssid", "freq", "channel", "signal_pct", "dbm", "security", "band",
+              "width", "last_seen_ms", "caps")
+
+    def __init__(self, ssid, bssid, freq, channel, signal_pct, dbm, security, band,
+                 width=20, last_seen_ms=None, caps=""):
+        self.ssid = _intern(ssid)
+        self.mac = bssid if type(bssid) is int else _mac_of(bssid)
+        self.freq = freq
+        self.channel = channel
+        self.signal_pct = signal_pct
+        self.dbm = dbm
+        self.security = _intern(security)
+        self.band = band if type(band) is Band else Band.parse(band)
+        self.width = width
+        self.last_seen_ms = last_seen_ms
+        self.caps = _intern(caps)
+
+    @property
+    def bssid(self):
+        return _bssid_of(self.mac) if self.mac else ""
+
+    def __repr__(self):
+        return f"Network({self.ssid!r}, {self.bssid!r}, ch {self.channel}, {self.dbm} dBm)"
+
+    def as_dict(self):
+        """Return the record as a plain dict (for JSON export and the like)."""
+        out = {name: getattr(self, name) for name in self.FIELDS}
+        out["band"] = str(self.band)
+        return out
+
+
+class ScanFrame:
+    """A whole scan stored as parallel typed arrays.
+
+    Numeric columns (BSSIDs as 48-bit integers, bands as codes) are
+    ``array`` objects; SSID and security columns hold the records' shared
+    symbol-table strings. Filtering and sorting return index arrays
+    instead of new records.
+    """
+
+    __slots__ = ("ssid", "bssid", "security", "band", "freq", "channel", "signal_pct", "dbm",
+                 "width")
+
+    def __init__(self):
+        self.ssid = []
+        self.bssid = array("Q")
+        self.security = []
+        self.band = array("b")
+        self.freq = array("i")
+        self.channel = array("h")
+        self.signal_pct = array("b")
+        self.dbm = array("h")
+        self.width = array("h")
+
+    @classmethod
+    def from_networks(cls, networks):
+        frame = cls()
+        for net in networks:
+            frame.append(net)
+        return frame
+
+    def append(self, net):
+        self.ssid.append(net.ssid)
+        self.bssid.append(net.mac)
+        self.security.append(net.security)
+        self.band.append(net.band)
+        self.freq.append(net.freq)
+        self.channel.append(net.channel)
+        self.signal_pct.append(net.signal_pct)
+        self.dbm.append(net.dbm)
+        self.width.append(net.width)
+
+    def __len__(self):
+        return len(self.freq)
+
+    def __getitem__(self, i):
+        """Materialize row *i* as a Network."""
+        return Network(self.ssid[i], self.bssid[i], self.freq[i], self.channel[i],
+                       self.signal_pct[i], self.dbm[i], self.security[i],
+                       _BANDS[self.band[i]], self.width[i])
+
+    def band_indices(self, band):
+        """Return the row indices in *band* as an ``array('I')``."""
+        code = int(Band.parse(band))
+        return array("I", compress(range(len(self.band)), map(code.__eq__, self.band)))
+
+    def argsort(self, column="signal_pct", reverse=True, indices=None):
+        """Return row indices ordered by *column*, optionally within *indices*."""
+        col = getattr(self, column)
+        rows = range(len(self)) if indices is None else indices
+        return array("I", sorted(rows, key=col.__getitem__, reverse=reverse))
+
+    def networks(self, indices=None):
+        """Yield rows as Network records, in *indices* order if given."""
+        for i in range(len(self)) if indices is None else indices:
+            yield self[i]
+
+
+def bssid_to_int(bssid):
+    """Parse "AA:BB:CC:DD:EE:FF" into a 48-bit integer (0 if malformed)."""
+    try:
+        return int(bssid.replace(":", ""), 16) if len(bssid) == 17 else 0
+    except ValueError:
+        return 0
+
+
+def int_to_bssid(value):
+    """Format a 48-bit integer as "AA:BB:CC:DD:EE:FF"."""
+    h = f"{value:012X}"
+    return f"{h[0:2]}:{h[2:4]}:{h[4:6]}:{h[6:8]}:{h[8:10]}:{h[10:12]}"
+
+
+_BANDS = tuple(Band)
+SYMBOLS = SymbolTable()            # SSID, security and capability strings
+_intern = SYMBOLS.get
+_mac_of = SymbolTable(bssid_to_int).get
+_bssid_of = SymbolTable(int_to_bssid).get
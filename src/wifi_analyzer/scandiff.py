@@ -0,0 +1,78 @@
+"""Per-BSSID scan diffs and a replay backend.
+
+Kept apart from :mod:`wifi_analyzer.service` so the headless and replay
+paths can use them without importing asyncio.
+"""
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+SIGNAL_THRESHOLD = 5  # dB
+
+
+class ScanEvent:
+    """One BSSID that appeared, vanished or changed since the last scan.
+
+    *mac* is the BSSID as the 48-bit integer it is keyed by.
+    """
+
+    __slots__ = ("kind", "mac", "network", "previous")
+
+    def __init__(self, kind, mac, network, previous=None):
+        self.kind = kind
+        self.mac = mac
+        self.network = network
+        self.previous = previous
+
+    def __repr__(self):
+        return f"ScanEvent({self.kind}, {self.network.bssid})"
+
+
+def diff_scans(old, new, signal_threshold=SIGNAL_THRESHOLD):
+    """Compare two ``{mac: Network}`` snapshots (keyed by ``Network.mac``).
+
+    Returns ``(events, snapshot)``. A network counts as changed when its
+    dBm moved by at least *signal_threshold*, or its channel, security or
+    SSID differ. Smaller signal moves are not reported and the snapshot
+    keeps the last reported record, so slow drift is still caught once it
+    adds up.
+    """
+    events = []
+    snapshot = {}
+    for mac, net in new.items():
+        prev = old.get(mac)
+        if prev is None:
+            events.append(ScanEvent(ADDED, mac, net))
+        elif (abs(net.dbm - prev.dbm) >= signal_threshold or net.channel != prev.channel
+              or net.security != prev.security or net.ssid != prev.ssid):
+            events.append(ScanEvent(CHANGED, mac, net, prev))
+        else:
+            net = prev
+        snapshot[mac] = net
+    for mac, prev in old.items():
+        if mac not in new:
+            events.append(ScanEvent(REMOVED, mac, prev, prev))
+    return events, snapshot
+
+
+class ReplayBackend:
+    """Scan backend that returns recorded scans in order.
+
+    Each scan is an iterable of Network records. After the last scan the
+    backend either starts over (*loop*) or keeps returning the last one.
+    """
+
+    def __init__(self, scans, loop=False):
+        self._scans = [list(scan) for scan in scans]
+        self._loop = loop
+        self._pos = 0
+
+    def __call__(self):
+        if not self._scans:
+            return []
+        scan = self._scans[self._pos]
+        if self._pos + 1 < len(self._scans):
+            self._pos += 1
+        elif self._loop:
+            self._pos = 0
+        return scan
@@ -0,0 +1,306 @@
+"""Columnar binary scan-session files (``.wscan``).
+
+A session is a sequence of row groups. Every column of a row group is a
+raw little-endian array, aligned to 8 bytes, so a reader can memory-map
+the file and use the columns in place. The footer is JSON and describes
+the schema, the SSID/security dictionaries and, per row group, the
+offset, length and min/max of every column; readers use the statistics
+to skip row groups by time range or BSSID without touching their data.
+
+The writer rewrites the footer after every row group, and closes a row
+group after ROW_GROUP_ROWS rows or ROW_GROUP_SECONDS of scans, whichever
+comes first. A session that is killed therefore loses at most its last
+few minutes, and can still be read and appended to.
+
+File layout::
+
+    b"WSCAN001"
+    row group 0: column chunks, each padded to 8 bytes
+    row group 1: ...
+    footer (UTF-8 JSON), I footer length, b"WSCAN001"
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from wifi_analyzer.channels import band_for_freq
+from wifi_analyzer.records import Network, bssid_to_int
+
+MAGIC = b"WSCAN001"
+VERSION = 1
+ROW_GROUP_ROWS = 65536
+ROW_GROUP_SECONDS = 300.0
+_TRAILER = struct.Struct("<I8s")
+
+# name, array typecode; ssid and security are dictionary codes
+COLUMNS = (
+    ("ts", "d"),
+    ("bssid", "Q"),     # 48-bit MAC in a 64-bit lane, for alignment
+    ("freq", "i"),
+    ("channel", "h"),
+    ("dbm", "h"),
+    ("signal_pct", "b"),
+    ("ssid", "I"),
+    ("security", "I"),
+)
+DICTIONARY_COLUMNS = ("ssid", "security")
+_SWAP = sys.byteorder != "little"
+
+
+def _pad(n):
+    return -n % 8
+
+
+def _read_footer(buf, path):
+    """Return ``(footer, offset)`` of the JSON footer of a session in *buf*."""
+    size = len(buf)
+    if size < len(MAGIC) + _TRAILER.size or buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a scan session file")
+    footer_len, magic = _TRAILER.unpack_from(buf, size - _TRAILER.size)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: truncated scan session file")
+    start = size - _TRAILER.size - footer_len
+    return json.loads(buf[start:start + footer_len].decode("utf-8")), start
+
+
+class SessionWriter:
+    """Append scan rows to a session file, one row group at a time.
+
+    Rows must be appended in time order, which is what readers rely on
+    to trim row groups to a time range. With *append*, an existing
+    session at *path* is continued: its footer is read back and
+    rewritten after the new row groups. Otherwise the file is
+    overwritten.
+    """
+
+    def __init__(self, path, row_group_rows=ROW_GROUP_ROWS, append=False,
+                 row_group_seconds=ROW_GROUP_SECONDS):
+        self.path = path
+        self.row_group_rows = row_group_rows
+        self.row_group_seconds = row_group_seconds
+        self._groups = []
+        self._dicts = {name: {} for name in DICTIONARY_COLUMNS}
+        self._cols = None
+        self._f = None
+        if append:
+            try:
+                self._f = open(path, "r+b")
+            except FileNotFoundError:
+                pass
+        self._reset()
+        if self._f is not None and self._f.seek(0, 2):
+            self._continue()
+        else:
+            if self._f is None:
+                self._f = open(path, "wb")
+            self._f.write(MAGIC)
+            self._end = len(MAGIC)
+            self._write_footer()
+
+    def _continue(self):
+        """Pick up the row groups and dictionaries of the existing session."""
+        try:
+            with mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                footer, start = _read_footer(buf, self.path)
+        except ValueError:
+            self._f.close()
+            raise
+        if [(c["name"], c["type"]) for c in footer["columns"]] != list(COLUMNS):
+            self._f.close()
+            raise ValueError(f"{self.path}: session has a different schema")
+        self._groups = footer["row_groups"]
+        for name, values in footer["dictionaries"].items():
+            self._dicts[name] = {value: code for code, value in enumerate(values)}
+        # New row groups go where the footer is
+        self._end = start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset(self):
+        self._cols = {name: array(code) for name, code in COLUMNS}
+
+    def _code(self, column, value):
+        codes = self._dicts[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def append(self, ts, net):
+        cols = self._cols
+        cols["ts"].append(ts)
+        cols["bssid"].append(net.mac)
+        cols["freq"].append(net.freq)
+        cols["channel"].append(net.channel)
+        cols["dbm"].append(net.dbm)
+        cols["signal_pct"].append(net.signal_pct)
+        cols["ssid"].append(self._code("ssid", net.ssid))
+        cols["security"].append(self._code("security", net.security))
+        if len(cols["ts"]) >= self.row_group_rows or ts - cols["ts"][0] >= self.row_group_seconds:
+            self._flush_group()
+
+    def append_scan(self, ts, networks):
+        """Append every network of one scan taken at *ts*.
+
+        A scan is never split across row groups, so groups may run over
+        ``row_group_rows`` by less than one scan.
+        """
+        networks = list(networks)
+        if not networks:
+            return
+        cols = self._cols
+        code = self._code
+        cols["ts"].extend([ts] * len(networks))
+        cols["bssid"].extend([n.mac for n in networks])
+        cols["freq"].extend([n.freq for n in networks])
+        cols["channel"].extend([n.channel for n in networks])
+        cols["dbm"].extend([n.dbm for n in networks])
+        cols["signal_pct"].extend([n.signal_pct for n in networks])
+        cols["ssid"].extend([code("ssid", n.ssid) for n in networks])
+        cols["security"].extend([code("security", n.security) for n in networks])
+        if len(cols["ts"]) >= self.row_group_rows or ts - cols["ts"][0] >= self.row_group_seconds:
+            self._flush_group()
+
+    def _flush_group(self):
+        rows = len(self._cols["ts"])
+        if not rows:
+            return
+        meta = {"rows": rows, "columns": {}}
+        self._f.seek(self._end)
+        for name, _code in COLUMNS:
+            col = self._cols[name]
+            if _SWAP:
+                col.byteswap()
+            data = col.tobytes()
+            if _SWAP:
+                col.byteswap()
+            offset = self._f.tell()
+            self._f.write(data)
+            self._f.write(b"\0" * _pad(len(data)))
+            meta["columns"][name] = {"offset": offset, "length": len(data),
+                                     "min": min(col), "max": max(col)}
+        self._groups.append(meta)
+        self._end = self._f.tell()
+        self._reset()
+        self._write_footer()
+
+    def _write_footer(self):
+        """Write the footer after the last row group and sync the file."""
+        footer = {
+            "version": VERSION,
+            "columns": [{"name": name, "type": code} for name, code in COLUMNS],
+            "dictionaries": {name: list(codes) for name, codes in self._dicts.items()},
+            "row_groups": self._groups,
+        }
+        data = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+        self._f.seek(self._end)
+        self._f.write(data)
+        self._f.write(_TRAILER.pack(len(data), MAGIC))
+        self._f.truncate()
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        if self._f is None:
+            return
+        self._flush_group()
+        self._f.close()
+        self._f = None
+
+
+class SessionReader:
+    """Memory-mapped reader for session files."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        footer, _start = _read_footer(self._map, path)
+        self.version = footer["version"]
+        self.columns = {c["name"]: c["type"] for c in footer["columns"]}
+        self.dictionaries = footer["dictionaries"]
+        self.row_groups = footer["row_groups"]
+        self.num_rows = sum(g["rows"] for g in self.row_groups)
+        self._view = memoryview(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Column views handed out by column() are still alive
+            pass
+
+    def select(self, t0=None, t1=None, bssid=None):
+        """Return indices of row groups that may hold matching rows."""
+        key = bssid_to_int(bssid) if isinstance(bssid, str) else bssid
+        groups = []
+        for i, group in enumerate(self.row_groups):
+            ts = group["columns"]["ts"]
+            if t0 is not None and ts["max"] < t0:
+                continue
+            if t1 is not None and ts["min"] > t1:
+                continue
+            if key is not None:
+                b = group["columns"]["bssid"]
+                if not b["min"] <= key <= b["max"]:
+                    continue
+            groups.append(i)
+        return groups
+
+    def column(self, name, group):
+        """Return column *name* of row group *group* as a zero-copy memoryview."""
+        meta = self.row_groups[group]["columns"][name]
+        view = self._view[meta["offset"]:meta["offset"] + meta["length"]]
+        if _SWAP:
+            col = array(self.columns[name], view.tobytes())
+            col.byteswap()
+            return memoryview(col)
+        return view.cast(self.columns[name])
+
+    def read(self, columns=None, t0=None, t1=None, bssid=None):
+        """Read columns of the matching row groups into ``{name: array}``.
+
+        Row groups are skipped using their statistics and trimmed to the
+        [t0, t1] time range (rows are stored in time order); rows of other
+        BSSIDs inside a kept row group are not filtered out.
+        """
+        names = list(columns or self.columns)
+        out = {name: array(self.columns[name]) for name in names}
+        for g in self.select(t0, t1, bssid):
+            ts = self.column("ts", g)
+            lo = 0 if t0 is None else bisect_left(ts, t0)
+            hi = len(ts) if t1 is None else bisect_right(ts, t1)
+            for name in names:
+                out[name].frombytes(self.column(name, g)[lo:hi].cast("B"))
+        return out
+
+    def networks(self, t0=None, t1=None, bssid=None):
+        """Yield ``(ts, Network)`` for every row matching exactly."""
+        key = bssid_to_int(bssid) if isinstance(bssid, str) else bssid
+        ssids = self.dictionaries["ssid"]
+        securities = self.dictionaries["security"]
+        cols = self.read(t0=t0, t1=t1, bssid=key)
+        for i in range(len(cols["ts"])):
+            b = cols["bssid"][i]
+            if key is not None and b != key:
+                continue
+            freq = cols["freq"][i]
+            yield cols["ts"][i], Network(
+                ssids[cols["ssid"][i]], b, freq, cols["channel"][i],
+                cols["signal_pct"][i], cols["dbm"][i], securities[cols["security"][i]],
+                band_for_freq(freq))
@@ -0,0 +1,158 @@
+"""Scanning via nmcli with a streaming, single-pass parser.
+
+Nothing in here imports GTK, so it can be used headless and tested
+against captured ``nmcli -t`` output.
+"""
+import gettext
+import re
+import subprocess
+import threading
+import time
+
+from wifi_analyzer import instrument
+from wifi_analyzer.channels import band_for_freq, freq_to_channel
+from wifi_analyzer.records import Network
+
+_ = gettext.gettext
+
+# Fields without colons come first, so a line can be split with a bounded
+# str.split(); BSSID (always escaped, fixed width) and SSID share the rest.
+NMCLI_FIELDS = "FREQ,SIGNAL,CHAN,SECURITY,BSSID,SSID"
+NMCLI_ARGS = ["nmcli", "-t", "-f", NMCLI_FIELDS, "dev", "wifi", "list", "--rescan", "yes"]
+SCAN_TIMEOUT = 15
+
+# Length of an escaped BSSID, e.g. AA\:BB\:CC\:DD\:EE\:FF
+_BSSID_ESCAPED_LEN = 22
+_UNESCAPE_RE = re.compile(r"\\(.)")
+
+
+def unescape(field):
+    """Undo nmcli terse-mode escaping (backslash before ':' and '\\')."""
+    if "\\" not in field:
+        return field
+    return _UNESCAPE_RE.sub(r"\1", field)
+
+
+def split_fields(line, maxsplit=-1):
+    """Split a terse nmcli line on unescaped colons and unescape each field."""
+    fields = []
+    pending = None
+    pieces = line.split(":")
+    for piece in pieces:
+        if pending is not None:
+            piece = pending + ":" + piece
+            pending = None
+        if maxsplit >= 0 and len(fields) == maxsplit:
+            pending = piece
+            continue
+        if piece.endswith("\\") and (len(piece) - len(piece.rstrip("\\"))) % 2:
+            pending = piece
+            continue
+        fields.append(unescape(piece))
+    if pending is not None:
+        fields.append(unescape(pending))
+    return fields
+
+
+def parse_line(line):
+    """Parse one line of ``nmcli -t -f NMCLI_FIELDS`` output, or return None."""
+    parts = line.split(":", 4)
+    if len(parts) < 5:
+        return None
+    freq_s, signal_s, chan_s, security, rest = parts
+    if rest[_BSSID_ESCAPED_LEN:_BSSID_ESCAPED_LEN + 1] == ":":
+        bssid = rest[:_BSSID_ESCAPED_LEN].replace("\\", "")
+        ssid = rest[_BSSID_ESCAPED_LEN + 1:].rstrip("\r\n")
+        if "\\" in ssid:
+            ssid = _UNESCAPE_RE.sub(r"\1", ssid)
+    else:
+        tail = split_fields(rest.rstrip("\r\n"), 1)
+        bssid = tail[0]
+        ssid = tail[1] if len(tail) > 1 else ""
+    try:
+        # "2437 MHz"
+        freq = int(freq_s[:-4])
+    except ValueError:
+        try:
+            freq = int(freq_s.partition(" ")[0])
+        except ValueError:
+            freq = 0
+    try:
+        signal_pct = int(signal_s)
+    except ValueError:
+        signal_pct = 0
+    try:
+        channel = int(chan_s)
+    except ValueError:
+        channel = freq_to_channel(freq)
+    # Convert signal % to approximate dBm, same rounding as int(pct / 2 - 100)
+    dbm = (signal_pct + 1) // 2 - 100
+    return Network(ssid or _("<Hidden>"), bssid, freq, channel, signal_pct, dbm, security,
+                   band_for_freq(freq))
+
+
+def iter_nmcli(lines):
+    """Yield one network record per non-empty line of terse nmcli output."""
+    for line in lines:
+        net = parse_line(line)
+        if net is not None:
+            yield net
+
+
+def _timed_iter_nmcli(lines):
+    """iter_nmcli() that records the time spent in parse_line() as a "parse" span.
+
+    Lines arrive while nmcli is still scanning, so only the parsing is
+    timed, not the wait for the next line.
+    """
+    clock = time.perf_counter
+    first = clock()
+    busy = 0.0
+    n = 0
+    for line in lines:
+        start = clock()
+        net = parse_line(line)
+        busy += clock() - start
+        if net is not None:
+            n += 1
+            yield net
+    instrument.recorder.record("parse", first, busy, n)
+
+
+def stream_nmcli(args=None, timeout=SCAN_TIMEOUT):
+    """Run nmcli and yield networks as lines arrive on its stdout.
+
+    Raises subprocess.CalledProcessError if nmcli fails or is killed
+    after *timeout* seconds.
+    """
+    args = args or NMCLI_ARGS
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        if instrument.recorder.enabled:
+            yield from _timed_iter_nmcli(proc.stdout)
+        else:
+            yield from iter_nmcli(proc.stdout)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args)
+
+
+def scan_nmcli():
+    """Run one nmcli scan and return the list of networks."""
+    return list(stream_nmcli())
+
+
+def parse_nmcli():
+    """Parse nmcli dev wifi list output."""
+    try:
+        return scan_nmcli()
+    except Exception as e:
+        return [Network(f"Error: {e}", "", 0, 0, 0, -100, "", "")]
@@ -0,0 +1,197 @@
+"""Adaptive scan scheduling: cheap cached reads between occasional active rescans.
+
+An active rescan (``nmcli ... --rescan yes``, ``iw dev X scan``) sweeps
+every channel: it takes seconds and takes the radio off the station's
+own channel while it runs. A cached read (``--rescan no``, ``iw ... scan
+dump``) just returns what the driver last saw and costs milliseconds.
+
+:class:`AdaptiveScheduler` is a scan backend serving cached reads at a
+rate that backs off while the BSSID set is stable and snaps back to the
+fastest rate when BSSIDs appear or disappear. It rescans actively on a
+cadence that likewise stretches while stable, when churn shows up in the
+cached results (rate-limited), or when asked to. All timing goes through
+*clock*, and the decision and bookkeeping halves (:meth:`choose` and
+:meth:`observe`) need no event loop, so a fake clock and a fake scanner
+can drive it deterministically.
+"""
+import inspect
+import time
+from collections import deque
+
+from wifi_analyzer.instrument import span
+
+ACTIVE = "active"
+CACHED = "cached"
+
+CACHED_MIN = 2.0         # fastest cached read cadence, seconds
+CACHED_MAX = 15.0        # slowest, once nothing has changed for a while
+RESCAN_INTERVAL = 60.0   # active rescan cadence after churn
+RESCAN_MAX = 300.0       # and once stable
+RESCAN_MIN_GAP = 10.0    # churn never triggers rescans closer than this
+BACKOFF = 1.5            # interval growth per scan without churn
+CHURN_THRESHOLD = 1      # BSSIDs appearing or vanishing that count as churn
+DUTY_WINDOW = 600.0      # seconds over which the radio duty cycle is measured
+LATENCY_ALPHA = 0.2      # weight of the newest scan in the latency averages
+
+
+class AdaptiveScheduler:
+    """Scan backend choosing between an *active* and a *cached* source.
+
+    Both sources are callables returning a list of Network records, plain
+    or async. :meth:`next_delay` tells the caller when to scan next;
+    ScanService uses it in place of a fixed interval.
+    """
+
+    def __init__(self, active, cached, clock=time.monotonic, cached_min=CACHED_MIN,
+                 cached_max=CACHED_MAX, rescan_interval=RESCAN_INTERVAL, rescan_max=RESCAN_MAX,
+                 rescan_min_gap=RESCAN_MIN_GAP, backoff=BACKOFF, churn_threshold=CHURN_THRESHOLD):
+        self.active = active
+        self.cached = cached
+        self.clock = clock
+        self.cached_min = cached_min
+        self.cached_max = cached_max
+        self.rescan_interval = rescan_interval
+        self.rescan_max = rescan_max
+        self.rescan_min_gap = rescan_min_gap
+        self.backoff = backoff
+        self.churn_threshold = churn_threshold
+        self.cached_delay = cached_min
+        self.rescan_delay = rescan_interval
+        self.scans = 0
+        self.rescans = 0
+        self.last_churn = 0
+        self.latency = {ACTIVE: None, CACHED: None}
+        self._started = clock()
+        self._last_active = None      # clock time the last active rescan finished
+        self._last_try = None         # same, counting failed rescans
+        self._churn_pending = False
+        self._forced = False
+        self._macs = None
+        self._sweeps = deque()        # (start, duration) of recent active rescans
+
+    @property
+    def interval(self):
+        return self.cached_delay
+
+    def request_rescan(self):
+        """Make the next scan an active rescan (e.g. the user pressed Scan)."""
+        self._forced = True
+
+    def choose(self, now=None):
+        """Return ACTIVE or CACHED for a scan starting at *now*."""
+        now = self.clock() if now is None else now
+        if self._forced or self._last_try is None:
+            return ACTIVE
+        since = now - self._last_try
+        if self._churn_pending and since >= self.rescan_min_gap:
+            return ACTIVE
+        return ACTIVE if since >= self.rescan_delay else CACHED
+
+    def next_delay(self, now=None):
+        """Seconds until the next scan should start."""
+        now = self.clock() if now is None else now
+        if self._forced or self._last_try is None:
+            return 0.0
+        since = now - self._last_try
+        due = self.rescan_delay
+        if self._churn_pending:
+            due = min(due, self.rescan_min_gap)
+        return max(0.0, min(self.cached_delay, due - since))
+
+    def observe(self, kind, networks, started, finished):
+        """Account for a scan of *kind* that ran from *started* to *finished*."""
+        self.scans += 1
+        duration = finished - started
+        avg = self.latency[kind]
+        self.latency[kind] = duration if avg is None else avg + LATENCY_ALPHA * (duration - avg)
+        macs = {net.mac for net in networks}
+        churn = len(macs ^ self._macs) if self._macs is not None else 0
+        self._macs = macs
+        self.last_churn = churn
+        if kind == ACTIVE:
+            self.rescans += 1
+            self._last_active = self._last_try = finished
+            self._forced = self._churn_pending = False
+            self._sweeps.append((started, duration))
+        if churn >= self.churn_threshold:
+            self.cached_delay = self.cached_min
+            self.rescan_delay = self.rescan_interval
+            if kind == CACHED:
+                # Something changed since the last sweep; take a fresh one soon
+                self._churn_pending = True
+        else:
+            self.cached_delay = min(self.cached_delay * self.backoff, self.cached_max)
+            if kind == ACTIVE:
+                self.rescan_delay = min(self.rescan_delay * self.backoff, self.rescan_max)
+
+    async def __call__(self):
+        kind = self.choose()
+        started = self.clock()
+        try:
+            nets = await self._run(kind)
+        except Exception:
+            if kind == CACHED:
+                raise
+            # A refused or failed sweep (e.g. one already running) should not
+            # be retried at once; serve the cache and try again on schedule
+            self._last_try = self.clock()
+            self._forced = self._churn_pending = False
+            kind = CACHED
+            started = self.clock()
+            nets = await self._run(kind)
+        self.observe(kind, nets, started, self.clock())
+        return nets
+
+    async def _run(self, kind):
+        source = self.active if kind == ACTIVE else self.cached
+        with span("rescan" if kind == ACTIVE else "cached") as s:
+            nets = source()
+            if inspect.isawaitable(nets):
+                nets = await nets
+            s.n = len(nets)
+        return nets
+
+    def duty_cycle(self, now=None):
+        """Share of the last DUTY_WINDOW seconds spent in active rescans."""
+        now = self.clock() if now is None else now
+        sweeps = self._sweeps
+        while sweeps and sweeps[0][0] + sweeps[0][1] < now - DUTY_WINDOW:
+            sweeps.popleft()
+        span_ = min(DUTY_WINDOW, now - self._started)
+        if span_ <= 0:
+            return 0.0
+        busy = sum(min(d, start + d - (now - span_)) for start, d in sweeps)
+        return min(1.0, busy / span_)
+
+    def staleness(self, now=None):
+        """Seconds since the last active rescan finished (None before the first)."""
+        if self._last_active is None:
+            return None
+        now = self.clock() if now is None else now
+        return now - self._last_active
+
+    def metrics(self, now=None):
+        now = self.clock() if now is None else now
+        return {
+            "scans": self.scans,
+            "rescans": self.rescans,
+            "latency_active": self.latency[ACTIVE],
+            "latency_cached": self.latency[CACHED],
+            "staleness": self.staleness(now),
+            "duty_cycle": self.duty_cycle(now),
+            "cached_interval": self.cached_delay,
+            "rescan_interval": self.rescan_delay,
+            "churn": self.last_churn,
+        }
+
+
+def format_metrics(m):
+    """Short lines for the stats overlay and the CLI."""
+    def ms(v):
+        return "-" if v is None else f"{v * 1e3:.0f} ms"
+    stale = "-" if m["staleness"] is None else f"{m['staleness']:.0f} s"
+    return "\n".join((
+        f"rescan every {m['rescan_interval']:.0f} s, read every {m['cached_interval']:.1f} s",
+        f"latency rescan {ms(m['latency_active'])}, cached {ms(m['latency_cached'])}",
+        f"staleness {stale}, radio duty {m['duty_cycle'] * 100:.1f}%",
+    ))
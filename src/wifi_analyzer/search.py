@@ -0,0 +1,263 @@
+"""Indexed type-ahead search over the live network list.
+
+A query is whitespace-separated terms that must all match:
+
+    cafe            SSID contains "cafe", BSSID starts with it (if it is
+                    hex) or the vendor name contains it
+    ssid:guest      SSID contains "guest"
+    bssid:f0:9f     BSSID starts with f0:9f
+    vendor:ubiq     vendor name contains "ubiq"
+    sec:wpa3 open   security contains "wpa3"; "open" means no security
+    ch:1,6,11       on one of these channels
+    >-70 dbm:-70    at least -70 dBm
+
+:class:`NetworkIndex` keeps one index per kind of term and updates them
+as networks come and go, so a keystroke looks up candidates instead of
+testing every row. BSSIDs are 48-bit integers, so a hex prefix is an
+integer range found by bisecting a sorted array; SSIDs are found by
+trigrams of their distinct (interned) strings; dBm is bucketed.
+"""
+from array import array
+from bisect import bisect_left, insort
+
+GRAM = 3
+DBM_BUCKET = 5  # dB per signal bucket
+OPEN = "open"   # security token of networks without any
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _security_tokens(security):
+    return security.casefold().split() or [OPEN]
+
+
+def _bssid_range(prefix):
+    """``(lo, hi)`` integer range of BSSIDs starting with *prefix*, or None."""
+    digits = prefix.replace(":", "").replace("-", "").replace(".", "")
+    if not digits or len(digits) > 12:
+        return None
+    try:
+        value = int(digits, 16)
+    except ValueError:
+        return None
+    shift = 4 * (12 - len(digits))
+    return value << shift, (value + 1) << shift
+
+
+def parse_query(text):
+    """Split *text* into a tuple of ``(kind, arg)`` terms.
+
+    Terms with a malformed argument (``ch:x``, ``bssid:zz``) are dropped.
+    """
+    terms = []
+    for word in text.split():
+        kind, sep, arg = word.partition(":")
+        kind = kind.casefold()
+        if word.startswith(">"):
+            kind, arg = "dbm", word[1:].lstrip("=")
+        elif not sep or kind not in ("ssid", "bssid", "vendor", "sec", "ch", "channel", "dbm"):
+            kind, arg = ("sec", OPEN) if word.casefold() == OPEN else ("text", word)
+        if not arg:
+            continue
+        if kind in ("ch", "channel"):
+            try:
+                arg = frozenset(int(c) for c in arg.split(",") if c)
+            except ValueError:
+                continue
+            kind = "ch"
+        elif kind == "dbm":
+            try:
+                arg = int(arg)
+            except ValueError:
+                continue
+        elif kind == "bssid":
+            arg = _bssid_range(arg)
+            if arg is None:
+                continue
+        else:
+            arg = arg.casefold()
+        terms.append((kind, arg))
+    return tuple(terms)
+
+
+class NetworkIndex:
+    """Search indexes over a changing set of networks keyed by ``Network.mac``.
+
+    *vendor_of* maps a BSSID integer to a vendor name (or None); without
+    it vendor terms match nothing.
+    """
+
+    def __init__(self, vendor_of=None):
+        self.vendor_of = vendor_of
+        self.networks = {}
+        self._macs = array("Q")  # sorted
+        self._ssids = {}         # ssid -> set of macs
+        self._folded = {}        # ssid -> casefolded ssid
+        self._grams = {}         # trigram -> set of ssids
+        self._vendors = {}       # casefolded vendor -> set of macs
+        self._security = {}      # token -> set of macs
+        self._channels = {}      # channel -> set of macs
+        self._buckets = {}       # dbm // DBM_BUCKET -> set of macs
+
+    def __len__(self):
+        return len(self.networks)
+
+    # -- maintenance -----------------------------------------------------
+
+    def add(self, net):
+        """Index *net*, replacing any earlier record of the same BSSID."""
+        mac = net.mac
+        old = self.networks.get(mac)
+        if old is not None:
+            if old.ssid == net.ssid and old.security == net.security and old.channel == net.channel:
+                # Usually only the signal moved
+                bucket = net.dbm // DBM_BUCKET
+                if bucket != old.dbm // DBM_BUCKET:
+                    self._discard(self._buckets, old.dbm // DBM_BUCKET, mac)
+                    self._buckets.setdefault(bucket, set()).add(mac)
+                self.networks[mac] = net
+                return
+            self.remove(mac)
+        self.networks[mac] = net
+        insort(self._macs, mac)
+        keys = self._ssids.get(net.ssid)
+        if keys is None:
+            keys = self._ssids[net.ssid] = set()
+            folded = self._folded[net.ssid] = net.ssid.casefold()
+            for gram in _grams(folded):
+                self._grams.setdefault(gram, set()).add(net.ssid)
+        keys.add(mac)
+        for token in _security_tokens(net.security):
+            self._security.setdefault(token, set()).add(mac)
+        self._channels.setdefault(net.channel, set()).add(mac)
+        self._buckets.setdefault(net.dbm // DBM_BUCKET, set()).add(mac)
+        vendor = self.vendor_of(mac) if self.vendor_of is not None else None
+        if vendor:
+            self._vendors.setdefault(vendor.casefold(), set()).add(mac)
+
+    def remove(self, mac):
+        net = self.networks.pop(mac, None)
+        if net is None:
+            return
+        del self._macs[bisect_left(self._macs, mac)]
+        keys = self._ssids[net.ssid]
+        keys.discard(mac)
+        if not keys:
+            del self._ssids[net.ssid]
+            for gram in _grams(self._folded.pop(net.ssid)):
+                ssids = self._grams[gram]
+                ssids.discard(net.ssid)
+                if not ssids:
+                    del self._grams[gram]
+        for token in _security_tokens(net.security):
+            self._discard(self._security, token, mac)
+        self._discard(self._channels, net.channel, mac)
+        self._discard(self._buckets, net.dbm // DBM_BUCKET, mac)
+        vendor = self.vendor_of(mac) if self.vendor_of is not None else None
+        if vendor:
+            self._discard(self._vendors, vendor.casefold(), mac)
+
+    @staticmethod
+    def _discard(index, key, mac):
+        macs = index.get(key)
+        if macs is not None:
+            macs.discard(mac)
+            if not macs:
+                del index[key]
+
+    # -- lookups ---------------------------------------------------------
+
+    def _ssid_matches(self, text):
+        if len(text) >= GRAM:
+            grams = sorted((self._grams.get(g, ()) for g in _grams(text)), key=len)
+            candidates = set(grams[0]).intersection(*grams[1:])
+        else:
+            candidates = self._ssids
+        folded = self._folded
+        out = set()
+        for ssid in candidates:
+            if text in folded[ssid]:
+                out.update(self._ssids[ssid])
+        return out
+
+    def _bssid_matches(self, rng):
+        lo, hi = rng
+        macs = self._macs
+        return set(macs[bisect_left(macs, lo):bisect_left(macs, hi)])
+
+    @staticmethod
+    def _substring_matches(index, text):
+        out = set()
+        for name, macs in index.items():
+            if text in name:
+                out.update(macs)
+        return out
+
+    def _dbm_matches(self, floor):
+        out = set()
+        first = floor // DBM_BUCKET
+        for bucket, macs in self._buckets.items():
+            if bucket > first:
+                out.update(macs)
+            elif bucket == first:
+                out.update(m for m in macs if self.networks[m].dbm >= floor)
+        return out
+
+    def _term_matches(self, kind, arg):
+        if kind == "text":
+            out = self._ssid_matches(arg) | self._substring_matches(self._vendors, arg)
+            rng = _bssid_range(arg)
+            if rng is not None:
+                out |= self._bssid_matches(rng)
+            return out
+        if kind == "ssid":
+            return self._ssid_matches(arg)
+        if kind == "bssid":
+            return self._bssid_matches(arg)
+        if kind == "vendor":
+            return self._substring_matches(self._vendors, arg)
+        if kind == "sec":
+            return self._substring_matches(self._security, arg)
+        if kind == "ch":
+            return set().union(*(self._channels.get(c, ()) for c in arg))
+        return self._dbm_matches(arg)
+
+    def search(self, terms):
+        """Set of macs matching every term; None (everything) for no terms."""
+        if not terms:
+            return None
+        result = None
+        for kind, arg in terms:
+            found = self._term_matches(kind, arg)
+            result = found if result is None else result & found
+            if not result:
+                break
+        return result
+
+    def match(self, terms, net):
+        """Whether *net* matches every term, without the indexes."""
+        for kind, arg in terms:
+            if kind in ("text", "ssid"):
+                ok = arg in net.ssid.casefold()
+                if not ok and kind == "text":
+                    rng = _bssid_range(arg)
+                    ok = rng is not None and rng[0] <= net.mac < rng[1]
+                    if not ok and self.vendor_of is not None:
+                        vendor = self.vendor_of(net.mac)
+                        ok = bool(vendor) and arg in vendor.casefold()
+            elif kind == "bssid":
+                ok = arg[0] <= net.mac < arg[1]
+            elif kind == "vendor":
+                vendor = self.vendor_of(net.mac) if self.vendor_of is not None else None
+                ok = bool(vendor) and arg in vendor.casefold()
+            elif kind == "sec":
+                ok = any(arg in t for t in _security_tokens(net.security))
+            elif kind == "ch":
+                ok = net.channel in arg
+            else:
+                ok = net.dbm >= arg
+            if not ok:
+                return False
+        return True
@@ -0,0 +1,155 @@
+"""Long-running scan service that publishes only what changed between scans."""
+import asyncio
+import inspect
+import threading
+import time
+
+from wifi_analyzer.instrument import count, span
+from wifi_analyzer.scandiff import (  # noqa: F401 (re-exported)
+    ADDED, CHANGED, REMOVED, SIGNAL_THRESHOLD, ReplayBackend, ScanEvent, diff_scans,
+)
+from wifi_analyzer.scanner import scan_nmcli
+
+SCAN_INTERVAL = 10.0
+
+
+def _cancel_all(loop):
+    for task in asyncio.all_tasks(loop):
+        task.cancel()
+
+
+class ScanService:
+    """Scan on a schedule, keep the last snapshot and publish diffs.
+
+    *backend* is either a plain callable returning a list of Network
+    records (run in a worker thread) or an async one such as
+    :class:`~wifi_analyzer.aioscan.AsyncScanner`. It may raise, in which
+    case the error is kept in ``last_error`` and subscribers are notified
+    with an empty event list.
+
+    A backend with a ``next_delay()`` method (such as
+    :class:`~wifi_analyzer.scheduler.AdaptiveScheduler`) sets the time
+    between scans itself; otherwise scans are *interval* seconds apart.
+
+    The service runs its own asyncio loop in a background thread. Scan
+    subscribers are called from that thread. Event subscribers are called
+    through *dispatch* when one is given (the GUI passes
+    ``GLib.idle_add``, so they run on the main loop), otherwise from the
+    service thread too.
+    """
+
+    def __init__(self, backend=scan_nmcli, interval=SCAN_INTERVAL,
+                 signal_threshold=SIGNAL_THRESHOLD, dispatch=None):
+        self.backend = backend
+        self.interval = interval
+        self.signal_threshold = signal_threshold
+        self.dispatch = dispatch
+        self.snapshot = {}
+        self.last_error = None
+        self._subscribers = []
+        self._scan_subscribers = []
+        self._loop = None
+        self._wake = None
+
+    def subscribe(self, callback):
+        """Call ``callback(events)`` after every scan."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def subscribe_scans(self, callback):
+        """Call ``callback(timestamp, networks)`` with every full scan result."""
+        self._scan_subscribers.append(callback)
+        return callback
+
+    def unsubscribe_scans(self, callback):
+        self._scan_subscribers.remove(callback)
+
+    def poll(self):
+        """Run one scan now, in the calling thread, and publish its diff."""
+        return asyncio.run(self._poll())
+
+    async def _fetch(self):
+        backend = self.backend
+        if inspect.iscoroutinefunction(backend) or inspect.iscoroutinefunction(
+                getattr(backend, "__call__", None)):
+            return await backend()
+        return await asyncio.to_thread(backend)
+
+    async def _poll(self):
+        ts = time.time()
+        try:
+            with span("scan"):
+                nets = await self._fetch()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.last_error = e
+            count("scan errors")
+            events = []
+        else:
+            self.last_error = None
+            for callback in list(self._scan_subscribers):
+                callback(ts, nets)
+            with span("diff", len(nets)):
+                new = {net.mac: net for net in nets if net.mac}
+                events, self.snapshot = diff_scans(self.snapshot, new, self.signal_threshold)
+            count("events", len(events))
+        if self.dispatch is not None:
+            self.dispatch(self._notify, events)
+        else:
+            self._notify(events)
+        return events
+
+    def _notify(self, events):
+        for callback in list(self._subscribers):
+            callback(events)
+        return False  # one-shot when used as a GLib idle callback
+
+    def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._wake = asyncio.Event()
+        threading.Thread(target=self._run, args=(self._loop, self._wake), daemon=True).start()
+
+    def stop(self):
+        """Stop the service; a scan in flight is cancelled and its process killed."""
+        loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(_cancel_all, loop)
+
+    def scan_now(self):
+        """Ask for a scan; requests made while one is running coalesce into it."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _run(self, loop, wake):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._main(loop, wake))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Let cancelled scans kill and reap their processes
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    async def _main(self, loop, wake):
+        while self._loop is loop:
+            await self._poll()
+            # Clearing after the scan lets requests made during it share it
+            wake.clear()
+            # A scheduler (see scheduler.py) decides its own pace
+            next_delay = getattr(self.backend, "next_delay", None)
+            delay = next_delay() if next_delay is not None else self.interval
+            try:
+                await asyncio.wait_for(wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,375 @@
+"""Scan sources that need no Wi-Fi adapter: session replay and a synthetic environment.
+
+Both are plain scan backends (callables returning a list of Network
+records), so they plug into ScanService, the GUI and ``wifi-analyzer
+scan`` wherever nmcli would, and make dense sites reproducible for
+profiling and regression runs.
+
+:class:`SessionReplay` plays recorded scans back at their recorded pace,
+scaled by *speed* (0 plays them as fast as they are asked for).
+:class:`SyntheticEnvironment` invents a site of any size: APs spread over
+the bands and channels with configurable weights, signal following a
+mean-reverting random walk and a fraction of APs replaced every scan.
+"""
+import gettext
+import json
+import random
+import time
+
+from wifi_analyzer.channels import (
+    CENTER_CHANNELS, CHANNEL_FREQ_24, CHANNEL_FREQ_5, CHANNEL_FREQ_6,
+)
+from wifi_analyzer.iw import dbm_to_pct
+from wifi_analyzer.records import BAND_24, BAND_5, BAND_6, Network
+
+_ = gettext.gettext
+
+SIM_INTERVAL = 2.0
+
+# Share of APs per band and relative channel weights within each band;
+# 2.4 GHz crowds on 1/6/11, 6 GHz favours the preferred scanning channels
+BAND_WEIGHTS = {BAND_24: 0.45, BAND_5: 0.45, BAND_6: 0.10}
+CHANNEL_WEIGHTS = {
+    BAND_24: {ch: (6 if ch in (1, 6, 11) else 1) for ch in CHANNEL_FREQ_24 if ch != 14},
+    BAND_5: {ch: (1 if 52 <= ch <= 144 else 3) for ch in CHANNEL_FREQ_5 if ch <= 165},
+    BAND_6: {ch: (4 if ch % 16 == 5 else 1) for ch in CHANNEL_FREQ_6 if ch != 2},
+}
+_FREQS = {BAND_24: CHANNEL_FREQ_24, BAND_5: CHANNEL_FREQ_5, BAND_6: CHANNEL_FREQ_6}
+# Widths seen per band and how common they are
+_WIDTHS = {BAND_24: ((20, 9), (40, 1)), BAND_5: ((20, 3), (40, 2), (80, 5), (160, 1)),
+           BAND_6: ((20, 1), (80, 3), (160, 3))}
+_CAPS = {BAND_24: "HT", BAND_5: "HT VHT", BAND_6: "HE"}
+_SECURITY = (("WPA2", 10), ("WPA2 WPA3", 4), ("WPA3", 2), ("WPA2 802.1X", 2), ("", 1),
+             ("WPA1 WPA2", 1))
+_OUIS = (0x3C3786, 0xF09FC2, 0x9CC9EB, 0x001A2B, 0xB4FBE4, 0x84D81B, 0xE0CBBC, 0x74ACB9)
+_NAMES = ("eduroam", "Guest", "Office", "Lab", "Cafe", "Arena", "Press", "IoT", "Staff",
+          "Hall", "Booth", "Stage", "FreeWiFi", "Vendor", "Ops")
+
+
+def _weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+class _Ap:
+    __slots__ = ("bssid", "ssid", "band", "channel", "freq", "width", "security", "caps",
+                 "mean", "dbm")
+
+
+class SyntheticEnvironment:
+    """A simulated site of *aps* access points.
+
+    Every call returns one scan. Per scan each AP's signal takes a step of
+    a random walk (standard deviation *walk* dB) pulled back towards its
+    own mean level, and each AP is replaced by a new one with probability
+    *churn*. APs whose signal drops under -92 dBm are missing from that
+    scan. The same *seed* gives the same sequence of scans.
+    """
+
+    interval = SIM_INTERVAL
+
+    def __init__(self, aps=200, seed=None, walk=2.0, churn=0.01, band_weights=None,
+                 channel_weights=None, interval=SIM_INTERVAL):
+        self.walk = walk
+        self.churn = churn
+        self.interval = interval
+        self.band_weights = band_weights or BAND_WEIGHTS
+        self.channel_weights = channel_weights or CHANNEL_WEIGHTS
+        self._rng = random.Random(seed)
+        self._next_id = 0
+        self._ssids = [f"{self._rng.choice(_NAMES)}-{i}" for i in range(max(aps // 4, 1))]
+        self.aps = [self._new_ap() for _ in range(aps)]
+
+    def _new_ap(self):
+        rng = self._rng
+        ap = _Ap()
+        oui = _OUIS[self._next_id % len(_OUIS)]
+        ap.bssid = oui << 24 | self._next_id // len(_OUIS) & 0xFFFFFF
+        self._next_id += 1
+        ap.band = _weighted(rng, self.band_weights.items())
+        ap.channel = _weighted(rng, self.channel_weights[ap.band].items())
+        ap.freq = _FREQS[ap.band][ap.channel]
+        width = _weighted(rng, _WIDTHS[ap.band])
+        if width > 20 and ap.band != BAND_24:
+            # Only keep widths whose bonded block contains the channel
+            blocks = CENTER_CHANNELS[(ap.band, width)]
+            half = width // 10
+            if not any(c - half < ap.channel < c + half for c in blocks):
+                width = 20
+        ap.width = width
+        ap.caps = _CAPS[ap.band] + (" HE" if ap.band == BAND_5 and rng.random() < 0.4 else "")
+        ap.security = _weighted(rng, _SECURITY)
+        ap.ssid = "" if rng.random() < 0.05 else rng.choice(self._ssids)
+        ap.mean = rng.uniform(-90.0, -35.0)
+        ap.dbm = ap.mean
+        return ap
+
+    def __call__(self):
+        rng = self._rng
+        gauss = rng.gauss
+        walk = self.walk
+        churn = self.churn
+        hidden = _("<Hidden>")
+        nets = []
+        for i, ap in enumerate(self.aps):
+            if churn and rng.random() < churn:
+                ap = self.aps[i] = self._new_ap()
+            ap.dbm += gauss(0.0, walk) + 0.2 * (ap.mean - ap.dbm)
+            dbm = round(ap.dbm)
+            if dbm < -92:
+                continue
+            dbm = min(dbm, -20)
+            nets.append(Network(ap.ssid or hidden, ap.bssid, ap.freq, ap.channel,
+                                dbm_to_pct(dbm), dbm, ap.security, ap.band, ap.width, 0,
+                                ap.caps))
+        return nets
+
+
+class SessionReplay:
+    """Play back recorded ``(timestamp, networks)`` scans at their recorded pace.
+
+    A call blocks until the next scan is due (its recorded offset divided
+    by *speed*) and returns it; with *speed* 0 it returns at once. At the
+    end it starts over when *loop* is set, otherwise ``exhausted`` is set
+    and the last scan keeps being returned at the last recorded spacing.
+    """
+
+    interval = 0.0  # the replay paces itself
+
+    def __init__(self, scans, speed=1.0, loop=False):
+        self.scans = [(ts, list(nets)) for ts, nets in scans]
+        self.speed = speed
+        self.loop = loop
+        self.exhausted = not self.scans
+        self._pos = 0
+        self._base = 0.0     # recorded seconds added by loops and repeats
+        self._start = None
+        self._gap = (self.scans[-1][0] - self.scans[-2][0]) if len(self.scans) > 1 else 1.0
+
+    def __len__(self):
+        return len(self.scans)
+
+    def _wait(self, offset):
+        if self.speed <= 0:
+            return
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now - offset / self.speed
+        delay = self._start + offset / self.speed - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def __call__(self):
+        n = len(self.scans)
+        if not n:
+            return []
+        t0 = self.scans[0][0]
+        if self._pos == n:
+            if self.loop:
+                self._base += self.scans[-1][0] - t0 + self._gap
+                self._pos = 0
+            else:
+                self._base += self._gap
+        ts, nets = self.scans[min(self._pos, n - 1)]
+        self._pos = min(self._pos + 1, n)
+        self.exhausted = self._pos == n and not self.loop
+        self._wait(self._base + ts - t0)
+        return nets
+
+    @classmethod
+    def from_session(cls, path, speed=1.0, loop=False):
+        """Load a ``.wscan`` session file."""
+        from wifi_analyzer.scanfile import SessionReader
+
+        with SessionReader(path) as reader:
+            return cls(_group(reader.networks()), speed, loop)
+
+    @classmethod
+    def from_ndjson(cls, path, speed=1.0, loop=False):
+        """Load NDJSON as written by ``wifi-analyzer scan``."""
+        fields = Network.FIELDS
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    rows.append((record.get("ts", 0.0),
+                                 Network(**{k: record[k] for k in fields if k in record})))
+        return cls(_group(rows), speed, loop)
+
+
+def _group(rows):
+    """Group time-ordered ``(ts, network)`` rows into ``(ts, [networks])`` scans."""
+    scans = []
+    for ts, net in rows:
+        if not scans or scans[-1][0] != ts:
+            scans.append((ts, []))
+        scans[-1][1].append(net)
+    return scans
+
+
+def open_replay(path, speed=1.0, loop=False):
+    """Return a backend replaying *path*, picked by its contents.
+
+    ``.wscan`` sessions, NDJSON and saved site surveys carry timestamps
+    and are paced by :class:`SessionReplay`. Text files hold ``nmcli -t`` or ``iw scan
+    dump`` output with scans separated by blank lines; they have no
+    timestamps and replay one scan per call.
+    """
+    from wifi_analyzer.scanfile import MAGIC
+    from wifi_analyzer.survey import FORMAT
+
+    with open(path, "rb") as f:
+        head = f.read(64)
+    if head.startswith(MAGIC):
+        return SessionReplay.from_session(path, speed, loop)
+    if head.startswith(b'{"format":"' + FORMAT.encode()):
+        from wifi_analyzer.survey import Survey
+
+        return SessionReplay(Survey.load(path).scans(), speed, loop)
+    if head[:1] == b"{":
+        return SessionReplay.from_ndjson(path, speed, loop)
+
+    from wifi_analyzer.iw import iter_iw
+    from wifi_analyzer.scanner import iter_nmcli
+    from wifi_analyzer.scandiff import ReplayBackend
+
+    with open(path, encoding="utf-8") as f:
+        blocks = [b for b in f.read().split("\n\n") if b.strip()]
+    scans = []
+    for block in blocks:
+        parse = iter_iw if block.lstrip("\n").startswith("BSS ") else iter_nmcli
+        scans.append(list(parse(block.splitlines())))
+    return ReplayBackend(scans, loop=loop)
+
+
+def write_session(path, backend, scans, interval=SIM_INTERVAL, start=0.0):
+    """Record *scans* scans from *backend* into a ``.wscan`` session file.
+
+    Timestamps are synthetic (*start* plus *interval* per scan), so a
+    generator can fill hours of session in seconds.
+    """
+    from wifi_analyzer.scanfile import SessionWriter
+
+    with SessionWriter(path) as writer:
+        for i in range(scans):
+            writer.append_scan(start + i * interval, backend())
+    return path
+
+
+# Rogue devices: a travel router with a vendor OUI nobody deploys, and a
+# laptop or phone hotspot with a random locally administered address
+_ROGUE_OUIS = (0x00C0CA, 0x02E4F1)
+INCIDENTS = ("evil-twin", "foreign-ap", "signal-jump", "clone")
+
+
+class RogueScenario(SyntheticEnvironment):
+    """A synthetic site where rogue APs turn up on a schedule.
+
+    Unlike the plain environment, each SSID is deployed consistently:
+    all its APs come from one vendor and share its security, so the only
+    anomalies are the staged ones. From scan *start* on, every *every*
+    scans stages the next of :data:`INCIDENTS` in turn, for *duration*
+    scans:
+
+    ``evil-twin``    an open BSSID (from a hotspot) for a secured SSID
+    ``foreign-ap``   a BSSID with the right security, from another vendor
+    ``signal-jump``  an existing AP's signal jumps up by 30 dB
+    ``clone``        an existing BSSID also heard on another channel
+
+    ``incidents`` lists them as ``(scan, incident, mac)``, scans counted
+    from 1.
+    """
+
+    def __init__(self, aps=200, seed=None, start=10, every=10, duration=5, **options):
+        self._vendors = {}
+        self._secured = {}
+        self._scan = 0
+        self._born = {}    # bssid -> scan it first showed up in
+        super().__init__(aps, seed, **options)
+        self.start = start
+        self.every = every
+        self.duration = duration
+        self.incidents = []
+        self._rogues = []  # (last scan, _Ap, whether it clones an AP of the site)
+
+    def _new_ap(self):
+        ap = super()._new_ap()
+        ssid = ap.ssid
+        if ssid:
+            oui = self._vendors.setdefault(ssid, _OUIS[len(self._vendors) % len(_OUIS)])
+            ap.security = self._secured.setdefault(ssid, ap.security)
+        else:
+            oui = _OUIS[self._next_id % len(_OUIS)]
+        # One AP per synthetic BSSID: keep the low bits for its radios
+        ap.bssid = oui << 24 | (self._next_id << 4) & 0xFFFFFF
+        self._born[ap.bssid] = self._scan + 1
+        return ap
+
+    def expected_alerts(self):
+        """``{(alert kind, mac)}`` a ScanAnalyzer should raise for the incidents so far."""
+        from wifi_analyzer.analysis import (
+            CLONED_BSSID, NEW_BSSID, SECURITY_MISMATCH, SIGNAL_JUMP,
+        )
+
+        kinds = {"evil-twin": (SECURITY_MISMATCH, NEW_BSSID), "foreign-ap": (NEW_BSSID,),
+                 "signal-jump": (SIGNAL_JUMP,), "clone": (CLONED_BSSID,)}
+        return {(kind, mac) for _scan, incident, mac in self.incidents
+                for kind in kinds[incident]}
+
+    def _record(self, ap, channel, freq):
+        dbm = min(round(ap.dbm), -20)
+        return Network(ap.ssid, ap.bssid, freq, channel, dbm_to_pct(dbm), dbm, ap.security,
+                       ap.band, ap.width, 0, ap.caps)
+
+    def _stage(self, incident, nets):
+        rng = self._rng
+        # Victims that have been around for a few scans
+        settled = self._scan - 5
+        candidates = [ap for ap in self.aps if ap.ssid and -85 < ap.dbm < -60
+                      and self._born[ap.bssid] <= settled
+                      and (incident != "evil-twin" or ap.security)]
+        if not candidates:
+            return
+        victim = rng.choice(candidates)
+        if incident == "signal-jump":
+            victim.mean += 30.0
+            victim.dbm += 30.0
+            for i, net in enumerate(nets):
+                if net.mac == victim.bssid:
+                    nets[i] = self._record(victim, victim.channel, victim.freq)
+            self.incidents.append((self._scan, incident, victim.bssid))
+            return
+        if incident == "clone":
+            self.incidents.append((self._scan, incident, victim.bssid))
+            self._rogues.append((self._scan + self.duration, victim, True))
+            return
+        rogue = _Ap()
+        if incident == "evil-twin":
+            rogue.bssid = _ROGUE_OUIS[1] << 24 | rng.getrandbits(24)
+            rogue.security = ""
+        else:
+            rogue.bssid = _ROGUE_OUIS[0] << 24 | rng.getrandbits(24)
+            rogue.security = victim.security
+        for name in ("ssid", "band", "channel", "freq", "width", "caps"):
+            setattr(rogue, name, getattr(victim, name))
+        rogue.mean = rogue.dbm = rng.uniform(-70.0, -45.0)
+        self.incidents.append((self._scan, incident, rogue.bssid))
+        self._rogues.append((self._scan + self.duration, rogue, False))
+
+    def __call__(self):
+        self._scan += 1
+        nets = super().__call__()
+        if self._scan >= self.start and (self._scan - self.start) % self.every == 0:
+            self._stage(INCIDENTS[(self._scan - self.start) // self.every % len(INCIDENTS)], nets)
+        self._rogues = [r for r in self._rogues if r[0] >= self._scan]
+        for _last, ap, clone in self._rogues:
+            if clone:
+                # The same BSSID a few channels away
+                channels = sorted(_FREQS[ap.band])
+                channel = channels[(channels.index(ap.channel) + 3) % len(channels)]
+                nets.append(self._record(ap, channel, _FREQS[ap.band][channel]))
+            else:
+                ap.dbm += self._rng.gauss(0.0, self.walk) + 0.2 * (ap.mean - ap.dbm)
+                nets.append(self._record(ap, ap.channel, ap.freq))
+        return nets
@@ -0,0 +1,143 @@
+"""Site surveys: scans tagged with where on a floor plan they were taken.
+
+A :class:`Survey` holds one point per tagged scan (map pixel position,
+timestamp and the dBm of every BSSID heard there) plus the static
+details of each BSSID, and is stored as a single JSON document. A saved
+survey can be rendered again without an adapter, or played back through
+:class:`~wifi_analyzer.simulate.SessionReplay` like any recorded session.
+"""
+import json
+
+from wifi_analyzer.iw import dbm_to_pct
+from wifi_analyzer.records import Network
+
+FORMAT = "wifi-analyzer-survey"
+VERSION = 1
+FLOOR_DBM = -100  # value used where a BSSID was not heard
+BEST_SERVER = None  # pass as *bssid* for the strongest AP at each point
+
+_STATIC = ("ssid", "freq", "channel", "security", "band", "width", "caps")
+
+
+class SurveyPoint:
+    """One tagged scan: position in map pixels, timestamp and ``{bssid: dbm}``."""
+
+    __slots__ = ("x", "y", "ts", "readings")
+
+    def __init__(self, x, y, ts, readings):
+        self.x = x
+        self.y = y
+        self.ts = ts
+        self.readings = readings
+
+
+class Survey:
+    """Tagged scans over a floor plan of *width* x *height* pixels."""
+
+    def __init__(self, floorplan=None, width=0, height=0):
+        self.floorplan = floorplan
+        self.width = width
+        self.height = height
+        self.points = []
+        self.networks = {}  # bssid -> {field: value} for the _STATIC fields
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, x, y, ts, networks):
+        """Tag one scan's *networks* with map position (*x*, *y*)."""
+        readings = {}
+        for net in networks:
+            bssid = net.bssid
+            if not bssid:
+                continue
+            if bssid not in readings or net.dbm > readings[bssid]:
+                readings[bssid] = net.dbm
+            static = self.networks[bssid] = {k: getattr(net, k) for k in _STATIC}
+            static["band"] = str(net.band)
+        point = SurveyPoint(x, y, ts, readings)
+        self.points.append(point)
+        return point
+
+    def remove_last(self):
+        """Drop the most recent point (an accidental click); return it or None."""
+        return self.points.pop() if self.points else None
+
+    def bssids(self):
+        """BSSIDs heard anywhere, the most widely heard first."""
+        counts = {}
+        for p in self.points:
+            for bssid in p.readings:
+                counts[bssid] = counts.get(bssid, 0) + 1
+        return sorted(counts, key=lambda b: (-counts[b], b))
+
+    def samples(self, bssid=BEST_SERVER, floor=FLOOR_DBM):
+        """Return ``(xs, ys, values)`` for one BSSID or the best server.
+
+        Points where *bssid* was not heard count as *floor* dBm, so its
+        coverage fades out instead of being extrapolated. The best-server
+        value is the strongest reading at each point.
+        """
+        xs, ys, values = [], [], []
+        for p in self.points:
+            xs.append(p.x)
+            ys.append(p.y)
+            if bssid is BEST_SERVER:
+                values.append(max(p.readings.values(), default=floor))
+            else:
+                values.append(p.readings.get(bssid, floor))
+        return xs, ys, values
+
+    def interpolator(self, bssid=BEST_SERVER, radius=None):
+        """An Interpolator over this survey's samples for *bssid*."""
+        # heatmap may pull in numpy; only surveys being rendered need it
+        from wifi_analyzer.heatmap import Interpolator, default_radius
+
+        xs, ys, values = self.samples(bssid)
+        if radius is None:
+            radius = default_radius(self.width or 1, self.height or 1, len(xs))
+        return Interpolator(xs, ys, values, radius)
+
+    def scans(self):
+        """Yield ``(ts, [Network, ...])`` per point, for replay."""
+        for p in self.points:
+            nets = []
+            for bssid, dbm in p.readings.items():
+                static = self.networks.get(bssid, {})
+                nets.append(Network(static.get("ssid", ""), bssid, static.get("freq", 0),
+                                    static.get("channel", 0), dbm_to_pct(dbm), dbm,
+                                    static.get("security", ""), static.get("band", ""),
+                                    static.get("width", 20), None, static.get("caps", "")))
+            yield p.ts, nets
+
+    def to_json(self):
+        return {
+            "format": FORMAT,
+            "version": VERSION,
+            "floorplan": self.floorplan,
+            "width": self.width,
+            "height": self.height,
+            "networks": self.networks,
+            "points": [{"x": p.x, "y": p.y, "ts": p.ts, "readings": p.readings}
+                       for p in self.points],
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def from_json(cls, data):
+        if data.get("format") != FORMAT:
+            raise ValueError("not a wifi-analyzer survey")
+        survey = cls(data.get("floorplan"), data.get("width", 0), data.get("height", 0))
+        survey.networks = data.get("networks", {})
+        survey.points = [SurveyPoint(p["x"], p["y"], p.get("ts", 0.0), p.get("readings", {}))
+                         for p in data.get("points", ())]
+        return survey
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json(json.load(f))
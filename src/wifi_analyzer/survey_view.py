@@ -0,0 +1,345 @@
+"""Site-survey window: tag scans on a floor plan and show a coverage heatmap.
+
+Clicking the floor plan marks where you stand; the next scan that starts
+after the click is stored at that spot. The heatmap is one cairo image
+surface with a pixel per grid cell, scaled over the floor plan. After a
+change its tiles are recomputed in idle time, nearest to the newest
+point first, a few milliseconds per main-loop iteration, and written
+into the cached surface in place so the map stays responsive and the
+rest of the old map stays visible until its tiles are redone.
+"""
+import gettext
+import os
+import time
+
+import cairo
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Adw, Gdk, GdkPixbuf, Gio, GLib, Gtk
+
+from wifi_analyzer.heatmap import HeatmapGrid, colorize
+from wifi_analyzer.instrument import span
+from wifi_analyzer.survey import BEST_SERVER, Survey
+
+_ = gettext.gettext
+
+FRAME_BUDGET = 0.008  # seconds of tile work per idle callback
+POINT_RADIUS = 5
+
+
+class HeatmapLayer:
+    """Cached heatmap surface refilled tile by tile from idle callbacks."""
+
+    def __init__(self, on_update):
+        self.on_update = on_update
+        self.grid = None
+        self.surface = None
+        self._interp = None
+        self._tiles = []
+        self._source = 0
+
+    def rebuild(self, survey, bssid=BEST_SERVER, focus=None):
+        """Start recomputing the map for *bssid*; tiles near *focus* come first."""
+        if not survey.points or not survey.width:
+            self.cancel()
+            self.surface = None
+            return
+        grid = self.grid
+        if grid is None or (grid.width, grid.height) != (survey.width, survey.height):
+            grid = self.grid = HeatmapGrid(survey.width, survey.height)
+            self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, grid.cols, grid.rows)
+        self._interp = survey.interpolator(bssid)
+        self._tiles = grid.tiles(focus)
+        if not self._source:
+            self._source = GLib.idle_add(self._work)
+
+    def cancel(self):
+        if self._source:
+            GLib.source_remove(self._source)
+            self._source = 0
+        self._tiles = []
+
+    def _work(self):
+        deadline = time.perf_counter() + FRAME_BUDGET
+        grid = self.grid
+        surface = self.surface
+        stride = surface.get_stride()
+        surface.flush()
+        data = surface.get_data()
+        done = 0
+        with span("heatmap") as s:
+            while self._tiles and time.perf_counter() < deadline:
+                col0, row0, cols, rows = self._tiles.pop(0)
+                pixels = colorize(grid.compute(self._interp, col0, row0, cols, rows), cols)
+                width = cols * 4
+                for r in range(rows):
+                    off = (row0 + r) * stride + col0 * 4
+                    data[off:off + width] = pixels[r * width:(r + 1) * width]
+                done += cols * rows
+            s.n = done
+        surface.mark_dirty()
+        self.on_update()
+        if self._tiles:
+            return GLib.SOURCE_CONTINUE
+        self._source = 0
+        return GLib.SOURCE_REMOVE
+
+
+class SurveyArea(Gtk.DrawingArea):
+    """Floor plan, heatmap and survey points, scaled to fit."""
+
+    def __init__(self, survey, on_pick):
+        super().__init__(hexpand=True, vexpand=True)
+        self.survey = survey
+        self.on_pick = on_pick
+        self.pixbuf = None
+        self.pending = None  # map position waiting for its scan
+        self.heatmap = HeatmapLayer(self.queue_draw)
+        self.set_draw_func(self._draw)
+        click = Gtk.GestureClick()
+        click.connect("pressed", self._on_pressed)
+        self.add_controller(click)
+
+    def set_floorplan(self, pixbuf):
+        self.pixbuf = pixbuf
+        self.queue_draw()
+
+    def _transform(self, width, height):
+        """Scale and offset that fit the map into the widget."""
+        sw, sh = self.survey.width, self.survey.height
+        if not sw or not sh:
+            return 1.0, 0.0, 0.0
+        scale = min(width / sw, height / sh)
+        return scale, (width - sw * scale) / 2, (height - sh * scale) / 2
+
+    def _on_pressed(self, gesture, n_press, x, y):
+        if not self.survey.width:
+            return
+        scale, ox, oy = self._transform(self.get_width(), self.get_height())
+        mx, my = (x - ox) / scale, (y - oy) / scale
+        if 0 <= mx < self.survey.width and 0 <= my < self.survey.height:
+            self.on_pick(mx, my)
+
+    def _draw(self, area, cr, width, height):
+        with span("draw-survey"):
+            if not self.survey.width:
+                return
+            scale, ox, oy = self._transform(width, height)
+            cr.translate(ox, oy)
+            cr.scale(scale, scale)
+            if self.pixbuf is not None:
+                Gdk.cairo_set_source_pixbuf(cr, self.pixbuf, 0, 0)
+            else:
+                cr.set_source_rgb(1, 1, 1)
+            cr.rectangle(0, 0, self.survey.width, self.survey.height)
+            cr.fill()
+            layer = self.heatmap
+            if layer.surface is not None:
+                cr.save()
+                cr.scale(layer.grid.cell, layer.grid.cell)
+                cr.set_source_surface(layer.surface, 0, 0)
+                cr.get_source().set_filter(cairo.FILTER_BILINEAR)
+                cr.paint()
+                cr.restore()
+            r = POINT_RADIUS / scale
+            cr.set_source_rgb(0.1, 0.1, 0.1)
+            for p in self.survey.points:
+                cr.new_sub_path()
+                cr.arc(p.x, p.y, r, 0, 6.2832)
+            cr.fill()
+            if self.pending is not None:
+                cr.set_source_rgb(0.2, 0.5, 1.0)
+                cr.set_line_width(2 / scale)
+                cr.arc(self.pending[0], self.pending[1], 2 * r, 0, 6.2832)
+                cr.stroke()
+
+
+class SurveyWindow(Adw.Window):
+    """Survey mode for a running ScanService."""
+
+    def __init__(self, parent, service):
+        super().__init__(title=_("Site Survey"), transient_for=parent,
+                         default_width=900, default_height=800)
+        self.service = service
+        self.survey = Survey()
+        self._pending_since = None
+        self._targets = [BEST_SERVER]
+
+        header = Adw.HeaderBar()
+        open_btn = Gtk.Button(label=_("Floor Plan…"))
+        open_btn.connect("clicked", self._choose_floorplan)
+        header.pack_start(open_btn)
+        load_btn = Gtk.Button(icon_name="document-open-symbolic", tooltip_text=_("Open survey"))
+        load_btn.connect("clicked", self._choose_survey)
+        header.pack_start(load_btn)
+        save_btn = Gtk.Button(icon_name="document-save-symbolic", tooltip_text=_("Save survey"))
+        save_btn.connect("clicked", self._save_survey)
+        header.pack_start(save_btn)
+        undo_btn = Gtk.Button(icon_name="edit-undo-symbolic", tooltip_text=_("Remove last point"))
+        undo_btn.connect("clicked", self._undo)
+        header.pack_end(undo_btn)
+        self.target_list = Gtk.StringList.new([_("Best server")])
+        self.target_dropdown = Gtk.DropDown(model=self.target_list)
+        self.target_dropdown.connect("notify::selected", lambda *a: self._rebuild())
+        header.pack_end(self.target_dropdown)
+
+        self.area = SurveyArea(self.survey, self._on_pick)
+        self.status = Gtk.Label(xalign=0)
+        self.status.set_margin_start(12); self.status.set_margin_end(12)
+        self.status.set_margin_top(4); self.status.set_margin_bottom(4)
+        self.status.add_css_class("dim-label")
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        box.append(header)
+        box.append(self.area)
+        box.append(self.status)
+        self.set_content(box)
+
+        # Scan results arrive on the service thread
+        self._on_scan_cb = self.service.subscribe_scans(
+            lambda ts, nets: GLib.idle_add(self._on_scan, ts, list(nets)))
+        self.connect("close-request", self._on_close_request)
+        self._update_status()
+
+    def _on_close_request(self, win):
+        self.service.unsubscribe_scans(self._on_scan_cb)
+        self.area.heatmap.cancel()
+        return False
+
+    def _update_status(self):
+        if not self.survey.width:
+            msg = _("Open a floor plan, then click where you stand")
+        elif self.area.pending is not None:
+            msg = _("Waiting for a scan at the marked spot…")
+        else:
+            msg = _("{n} points · click where you stand to add one").format(n=len(self.survey))
+        self.status.set_label(msg)
+
+    def _on_pick(self, x, y):
+        self.area.pending = (x, y)
+        self._pending_since = time.time()
+        self.area.queue_draw()
+        # The point needs what is heard here, not the driver's cache
+        request_rescan = getattr(self.service.backend, "request_rescan", None)
+        if request_rescan is not None:
+            request_rescan()
+        self.service.scan_now()
+        self._update_status()
+
+    def _on_scan(self, ts, nets):
+        # Only a scan started after the click was taken at the marked spot
+        if self.area.pending is None or ts < self._pending_since:
+            return GLib.SOURCE_REMOVE
+        x, y = self.area.pending
+        self.area.pending = None
+        self.survey.add(x, y, ts, nets)
+        self._refresh_targets()
+        self._rebuild(focus=(x, y))
+        self._update_status()
+        return GLib.SOURCE_REMOVE
+
+    def _undo(self, btn):
+        point = self.survey.remove_last()
+        if point is not None:
+            self._rebuild(focus=(point.x, point.y))
+            self._update_status()
+
+    def _refresh_targets(self):
+        bssids = self.survey.bssids()
+        new = [b for b in bssids if b not in self._targets]
+        if not new:
+            return
+        self._targets.extend(new)
+        nets = self.survey.networks
+        self.target_list.splice(self.target_list.get_n_items(), 0,
+                                [f"{nets[b]['ssid']} ({b})" for b in new])
+
+    def _rebuild(self, focus=None):
+        selected = self.target_dropdown.get_selected()
+        bssid = self._targets[selected] if selected < len(self._targets) else BEST_SERVER
+        if focus is None and self.survey.points:
+            focus = (self.survey.points[-1].x, self.survey.points[-1].y)
+        self.area.heatmap.rebuild(self.survey, bssid, focus)
+        self.area.queue_draw()
+
+    def _load_floorplan(self, path):
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        except GLib.Error as e:
+            self.status.set_label(_("Could not open floor plan: {err}").format(err=e.message))
+            return False
+        survey = self.survey
+        survey.floorplan = path
+        survey.width, survey.height = pixbuf.get_width(), pixbuf.get_height()
+        self.area.set_floorplan(pixbuf)
+        return True
+
+    def _choose_floorplan(self, btn):
+        dialog = Gtk.FileDialog(title=_("Open Floor Plan"))
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        images = Gtk.FileFilter(name=_("Images"))
+        images.add_pixbuf_formats()
+        filters.append(images)
+        dialog.set_filters(filters)
+        dialog.open(self, None, self._on_floorplan_chosen)
+
+    def _on_floorplan_chosen(self, dialog, result):
+        try:
+            path = dialog.open_finish(result).get_path()
+        except GLib.Error:
+            return  # cancelled
+        # A new plan starts a new survey; points on the old one are meaningless
+        self.survey.points.clear()
+        self.survey.networks.clear()
+        if self._load_floorplan(path):
+            self._reset_targets()
+            self._rebuild()
+        self._update_status()
+
+    def _choose_survey(self, btn):
+        dialog = Gtk.FileDialog(title=_("Open Survey"))
+        dialog.open(self, None, self._on_survey_chosen)
+
+    def _on_survey_chosen(self, dialog, result):
+        try:
+            path = dialog.open_finish(result).get_path()
+        except GLib.Error:
+            return
+        try:
+            survey = Survey.load(path)
+        except (OSError, ValueError) as e:
+            self.status.set_label(_("Could not open survey: {err}").format(err=e))
+            return
+        self.survey = self.area.survey = survey
+        self.area.pending = None
+        if survey.floorplan and os.path.exists(survey.floorplan):
+            self._load_floorplan(survey.floorplan)
+        else:
+            # Heatmap still renders, just without the plan underneath
+            self.area.set_floorplan(None)
+        self._reset_targets()
+        self._refresh_targets()
+        self._rebuild()
+        self._update_status()
+
+    def _reset_targets(self):
+        self._targets = [BEST_SERVER]
+        self.target_list.splice(1, self.target_list.get_n_items() - 1, [])
+        self.target_dropdown.set_selected(0)
+
+    def _save_survey(self, btn):
+        if not self.survey.points:
+            return
+        dialog = Gtk.FileDialog(title=_("Save Survey"),
+                                initial_name=time.strftime("survey_%Y%m%d_%H%M%S.json"))
+        dialog.save(self, None, self._on_save_chosen)
+
+    def _on_save_chosen(self, dialog, result):
+        try:
+            path = dialog.save_finish(result).get_path()
+        except GLib.Error:
+            return
+        self.survey.save(path)
+        self.status.set_label(_("Survey saved to {path}").format(path=path))
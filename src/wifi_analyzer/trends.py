@@ -0,0 +1,144 @@
+"""Incremental per-BSSID signal statistics.
+
+Every sample updates a handful of floats in O(1); no sample windows are
+kept. Per BSSID there is an exponentially weighted mean and variance
+(West's weighted form of Welford's update), a decaying min/max envelope
+and an exponentially weighted least-squares slope of dBm over time,
+which uses a longer memory than the mean as slopes are far noisier.
+
+For display the mean is latched into a sort key that only moves once
+the mean has drifted *hysteresis* dB away from it, so the list order and
+the shown level stay put while a signal just jitters.
+"""
+import math
+import threading
+
+ALPHA = 0.3               # weight of the newest sample in mean and variance
+TREND_ALPHA = 0.05        # slower weight for the slope, which is noisier
+ENVELOPE_DECAY = 0.05     # how fast min/max relax back towards the mean
+HYSTERESIS = 3.0          # dB the mean must move before the sort key follows
+TREND_THRESHOLD = 2.0     # dB per minute before a trend arrow is shown
+MAX_AGE = 3600.0          # seconds unseen before a BSSID is forgotten
+PRUNE_EVERY = 100         # scans between checks for unseen BSSIDs
+
+_TREND_BETA = 1.0 - TREND_ALPHA
+_TREND_PER_S = TREND_THRESHOLD / 60
+
+UP = "↑"
+DOWN = "↓"
+
+
+class SignalStats:
+    """Running statistics of one BSSID's dBm samples."""
+
+    __slots__ = ("n", "t_last", "mean", "var", "lo", "hi", "mean_t", "mean_x", "var_t", "cov",
+                 "key", "arrow")
+
+    def __init__(self, t, x):
+        self.n = 1
+        self.t_last = t
+        self.mean = self.lo = self.hi = self.key = float(x)
+        self.var = 0.0
+        self.mean_t = t
+        self.mean_x = float(x)
+        self.var_t = self.cov = 0.0
+        self.arrow = ""
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.var)
+
+    @property
+    def slope(self):
+        """Trend in dB per second (0 until there is a time spread)."""
+        return self.cov / self.var_t if self.var_t > 1e-9 else 0.0
+
+    def add(self, t, x, alpha=ALPHA, hysteresis=HYSTERESIS):
+        """Add a sample; return True if the displayed key or arrow changed.
+
+        Runs for every BSSID of every scan, hence the locals.
+        """
+        self.n += 1
+        self.t_last = t
+        dx = x - self.mean
+        mean = self.mean = self.mean + alpha * dx
+        self.var = (1.0 - alpha) * (self.var + alpha * dx * dx)
+        dx = x - self.mean_x
+        dt = t - self.mean_t
+        self.mean_x += TREND_ALPHA * dx
+        self.mean_t += TREND_ALPHA * dt
+        var_t = self.var_t = _TREND_BETA * (self.var_t + TREND_ALPHA * dt * dt)
+        cov = self.cov = _TREND_BETA * (self.cov + TREND_ALPHA * dt * dx)
+        lo = self.lo
+        self.lo = x if x < lo else lo + ENVELOPE_DECAY * (mean - lo)
+        hi = self.hi
+        self.hi = x if x > hi else hi - ENVELOPE_DECAY * (hi - mean)
+
+        changed = False
+        if abs(mean - self.key) >= hysteresis:
+            self.key = mean
+            changed = True
+        slope = cov / var_t if var_t > 1e-9 else 0.0
+        arrow = UP if slope >= _TREND_PER_S else DOWN if slope <= -_TREND_PER_S else ""
+        if arrow != self.arrow:
+            self.arrow = arrow
+            changed = True
+        return changed
+
+
+class TrendTracker:
+    """SignalStats for every BSSID seen, fed one scan at a time.
+
+    BSSIDs are keyed by ``Network.mac``, their 48-bit integer form.
+    update_scan() may run on the scan thread; the BSSIDs whose displayed
+    key or arrow changed are collected until take_dirty() is called.
+    BSSIDs unseen for *max_age* seconds are dropped as scans come in.
+    """
+
+    def __init__(self, alpha=ALPHA, hysteresis=HYSTERESIS, max_age=MAX_AGE):
+        self.alpha = alpha
+        self.hysteresis = hysteresis
+        self.max_age = max_age
+        self._scans = 0
+        self._stats = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._stats)
+
+    def get(self, mac):
+        return self._stats.get(mac)
+
+    def update_scan(self, ts, networks):
+        """Add every network of one scan taken at *ts*."""
+        stats = self._stats
+        alpha = self.alpha
+        hysteresis = self.hysteresis
+        dirty = []
+        for net in networks:
+            mac = net.mac
+            st = stats.get(mac)
+            if st is None:
+                stats[mac] = SignalStats(ts, net.dbm)
+            elif st.add(ts, net.dbm, alpha, hysteresis):
+                dirty.append(mac)
+        if dirty:
+            with self._lock:
+                self._dirty.update(dirty)
+        self._scans += 1
+        if self._scans % PRUNE_EVERY == 0:
+            self.prune(ts - self.max_age)
+
+    def take_dirty(self):
+        """Return and reset the BSSIDs whose key or arrow changed."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def prune(self, older_than):
+        """Forget BSSIDs not seen since timestamp *older_than*."""
+        stale = [mac for mac, st in self._stats.items() if st.t_last < older_than]
+        for mac in stale:
+            del self._stats[mac]
+        return len(stale)